@@ -27,20 +27,8 @@ from src.extractors.azure_di import (
     slice_pdf,
 )
 
-# Environment variable names (in priority order)
-# PolicyAsCode uses AZURE_DOCUMENTINTELLIGENCE_* but we also support legacy names
-ENDPOINT_ENVS = (
-    "AZURE_DOCUMENTINTELLIGENCE_ENDPOINT",  # PolicyAsCode standard
-    "AZURE_FT_ENDPOINT",  # IngestLab legacy
-    "DOCUMENTINTELLIGENCE_ENDPOINT",
-    "DI_ENDPOINT",
-)
-KEY_ENVS = (
-    "AZURE_DOCUMENTINTELLIGENCE_KEY",  # PolicyAsCode standard
-    "AZURE_FT_KEY",  # IngestLab legacy
-    "DOCUMENTINTELLIGENCE_API_KEY",
-    "DI_KEY",
-)
+from chunking_pipeline.azure_shards import analyze_sharded
+from chunking_pipeline.di_client import ENDPOINT_ENVS, KEY_ENVS
 DEFAULT_DI_API_VERSION = "2024-11-30"
 
 
@@ -174,6 +162,18 @@ def main(argv: Optional[List[str]] = None) -> int:
         default=None,
         help="Optional path to write run metadata with detected languages",
     )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Analyze the pages as N concurrent page shards (ignored with figures output)",
+    )
+    parser.add_argument(
+        "--shard-min-pages",
+        type=int,
+        default=10,
+        help="Minimum pages per shard when --shards is set",
+    )
     parser.add_argument("--endpoint", help="Override endpoint")
     parser.add_argument("--key", help="Override API key")
     args = parser.parse_args(argv)
@@ -227,14 +227,28 @@ def main(argv: Optional[List[str]] = None) -> int:
         figures_output_dir = Path(args.output).parent
 
     # Run extraction using PolicyAsCode's AzureDIExtractor
-    extractor = AzureDIExtractor(config)
-    result = extractor.extract(
-        trimmed,
-        figures_output_dir=figures_output_dir,
-    )
-
-    # Convert elements to dict format for JSONL
-    elems = [el.to_dict() for el in result.elements]
+    if args.shards > 1 and not want_figures:
+        def _analyze(path: str):
+            shard_result = AzureDIExtractor(config).extract(path)
+            return [el.to_dict() for el in shard_result.elements], dict(shard_result.metadata)
+
+        elems, result_metadata = analyze_sharded(
+            Path(trimmed),
+            len(valid_pages),
+            _analyze,
+            shards=args.shards,
+            min_pages_per_shard=args.shard_min_pages,
+            on_shard_done=lambda done, total: logger.info(f"Analyzed {done}/{total} page shards"),
+        )
+    else:
+        extractor = AzureDIExtractor(config)
+        result = extractor.extract(
+            trimmed,
+            figures_output_dir=figures_output_dir,
+        )
+        # Convert elements to dict format for JSONL
+        elems = [el.to_dict() for el in result.elements]
+        result_metadata = result.metadata
 
     # Process figures through vision pipeline if requested (EXPERIMENTAL)
     process_figures = any((o or "").lower() == "process_figures" for o in (outputs or []))
@@ -263,7 +277,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     )
 
     # Merge extraction metadata into run config
-    run_config.update(result.metadata)
+    run_config.update(result_metadata)
 
     # Write outputs
     write_run_metadata(args.run_metadata_out, run_config)
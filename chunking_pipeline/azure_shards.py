@@ -0,0 +1,211 @@
+"""Page-sharded Azure Document Intelligence analysis and element stitching.
+
+Large PDFs spend most of their wall-clock time in a single Azure poller.
+``analyze_sharded`` splits the pages into contiguous shards, analyzes them
+concurrently and stitches the element streams back together in page order.
+The stitching helpers are shared with the web app's per-page result cache.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.extractors.azure_di import ensure_stable_element_id, slice_pdf
+
+# (elements, serialized result metadata) as returned by one Azure analysis
+AnalysisResult = Tuple[List[Dict[str, Any]], Dict[str, Any]]
+
+
+def element_page(el: Dict[str, Any]) -> Optional[int]:
+    md = el.get("metadata") or {}
+    return el.get("page_number") or md.get("page_number") or (md.get("page_numbers") or [None])[0]
+
+
+def renumber_element_pages(el: Dict[str, Any], page_map: Dict[int, int], default: int) -> None:
+    """Rewrite an element's page numbers in place (pages not in ``page_map`` become ``default``)."""
+    md = el.get("metadata")
+    if el.get("page_number") is not None:
+        el["page_number"] = page_map.get(el["page_number"], default)
+    if isinstance(md, dict):
+        if md.get("page_number") is not None:
+            md["page_number"] = page_map.get(md["page_number"], default)
+        if md.get("page_numbers"):
+            md["page_numbers"] = [page_map.get(p, default) for p in md["page_numbers"]]
+
+
+def is_per_page_list(value: Any) -> bool:
+    """Whether a result metadata value is a list of per-page dicts (``{"page_number": int, ...}``)."""
+    return bool(value) and isinstance(value, list) and all(
+        isinstance(item, dict) and isinstance(item.get("page_number"), int) for item in value
+    )
+
+
+def merge_result_metadata(parts: Sequence[Dict[str, Any]], element_count: int, page_count: int) -> Dict[str, Any]:
+    """Combine result metadata from several analyses of one document.
+
+    The first value of each key wins, except that lists (e.g. detected
+    languages) are unioned and element/page counts describe the merged result.
+    """
+    merged: Dict[str, Any] = {}
+    seen_parts: set = set()
+    for part in parts:
+        marker = json.dumps(part, sort_keys=True, default=str)
+        if marker in seen_parts:
+            continue
+        seen_parts.add(marker)
+        for key, val in part.items():
+            if isinstance(val, list) and isinstance(merged.get(key), list):
+                known = {json.dumps(item, sort_keys=True, default=str) for item in merged[key]}
+                merged[key] += [item for item in val if json.dumps(item, sort_keys=True, default=str) not in known]
+            else:
+                merged.setdefault(key, val)
+    if "element_count" in merged:
+        merged["element_count"] = element_count
+    if "page_count" in merged:
+        merged["page_count"] = page_count
+    return merged
+
+
+def restitch_elements(parts: Sequence[Tuple[List[Dict[str, Any]], Dict[int, int], int]]) -> List[Dict[str, Any]]:
+    """Concatenate element lists from separate analyses into one document.
+
+    Each part is ``(elements, page_map, default_page)``: its pages are
+    renumbered through ``page_map`` and element ids are re-derived for the
+    new page numbers. ``parent_id`` references resolve within the same part
+    first, then to an unambiguous match elsewhere; unresolved parents are
+    dropped. Elements are modified in place.
+    """
+    elements: List[Dict[str, Any]] = []
+    owners: List[int] = []
+    id_map: Dict[Tuple[int, str], str] = {}
+    new_ids: Dict[str, List[str]] = {}
+    for part_idx, (part_elements, page_map, default_page) in enumerate(parts):
+        for el in part_elements:
+            renumber_element_pages(el, page_map, default_page)
+            old_id = el.pop("element_id", None)
+            ensure_stable_element_id(el)
+            if old_id:
+                id_map[(part_idx, old_id)] = el["element_id"]
+                new_ids.setdefault(old_id, []).append(el["element_id"])
+            elements.append(el)
+            owners.append(part_idx)
+    for el, part_idx in zip(elements, owners):
+        for holder in (el, el.get("metadata") or {}):
+            parent = holder.get("parent_id")
+            if not parent:
+                continue
+            resolved = id_map.get((part_idx, parent))
+            if resolved is None and len(new_ids.get(parent, ())) == 1:
+                resolved = new_ids[parent][0]
+            if resolved is None:
+                holder.pop("parent_id")
+            else:
+                holder["parent_id"] = resolved
+    return elements
+
+
+def plan_shards(page_count: int, shards: int, min_pages_per_shard: int = 1) -> List[List[int]]:
+    """Split pages ``1..page_count`` into at most ``shards`` contiguous runs."""
+    if page_count <= 0:
+        return []
+    count = max(1, min(shards, page_count // max(1, min_pages_per_shard) or 1))
+    size, extra = divmod(page_count, count)
+    plan: List[List[int]] = []
+    start = 1
+    for idx in range(count):
+        length = size + (1 if idx < extra else 0)
+        plan.append(list(range(start, start + length)))
+        start += length
+    return plan
+
+
+def _remove_when_done(path: Path, futures: List[Future]) -> None:
+    """Delete the directory ``path`` once every future in ``futures`` has finished."""
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def _done(_future: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            shutil.rmtree(path, ignore_errors=True)
+
+    if not futures:
+        shutil.rmtree(path, ignore_errors=True)
+    for future in futures:
+        future.add_done_callback(_done)
+
+
+def analyze_sharded(
+    pdf_path: Path,
+    page_count: int,
+    analyze: Callable[[str], AnalysisResult],
+    *,
+    shards: int,
+    min_pages_per_shard: int = 1,
+    on_shard_done: Optional[Callable[[int, int], None]] = None,
+    run_cpu_bound: Callable[..., Any] = lambda fn, *args, **kwargs: fn(*args, **kwargs),
+) -> AnalysisResult:
+    """Analyze ``pdf_path`` in concurrent page shards and stitch the results.
+
+    ``analyze`` receives the path of a shard PDF and returns its elements and
+    metadata; it runs on worker threads, each inside a copy of the caller's
+    context. ``on_shard_done(done, total)`` is called as shards finish; if it
+    (or a shard) raises, shards that have not started are cancelled and the
+    error propagates without waiting for the ones still in flight, whose shard
+    PDFs are deleted once they finish. Shard PDFs are cut through
+    ``run_cpu_bound(fn, *args, **kwargs)``, which runs inline by default.
+    Falls back to a single ``analyze`` call when only one shard is planned.
+    """
+    plan = plan_shards(page_count, shards, min_pages_per_shard)
+    if len(plan) <= 1:
+        return analyze(str(pdf_path))
+
+    tmp = Path(tempfile.mkdtemp(prefix="di-shards-"))
+    futures: Dict[Future, int] = {}
+    results: List[Optional[AnalysisResult]] = [None] * len(plan)
+    pool = ThreadPoolExecutor(max_workers=len(plan), thread_name_prefix="di-shard")
+    try:
+        shard_paths = []
+        for idx, shard_pages in enumerate(plan):
+            shard_path = tmp / f"shard{idx:03d}.pdf"
+            run_cpu_bound(slice_pdf, str(pdf_path), shard_pages, str(shard_path), warn_on_drop=False)
+            shard_paths.append(shard_path)
+        for idx, path in enumerate(shard_paths):
+            futures[pool.submit(contextvars.copy_context().run, analyze, str(path))] = idx
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if on_shard_done:
+                on_shard_done(done, len(plan))
+    except BaseException:
+        # Don't wait for in-flight Azure calls; their shard PDFs are removed
+        # once they finish instead
+        pool.shutdown(wait=False, cancel_futures=True)
+        _remove_when_done(tmp, list(futures))
+        raise
+    pool.shutdown()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    parts = []
+    metadata_parts = []
+    for shard_pages, result in zip(plan, results):
+        shard_elements, shard_metadata = result  # type: ignore[misc]
+        page_map = {local: page for local, page in enumerate(shard_pages, start=1)}
+        parts.append((shard_elements, page_map, shard_pages[0]))
+        # Shards number their pages from 1; renumber per-page lists so they
+        # neither collide nor get deduplicated when merged
+        metadata_parts.append({
+            key: [dict(item, page_number=page_map.get(item["page_number"], shard_pages[0])) for item in val]
+            if is_per_page_list(val) else val
+            for key, val in shard_metadata.items()
+        })
+    elements = restitch_elements(parts)
+    return elements, merge_result_metadata(metadata_parts, len(elements), page_count)
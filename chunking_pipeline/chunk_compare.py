@@ -0,0 +1,135 @@
+"""Run several chunker strategy/config variants over one element list in parallel.
+
+Used by ``POST /api/chunk/compare`` for parameter sweeps. Variants run on one
+long-lived process pool, started on the first comparison and stopped by
+``shutdown_pool`` when the app shuts down, so interpreter start-up and the
+PolicyAsCode/pydantic imports are paid once per worker rather than per
+request. Each variant receives the element dicts, validates its own
+``Element`` models, runs its chunker, writes its chunks JSONL and returns
+``get_chunk_statistics``.
+
+Workers are started with ``spawn``: the server is multi-threaded (request
+threads, job workers, the SQLite store, pooled HTTP clients), and a forked
+child can inherit a lock another thread was holding and deadlock. A spawned
+worker re-imports the parent's ``__main__`` module. Under ``uvicorn
+main:app`` that is uvicorn's entry point, so workers only import this module
+and PolicyAsCode. Under ``python main.py`` it is ``main.py``, whose
+module-level ``from web.server import app`` imports the server in every
+worker (without starting the job manager, which only happens in the app's
+lifespan).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.extractors.chunker_registry import get_chunker
+from src.extractors.section_based_chunker import get_chunk_statistics
+from src.models.elements import Element
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(processes: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, processes),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a pool whose worker died; the next comparison starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    """Stop the comparison worker processes, if any were started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def save_chunks(chunks: Iterable[Any], path: Path) -> None:
+    """Save chunks (Pydantic models or dicts) to a JSONL file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        for chunk in chunks:
+            data = chunk.model_dump() if hasattr(chunk, "model_dump") else chunk
+            fh.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+
+def _run_variant(
+    elements: List[Dict[str, Any]], chunker_name: str, config: Dict[str, Any], output_path: str
+) -> Dict[str, Any]:
+    chunker_info = get_chunker(chunker_name)
+    # Chunker functions expect Pydantic models
+    elements = [Element.model_validate(el) for el in elements]
+    chunks = chunker_info.chunker_fn(elements, chunker_info.config_model(**config))
+    save_chunks(chunks, Path(output_path))
+    return get_chunk_statistics(chunks).model_dump()
+
+
+def _submit_variants(
+    pool: ProcessPoolExecutor, elements: List[Dict[str, Any]], variants: List[Dict[str, Any]]
+) -> Dict[Future, int]:
+    return {
+        pool.submit(_run_variant, elements, v["chunker"], v["config"], v["output_path"]): idx
+        for idx, v in enumerate(variants)
+    }
+
+
+def compare_chunkers(
+    elements: List[Dict[str, Any]],
+    variants: List[Dict[str, Any]],
+    *,
+    processes: int,
+) -> List[Dict[str, Any]]:
+    """Run each ``{"chunker", "config", "output_path"}`` variant on the shared process pool.
+
+    ``processes`` sizes the pool when it is started by the first comparison.
+
+    Returns one result per variant, in input order: the variant fields plus
+    ``summary`` on success or ``error`` if that variant failed.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(variants)
+    pool = _get_pool(processes)
+    try:
+        futures = _submit_variants(pool, elements, variants)
+    except BrokenProcessPool:
+        # A worker of the shared pool died during an earlier comparison
+        _discard_pool(pool)
+        pool = _get_pool(processes)
+        futures = _submit_variants(pool, elements, variants)
+    for future in as_completed(futures):
+        idx = futures[future]
+        result = dict(variants[idx])
+        try:
+            result["summary"] = future.result()
+        except BrokenProcessPool as exc:
+            _discard_pool(pool)
+            result["error"] = str(exc)
+        except Exception as exc:
+            logger.warning("Chunk variant %s failed: %s", variants[idx].get("label"), exc)
+            result["error"] = str(exc)
+        results[idx] = result
+    return [r for r in results if r is not None]
@@ -21,18 +21,14 @@ from src.extractors.section_based_chunker import (
     get_chunk_statistics,
 )
 
+from chunking_pipeline.jsonl_reader import load_jsonl
+
 logger = logging.getLogger(__name__)
 
 
 def load_elements(path: Path) -> List[Dict[str, Any]]:
     """Load elements from a JSONL file."""
-    elements = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                elements.append(json.loads(line))
-    return elements
+    return load_jsonl(path, strict=True)
 
 
 def save_chunks(chunks: List[Dict[str, Any]], path: Path) -> None:
@@ -0,0 +1,97 @@
+"""Process-wide Azure Document Intelligence client.
+
+Figure OCR used to build a new ``DocumentIntelligenceClient`` per figure,
+which meant a new HTTP session and TLS handshake for every call. This module
+builds one client on first use, from credentials read once, on a
+``requests`` session whose connection pool keeps up to
+``AZURE_DI_MAX_CONNECTIONS`` connections alive. Azure SDK clients are safe
+to share across threads, so concurrent figures reuse the same pool.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Optional, Tuple
+
+from loguru import logger
+
+from chunking_pipeline.env import env_int
+
+# Environment variable names (in priority order)
+# PolicyAsCode uses AZURE_DOCUMENTINTELLIGENCE_* but we also support legacy names
+ENDPOINT_ENVS = (
+    "AZURE_DOCUMENTINTELLIGENCE_ENDPOINT",  # PolicyAsCode standard
+    "AZURE_FT_ENDPOINT",  # IngestLab legacy
+    "DOCUMENTINTELLIGENCE_ENDPOINT",
+    "DI_ENDPOINT",
+)
+KEY_ENVS = (
+    "AZURE_DOCUMENTINTELLIGENCE_KEY",  # PolicyAsCode standard
+    "AZURE_FT_KEY",  # IngestLab legacy
+    "DOCUMENTINTELLIGENCE_API_KEY",
+    "DI_KEY",
+)
+
+AZURE_DI_MAX_CONNECTIONS = max(1, env_int("AZURE_DI_MAX_CONNECTIONS", 16))
+
+_UNSET = object()
+_client: Any = _UNSET
+_client_lock = threading.Lock()
+
+
+def di_credentials() -> Optional[Tuple[str, str]]:
+    """``(endpoint, key)`` from the first non-empty env names, or ``None`` if either is missing."""
+    endpoint = next((os.environ[e] for e in ENDPOINT_ENVS if os.environ.get(e)), None)
+    key = next((os.environ[k] for k in KEY_ENVS if os.environ.get(k)), None)
+    if not endpoint or not key:
+        return None
+    return endpoint, key
+
+
+def _build_client() -> Any:
+    credentials = di_credentials()
+    if credentials is None:
+        logger.warning("Azure DI not configured - text_positions will be empty")
+        return None
+    try:
+        import requests
+        from azure.ai.documentintelligence import DocumentIntelligenceClient
+        from azure.core.credentials import AzureKeyCredential
+        from azure.core.pipeline.transport import RequestsTransport
+    except ImportError:
+        logger.warning("azure-ai-documentintelligence not installed - text_positions will be empty")
+        return None
+
+    endpoint, key = credentials
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=AZURE_DI_MAX_CONNECTIONS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # The transport owns the session, so client.close() also closes its connection pool
+    transport = RequestsTransport(session=session, session_owner=True)
+    logger.info(f"Azure DI client created (max {AZURE_DI_MAX_CONNECTIONS} pooled connections)")
+    return DocumentIntelligenceClient(endpoint=endpoint, credential=AzureKeyCredential(key), transport=transport)
+
+
+def get_di_client() -> Any:
+    """Shared ``DocumentIntelligenceClient``; ``None`` if Azure DI is not configured or installed."""
+    global _client
+    if _client is not _UNSET:
+        return _client
+    with _client_lock:
+        if _client is _UNSET:
+            _client = _build_client()
+        return _client
+
+
+def reset_di_client() -> None:
+    """Drop the shared client so the next call re-reads credentials (e.g. after a PaC reload)."""
+    global _client
+    with _client_lock:
+        client, _client = _client, _UNSET
+    if client not in (None, _UNSET):
+        try:
+            client.close()
+        except Exception:  # pragma: no cover - best-effort
+            pass
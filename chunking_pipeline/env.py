@@ -0,0 +1,39 @@
+"""Environment settings shared by chunking_pipeline modules.
+
+This package must not import ``web``, so the few settings both sides need
+live here: integer/boolean env parsing (re-exported by ``web.config``) and
+the Azure output directory that the web app's caches and job store are
+placed under.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def env_true(name: str) -> bool:
+    v = os.environ.get(name)
+    if v is None:
+        return False
+    return str(v).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def env_int(name: str, default: int) -> int:
+    v = os.environ.get(name)
+    if v is None or not str(v).strip():
+        return default
+    try:
+        return int(str(v).strip())
+    except ValueError:
+        return default
+
+
+def azure_output_dir() -> Path:
+    """``AZURE_OUTPUT_DIR``, else ``$DATA_DIR/outputs/azure``, else ``outputs/azure`` in the repo."""
+    if os.environ.get("AZURE_OUTPUT_DIR"):
+        return Path(os.environ["AZURE_OUTPUT_DIR"])
+    data_dir = os.environ.get("DATA_DIR")
+    return Path(data_dir) / "outputs" / "azure" if data_dir else ROOT / "outputs" / "azure"
@@ -0,0 +1,223 @@
+"""Content-addressed cache for figure vision results.
+
+Classification, direction detection, SAM3 segmentation and mermaid/description
+extraction are remote model calls that return the same answer for the same
+image. ``FigureProcessorWrapper`` stores each step's result here, keyed by the
+SHA-256 of the image bytes, the step's other inputs (OCR text, positions,
+forced type, ...) and a fingerprint of the vision pipeline: the installed
+PolicyAsCode version (or the dev checkout commit), the configured models and
+``FIGURE_CACHE_VERSION``. Recurring logos, the same org chart across document
+versions and repeated reprocess clicks are then answered from disk.
+
+Entries live under ``FIGURE_CACHE_DIR`` as ``<key>.json`` plus optional side
+files (the SAM3 annotated PNG). Reads refresh an entry's mtime and the oldest
+entries are evicted once the cache exceeds ``FIGURE_CACHE_MAX_MB``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from loguru import logger
+
+from chunking_pipeline.env import azure_output_dir, env_int, env_true
+
+FIGURE_CACHE_VERSION = 1
+
+# Next to the extraction cache (web.config.EXTRACTION_CACHE_DIR) by default
+FIGURE_CACHE_DIR = (
+    Path(os.environ["FIGURE_CACHE_DIR"])
+    if os.environ.get("FIGURE_CACHE_DIR")
+    else azure_output_dir() / ".cache" / "figures"
+)
+
+FIGURE_CACHE_MAX_BYTES = max(1, env_int("FIGURE_CACHE_MAX_MB", 512)) << 20
+
+# Set by refresh_figure_cache(): recompute every step but still store the results
+_REFRESH: contextvars.ContextVar[bool] = contextvars.ContextVar("figure_cache_refresh", default=False)
+
+_fingerprint: Optional[str] = None
+_fingerprint_lock = threading.Lock()
+
+
+def figure_cache_enabled() -> bool:
+    return not env_true("DISABLE_FIGURE_CACHE")
+
+
+@contextmanager
+def refresh_figure_cache() -> Iterator[None]:
+    """Bypass cached results for the steps run inside this block (and threads copying its context)."""
+    token = _REFRESH.set(True)
+    try:
+        yield
+    finally:
+        _REFRESH.reset(token)
+
+
+def _pipeline_fingerprint() -> str:
+    """Describe the vision pipeline code and models; part of every cache key."""
+    global _fingerprint
+    with _fingerprint_lock:
+        if _fingerprint is not None:
+            return _fingerprint
+        parts: Dict[str, Any] = {"v": FIGURE_CACHE_VERSION}
+        try:
+            import importlib.metadata
+
+            parts["pac"] = importlib.metadata.version("brd-to-opa-pipeline")
+        except Exception:
+            parts["pac"] = None
+        try:
+            from chunking_pipeline.pac_dev import get_pac_status, is_dev_mode_enabled
+
+            if is_dev_mode_enabled():
+                parts["pac_dev_commit"] = get_pac_status().get("commit")
+        except Exception:
+            pass
+        try:
+            from src.config.settings import settings
+
+            dumped = settings.model_dump() if hasattr(settings, "model_dump") else vars(settings)
+            parts["models"] = {
+                k: str(v) for k, v in sorted(dumped.items()) if "model" in k.lower() or "prompt" in k.lower()
+            }
+        except Exception:
+            parts["models"] = None
+        _fingerprint = hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        return _fingerprint
+
+
+def reset_pipeline_fingerprint() -> None:
+    """Recompute the pipeline fingerprint on next use (called when PaC code is reloaded)."""
+    global _fingerprint
+    with _fingerprint_lock:
+        _fingerprint = None
+
+
+def image_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of an image file's bytes."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def figure_cache_key(step: str, image_sha256: str, **inputs: Any) -> str:
+    """Key for one step's result on one image with the given inputs."""
+    config = {
+        "step": step,
+        "image": image_sha256,
+        "inputs": inputs,
+        "pipeline": _pipeline_fingerprint(),
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class FigureResultCache:
+    """On-disk JSON entries with optional side files, evicted least-recently-used first."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _path(self, key: str, suffix: str = ".json") -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not figure_cache_enabled() or _REFRESH.get():
+            return None
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                payload = json.load(fh)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable figure cache entry {path}: {exc}")
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def get_file(self, key: str, suffix: str) -> Optional[Path]:
+        """Path of a cached side file inside the cache; callers copy it and must not modify it."""
+        if not figure_cache_enabled() or _REFRESH.get():
+            return None
+        path = self._path(key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key: str, payload: Dict[str, Any], files: Optional[Dict[str, Path]] = None) -> None:
+        """Store an entry (and side files keyed by suffix); failures are logged and otherwise ignored."""
+        if not figure_cache_enabled():
+            return
+        written = 0
+        try:
+            for suffix, src in (files or {}).items():
+                written += self._atomic_write(self._path(key, suffix), Path(src).read_bytes())
+            data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+            written += self._atomic_write(self._path(key), data)
+        except OSError as exc:
+            logger.warning(f"Failed to write figure cache entry {key}: {exc}")
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size += written
+        self._evict()
+
+    def _atomic_write(self, dest: Path, data: bytes) -> int:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(dest.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, dest)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return len(data)
+
+    def _evict(self) -> None:
+        with self._lock:
+            if self._size is not None and self._size <= self.max_bytes:
+                return
+            entries: Dict[str, list] = {}
+            for path in self.root.glob("*/*"):
+                if path.suffix == ".tmp":
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                key = path.name.split(".", 1)[0]
+                entry = entries.setdefault(key, [0.0, 0, []])
+                if path.name.endswith(".json"):
+                    entry[0] = st.st_mtime
+                entry[1] += st.st_size
+                entry[2].append(path)
+            total = sum(e[1] for e in entries.values())
+            # Drop down to 90% so eviction does not run on every write
+            target = int(self.max_bytes * 0.9) if total > self.max_bytes else total
+            for _, size, paths in sorted(entries.values(), key=lambda e: e[0]):
+                if total <= target:
+                    break
+                for path in paths:
+                    path.unlink(missing_ok=True)
+                total -= size
+            self._size = total
+
+
+FIGURE_RESULT_CACHE = FigureResultCache(FIGURE_CACHE_DIR, FIGURE_CACHE_MAX_BYTES)
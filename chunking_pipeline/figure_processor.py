@@ -12,6 +12,7 @@ from __future__ import annotations
 
 import json
 import shutil
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
@@ -19,8 +20,53 @@ from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
+from chunking_pipeline.di_client import get_di_client, reset_di_client
+from chunking_pipeline.figure_cache import (
+    FIGURE_RESULT_CACHE,
+    figure_cache_key,
+    image_digest,
+    reset_pipeline_fingerprint,
+)
+
 if TYPE_CHECKING:
-    from src.figure_processing import FigureProcessor
+    from src.figure_processing import FigureClassification, FigureProcessor
+
+
+# Azure DI accepts PDF pages up to 17 x 17 inches
+_MAX_OCR_PAGE_POINTS = 17 * 72
+
+
+def _page_text_positions(page: Any, page_size: tuple[float, float] | None = None) -> list[dict[str, Any]]:
+    """Word boxes of one Azure DI result page, normalized to 0-1 of the page size.
+
+    ``page_size`` is only used when Azure omits the page dimensions.
+    """
+    page_width = page.width or (page_size[0] if page_size else None)
+    page_height = page.height or (page_size[1] if page_size else None)
+    if not page_width or not page_height:
+        return []
+
+    positions: list[dict[str, Any]] = []
+    for word in page.words or []:
+        if not word.content or not word.polygon:
+            continue
+
+        # Convert polygon to bounding box (polygon is [x1,y1,x2,y2,...])
+        xs = [word.polygon[i] for i in range(0, len(word.polygon), 2)]
+        ys = [word.polygon[i] for i in range(1, len(word.polygon), 2)]
+
+        x_min, x_max = min(xs), max(xs)
+        y_min, y_max = min(ys), max(ys)
+
+        # Normalize to 0-1
+        positions.append({
+            "x": round(x_min / page_width, 4),
+            "y": round(y_min / page_height, 4),
+            "width": round((x_max - x_min) / page_width, 4),
+            "height": round((y_max - y_min) / page_height, 4),
+            "content": word.content,
+        })
+    return positions
 
 
 class FigureProcessorWrapper:
@@ -29,6 +75,8 @@ class FigureProcessorWrapper:
     def __init__(self) -> None:
         """Initialize the processor lazily to avoid import overhead."""
         self._processor: FigureProcessor | None = None
+        # Figures of one job are processed on several threads; build the processor once
+        self._init_lock = threading.Lock()
 
     def reset(self) -> None:
         """Clear cached processor to force re-initialization.
@@ -37,32 +85,144 @@ class FigureProcessorWrapper:
         is used on the next figure processing request.
         """
         self._processor = None
+        reset_pipeline_fingerprint()
+        reset_di_client()
         logger.debug("FigureProcessorWrapper reset - will reinitialize on next use")
 
     def _get_processor(self) -> FigureProcessor:
         """Lazy-load the FigureProcessor from PolicyAsCode."""
-        if self._processor is None:
-            try:
-                from src.config.settings import settings
-                from src.figure_processing import FigureProcessor
-                from src.utils.ai_client import create_client
-
-                # Create separate client for mermaid generation (text-only with no reasoning)
-                mermaid_client = create_client(
-                    model=settings.mermaid_model,
-                    context="FigureProcessor_mermaid"
-                )
+        if self._processor is not None:
+            return self._processor
+        with self._init_lock:
+            if self._processor is None:
+                try:
+                    from src.config.settings import settings
+                    from src.figure_processing import FigureProcessor
+                    from src.utils.ai_client import create_client
+
+                    # Create separate client for mermaid generation (text-only with no reasoning)
+                    mermaid_client = create_client(
+                        model=settings.mermaid_model,
+                        context="FigureProcessor_mermaid"
+                    )
 
-                self._processor = FigureProcessor(
-                    mermaid_client=mermaid_client
-                )
-                logger.info("FigureProcessor initialized from PolicyAsCode with separate mermaid client")
-            except ImportError as e:
-                raise ImportError(
-                    "FigureProcessor not available. Ensure PolicyAsCode is installed "
-                    "from the feature/chunking-visualizer-integration branch."
-                ) from e
-        return self._processor
+                    self._processor = FigureProcessor(
+                        mermaid_client=mermaid_client
+                    )
+                    logger.info("FigureProcessor initialized from PolicyAsCode with separate mermaid client")
+                except ImportError as e:
+                    raise ImportError(
+                        "FigureProcessor not available. Ensure PolicyAsCode is installed "
+                        "from the feature/chunking-visualizer-integration branch."
+                    ) from e
+            return self._processor
+
+    # -- Cached vision steps (see chunking_pipeline/figure_cache.py) --
+
+    def _classify(self, image_path: Path, ocr_text: str = "") -> FigureClassification:
+        """Classify a figure, reusing the cached result for identical image bytes."""
+        from src.figure_processing import FigureClassification
+
+        key = figure_cache_key("classify", image_digest(image_path), ocr_text=ocr_text)
+        cached = FIGURE_RESULT_CACHE.get(key)
+        if cached is not None:
+            logger.debug(f"Figure cache hit: classification for {image_path.name}")
+            return FigureClassification.model_validate(cached)
+        classification = self._get_processor().classify_figure(image_path, ocr_text=ocr_text)
+        FIGURE_RESULT_CACHE.put(key, classification.model_dump(mode="json"))
+        return classification
+
+    def _detect_direction(self, image_path: Path) -> str:
+        """Detect flow direction (LR/TB/RL/BT); falls back to LR, which is not cached."""
+        key = figure_cache_key("direction", image_digest(image_path))
+        cached = FIGURE_RESULT_CACHE.get(key)
+        if cached is not None:
+            logger.debug(f"Figure cache hit: direction for {image_path.name}")
+            return cached["direction"]
+        try:
+            from src.prompts.figure_direction_prompt import detect_direction
+
+            direction_result = detect_direction(image_path)
+            direction = direction_result.direction.value
+            logger.debug(f"Detected flow direction: {direction}")
+        except Exception as e:
+            logger.warning(f"Direction detection failed, using default LR: {e}")
+            return "LR"
+        FIGURE_RESULT_CACHE.put(key, {"direction": direction})
+        return direction
+
+    def segment_and_annotate(
+        self,
+        image_path: str | Path,
+        *,
+        text_positions: list[dict[str, Any]] | None = None,
+        direction: str = "LR",
+    ) -> tuple[Path | None, list[dict[str, Any]] | None, list[dict[str, Any]] | None]:
+        """Run SAM3 segmentation + annotation, reusing cached shapes and annotated image.
+
+        Returns ``(annotated_path, shape_positions, annotated_text_positions)``
+        like PaC's ``FigureProcessor.segment_and_annotate``; errors propagate
+        and are never cached. On a cache hit ``annotated_path`` points into the
+        figure cache, so callers copy it rather than move or edit it.
+        """
+        image_path = Path(image_path)
+        key = figure_cache_key(
+            "segment", image_digest(image_path), text_positions=text_positions, direction=direction
+        )
+        cached = FIGURE_RESULT_CACHE.get(key)
+        if cached is not None:
+            annotated_path = FIGURE_RESULT_CACHE.get_file(key, ".annotated.png")
+            if annotated_path is not None:
+                logger.debug(f"Figure cache hit: SAM3 segmentation for {image_path.name}")
+                return annotated_path, cached["shape_positions"], cached.get("text_positions")
+
+        annotated_path, shape_positions, annotated_text_positions = self._get_processor().segment_and_annotate(
+            image_path,
+            text_positions=text_positions,
+            direction=direction,
+        )
+        if annotated_path and shape_positions and Path(annotated_path).exists():
+            FIGURE_RESULT_CACHE.put(
+                key,
+                {"shape_positions": shape_positions, "text_positions": annotated_text_positions},
+                files={".annotated.png": Path(annotated_path)},
+            )
+        return annotated_path, shape_positions, annotated_text_positions
+
+    def _process(
+        self,
+        image_path: Path,
+        *,
+        ocr_text: str,
+        shape_positions: list[dict[str, Any]] | None,
+        text_positions: list[dict[str, Any]] | None,
+        run_id: str | None,
+        force_type: Any,
+    ) -> dict[str, Any]:
+        """Run PaC's mermaid/description step, reusing the cached result for identical inputs."""
+        key = figure_cache_key(
+            "process",
+            image_digest(image_path),
+            ocr_text=ocr_text,
+            shape_positions=shape_positions,
+            text_positions=text_positions,
+            force_type=getattr(force_type, "value", force_type),
+        )
+        cached = FIGURE_RESULT_CACHE.get(key)
+        if cached is not None:
+            logger.debug(f"Figure cache hit: processing result for {image_path.name}")
+            return cached
+        result = self._get_processor().process_figure(
+            image_path=image_path,
+            ocr_text=ocr_text,
+            shape_positions=shape_positions,
+            text_positions=text_positions,
+            run_id=run_id,
+            force_type=force_type,
+        )
+        result_dict = result.model_dump(mode="json")
+        FIGURE_RESULT_CACHE.put(key, result_dict)
+        return result_dict
 
     def extract_text_positions_from_image(
         self,
@@ -81,59 +241,24 @@ class FigureProcessorWrapper:
             x, y, width, height are 0-1 relative to image dimensions.
             Returns empty list if Azure DI is not configured or fails.
         """
-        import os
+        import io
 
         from PIL import Image
 
-        # Environment variable names (same as azure_pipeline.py)
-        endpoint_envs = (
-            "AZURE_DOCUMENTINTELLIGENCE_ENDPOINT",
-            "AZURE_FT_ENDPOINT",
-            "DOCUMENTINTELLIGENCE_ENDPOINT",
-            "DI_ENDPOINT",
-        )
-        key_envs = (
-            "AZURE_DOCUMENTINTELLIGENCE_KEY",
-            "AZURE_FT_KEY",
-            "DOCUMENTINTELLIGENCE_API_KEY",
-            "DI_KEY",
-        )
-
-        # Get credentials
-        endpoint = next((os.environ.get(e) for e in endpoint_envs if os.environ.get(e)), None)
-        key = next((os.environ.get(k) for k in key_envs if os.environ.get(k)), None)
-
-        if not endpoint or not key:
-            logger.warning("Azure DI not configured - text_positions will be empty")
-            return []
-
         image_path = Path(image_path)
         if not image_path.exists():
             logger.warning(f"Image not found: {image_path}")
             return []
 
-        try:
-            from azure.ai.documentintelligence import DocumentIntelligenceClient
-            from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
-            from azure.core.credentials import AzureKeyCredential
-        except ImportError:
-            logger.warning("azure-ai-documentintelligence not installed - text_positions will be empty")
+        client = get_di_client()
+        if client is None:
             return []
 
+        from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
+
         try:
-            # Get image dimensions for normalization
-            with Image.open(image_path) as img:
-                img_width, img_height = img.size
-
-            # Read image bytes
-            with open(image_path, "rb") as f:
-                image_bytes = f.read()
-
-            # Call Azure DI
-            client = DocumentIntelligenceClient(
-                endpoint=endpoint,
-                credential=AzureKeyCredential(key),
-            )
+            # Read the image once; dimensions are only needed if Azure omits page size
+            image_bytes = image_path.read_bytes()
 
             logger.info(f"Extracting text positions from image via Azure DI: {image_path.name}")
 
@@ -146,32 +271,12 @@ class FigureProcessorWrapper:
             # Extract word-level positions
             text_positions: list[dict[str, Any]] = []
 
-            if result.pages:
-                for page in result.pages:
-                    # Get page dimensions (Azure uses points, we need relative)
-                    page_width = page.width or img_width
-                    page_height = page.height or img_height
-
-                    if page.words:
-                        for word in page.words:
-                            if not word.content or not word.polygon:
-                                continue
-
-                            # Convert polygon to bounding box (polygon is [x1,y1,x2,y2,...])
-                            xs = [word.polygon[i] for i in range(0, len(word.polygon), 2)]
-                            ys = [word.polygon[i] for i in range(1, len(word.polygon), 2)]
-
-                            x_min, x_max = min(xs), max(xs)
-                            y_min, y_max = min(ys), max(ys)
-
-                            # Normalize to 0-1
-                            text_positions.append({
-                                "x": round(x_min / page_width, 4),
-                                "y": round(y_min / page_height, 4),
-                                "width": round((x_max - x_min) / page_width, 4),
-                                "height": round((y_max - y_min) / page_height, 4),
-                                "content": word.content,
-                            })
+            for page in result.pages or []:
+                page_size = None
+                if not page.width or not page.height:
+                    with Image.open(io.BytesIO(image_bytes)) as img:
+                        page_size = img.size
+                text_positions.extend(_page_text_positions(page, page_size))
 
             logger.info(f"Extracted {len(text_positions)} text positions from image")
             return text_positions
@@ -180,6 +285,78 @@ class FigureProcessorWrapper:
             logger.warning(f"Azure DI text extraction failed: {e}")
             return []
 
+    def extract_text_positions_batch(
+        self,
+        image_paths: list[str | Path],
+        *,
+        batch_size: int = 50,
+    ) -> dict[Path, list[dict[str, Any]]]:
+        """Extract text positions for many images with one Azure DI request per batch.
+
+        The images are packed into a multi-page PDF, one image per page, and
+        sent as a single analyze request. Each result page's words are
+        normalized to its own page size, so positions match what
+        ``extract_text_positions_from_image`` returns for that image alone.
+
+        Args:
+            image_paths: Paths to the image files (PNG/JPEG)
+            batch_size: Maximum images (pages) per request
+
+        Returns:
+            Mapping of image path to its text positions. Images whose batch
+            failed or that could not be packed are left out, so callers can
+            fall back to ``extract_text_positions_from_image``.
+        """
+        import fitz  # PyMuPDF
+
+        client = get_di_client()
+        if client is None:
+            return {}
+
+        from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
+
+        paths = [Path(p) for p in image_paths]
+        results: dict[Path, list[dict[str, Any]]] = {}
+        for start in range(0, len(paths), max(1, batch_size)):
+            batch = paths[start : start + max(1, batch_size)]
+            packed: list[Path] = []
+            with fitz.open() as doc:
+                for path in batch:
+                    try:
+                        with fitz.open(path) as img:
+                            rect = img[0].rect
+                        # Keep pages within Azure DI's 17 x 17 inch PDF page limit
+                        scale = min(1.0, _MAX_OCR_PAGE_POINTS / max(rect.width, rect.height))
+                        page = doc.new_page(width=rect.width * scale, height=rect.height * scale)
+                        page.insert_image(page.rect, filename=str(path))
+                        packed.append(path)
+                    except Exception as e:
+                        logger.warning(f"Could not pack {path.name} for batch OCR: {e}")
+                if not packed:
+                    continue
+                pdf_bytes = doc.tobytes()
+
+            try:
+                logger.info(f"Extracting text positions from {len(packed)} images via one Azure DI request")
+                poller = client.begin_analyze_document(
+                    model_id="prebuilt-layout",
+                    body=AnalyzeDocumentRequest(bytes_source=pdf_bytes),
+                )
+                result = poller.result()
+            except Exception as e:
+                logger.warning(f"Azure DI batch text extraction failed: {e}")
+                continue
+
+            # Only pages Azure returned count; a partial result (or the F0 tier's
+            # two-page limit) leaves the rest absent so they fall back to single OCR
+            for page in result.pages or []:
+                idx = (page.page_number or 0) - 1
+                if 0 <= idx < len(packed):
+                    results.setdefault(packed[idx], []).extend(_page_text_positions(page))
+
+        logger.info(f"Extracted text positions for {len(results)} of {len(paths)} images")
+        return results
+
     def process_figure(
         self,
         image_path: str | Path,
@@ -214,7 +391,6 @@ class FigureProcessorWrapper:
         from src.figure_processing import FigureProcessor as PolicyFigureProcessor
         from src.figure_processing import FigureType
 
-        processor = self._get_processor()
         image_path = Path(image_path)
 
         # Use forced type or classify to determine figure type
@@ -232,7 +408,7 @@ class FigureProcessorWrapper:
             logger.info(f"Using forced type: {force_type}")
         else:
             # Classify first to determine if SAM3 annotations are needed
-            classification = processor.classify_figure(image_path, ocr_text=ocr_text)
+            classification = self._classify(image_path, ocr_text=ocr_text)
 
         shape_positions = None
         annotated_path = None
@@ -241,19 +417,11 @@ class FigureProcessorWrapper:
 
         if classification.figure_type in PolicyFigureProcessor.FLOWCHART_TYPES:
             # Detect flow direction for SAM3
-            direction = "LR"
-            try:
-                from src.prompts.figure_direction_prompt import detect_direction
-
-                direction_result = detect_direction(image_path)
-                direction = direction_result.direction.value
-                logger.debug(f"Detected flow direction: {direction}")
-            except Exception as e:
-                logger.warning(f"Direction detection failed, using default LR: {e}")
+            direction = self._detect_direction(image_path)
 
             # Use processor's segment_and_annotate (Facade pattern from PaC)
             try:
-                annotated_path, shape_positions, _ = processor.segment_and_annotate(
+                annotated_path, shape_positions, _ = self.segment_and_annotate(
                     image_path,
                     text_positions=text_positions,
                     direction=direction,
@@ -282,15 +450,14 @@ class FigureProcessorWrapper:
                 )
 
         # Call processor with shape_positions (if flowchart) and force_type
-        result = processor.process_figure(
-            image_path=processing_image_path,
+        result_dict = self._process(
+            processing_image_path,
             ocr_text=ocr_text,
             shape_positions=shape_positions,
             text_positions=text_positions,
             run_id=run_id,
             force_type=classification.figure_type,
         )
-        result_dict = result.model_dump()
 
         # Include SAM3 data for downstream use (annotated image, shape colors)
         if shape_positions:
@@ -334,8 +501,7 @@ class FigureProcessorWrapper:
         Returns:
             Dict with figure_type, confidence, and reasoning
         """
-        processor = self._get_processor()
-        result = processor.classify_figure(Path(image_path), ocr_text=ocr_text)
+        result = self._classify(Path(image_path), ocr_text=ocr_text)
         return result.model_dump()
 
     def classify_only(
@@ -363,11 +529,10 @@ class FigureProcessorWrapper:
                 - classification_duration_ms: Time taken for classification
                 - model_config: Configuration used for classification
         """
-        processor = self._get_processor()
         image_path = Path(image_path)
 
         classification_start = time.perf_counter()
-        classification = processor.classify_figure(image_path, ocr_text=ocr_text)
+        classification = self._classify(image_path, ocr_text=ocr_text)
         classification_duration = int((time.perf_counter() - classification_start) * 1000)
 
         return {
@@ -403,14 +568,13 @@ class FigureProcessorWrapper:
         """
         from src.figure_processing import FigureType
 
-        processor = self._get_processor()
         image_path = Path(image_path)
 
         description_start = time.perf_counter()
 
         # Process the figure with force_type=OTHER to skip SAM3 and get description
-        result = processor.process_figure(
-            image_path=image_path,
+        result = self._process(
+            image_path,
             ocr_text=ocr_text,
             shape_positions=None,
             text_positions=None,
@@ -422,8 +586,8 @@ class FigureProcessorWrapper:
 
         return {
             "figure_type": "other",
-            "description": result.description,
-            "processed_content": result.processed_content,
+            "description": result.get("description"),
+            "processed_content": result.get("processed_content"),
             "description_duration_ms": description_duration,
         }
 
@@ -449,18 +613,9 @@ class FigureProcessorWrapper:
                 - model_config: Configuration used for detection
         """
         image_path = Path(image_path)
-        direction = "LR"  # Default fallback
 
         direction_start = time.perf_counter()
-        try:
-            from src.prompts.figure_direction_prompt import detect_direction
-
-            direction_result = detect_direction(image_path)
-            direction = direction_result.direction.value
-            logger.debug(f"Detected flow direction: {direction}")
-        except Exception as e:
-            logger.warning(f"Direction detection failed, using default LR: {e}")
-
+        direction = self._detect_direction(image_path)
         direction_duration = int((time.perf_counter() - direction_start) * 1000)
 
         return {
@@ -499,12 +654,11 @@ class FigureProcessorWrapper:
         """
         from src.figure_processing import FigureProcessor as PolicyFigureProcessor
 
-        processor = self._get_processor()
         image_path = Path(image_path)
 
         # Step 1: Classification
         classification_start = time.perf_counter()
-        classification = processor.classify_figure(image_path, ocr_text=ocr_text)
+        classification = self._classify(image_path, ocr_text=ocr_text)
         classification_duration = int((time.perf_counter() - classification_start) * 1000)
 
         result: dict[str, Any] = {
@@ -524,16 +678,8 @@ class FigureProcessorWrapper:
             return result
 
         # Detect flow direction
-        direction = "LR"
         direction_start = time.perf_counter()
-        try:
-            from src.prompts.figure_direction_prompt import detect_direction
-
-            direction_result = detect_direction(image_path)
-            direction = direction_result.direction.value
-            logger.debug(f"Detected flow direction: {direction}")
-        except Exception as e:
-            logger.warning(f"Direction detection failed, using default LR: {e}")
+        direction = self._detect_direction(image_path)
         direction_duration = int((time.perf_counter() - direction_start) * 1000)
 
         result["direction"] = direction
@@ -547,7 +693,7 @@ class FigureProcessorWrapper:
             logger.debug(f"  text_positions: {len(text_positions) if text_positions else 'None'}")
             logger.debug(f"  direction: {direction}")
 
-            annotated_path, shape_positions, annotated_text_positions = processor.segment_and_annotate(
+            annotated_path, shape_positions, annotated_text_positions = self.segment_and_annotate(
                 image_path,
                 text_positions=text_positions,
                 direction=direction,
@@ -689,7 +835,6 @@ class FigureProcessorWrapper:
         """
         from src.figure_processing import FigureType
 
-        processor = self._get_processor()
         image_path = Path(image_path)
 
         # Use annotated image if available
@@ -722,8 +867,8 @@ class FigureProcessorWrapper:
         logger.debug(f"  force_type: {force_type}")
 
         # Call processor with pre-computed shape positions
-        result = processor.process_figure(
-            image_path=processing_image_path,
+        result = self._process(
+            processing_image_path,
             ocr_text=ocr_text,
             shape_positions=shape_positions,
             text_positions=text_positions,
@@ -734,11 +879,11 @@ class FigureProcessorWrapper:
         # Debug logging for result inspection
         logger.debug(
             f"Raw result processed_content (first 500 chars): "
-            f"{result.processed_content[:500] if result.processed_content else 'None'}"
+            f"{result['processed_content'][:500] if result.get('processed_content') else 'None'}"
         )
-        logger.debug(f"Result intermediate_nodes: {result.intermediate_nodes}")
+        logger.debug(f"Result intermediate_nodes: {result.get('intermediate_nodes')}")
 
-        return result.model_dump()
+        return result
 
     def extract_mermaid_and_save(
         self,
@@ -988,14 +1133,16 @@ class FigureProcessorWrapper:
 
 # Module-level singleton for convenience
 _processor: FigureProcessorWrapper | None = None
+_processor_lock = threading.Lock()
 
 
 def get_processor() -> FigureProcessorWrapper:
     """Get or create the module-level FigureProcessorWrapper instance."""
     global _processor
-    if _processor is None:
-        _processor = FigureProcessorWrapper()
-    return _processor
+    with _processor_lock:
+        if _processor is None:
+            _processor = FigureProcessorWrapper()
+        return _processor
 
 
 def reset_processor() -> None:
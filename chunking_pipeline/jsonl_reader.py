@@ -0,0 +1,147 @@
+"""Shared streaming reader for elements/chunks JSONL files.
+
+Every JSONL consumer (element indexes, chunk views, figure routes, the
+chunker) reads files the same way: one JSON object per line, blank and
+malformed lines skipped. This module does that once, with the fastest
+decoder available:
+
+- ``orjson`` or ``msgspec`` when installed (``uv sync --extra fast-json``),
+  falling back to the standard library ``json``;
+- lines are read as bytes, so decoders that accept bytes skip a UTF-8
+  decode pass and byte offsets are exact;
+- ``contains`` pre-filters raw lines by substring before decoding, so scans
+  that look for a few ids or one element type do not decode every line;
+- ``fields`` projects each record down to the top-level keys a caller needs.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:  # optional fast decoders
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+try:
+    import msgspec as _msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    _msgspec = None
+
+
+_STDLIB_DECODER = json.JSONDecoder()
+
+
+def _stdlib_decode(raw: Union[bytes, str]) -> Any:
+    # json.loads(bytes) sniffs the encoding on every call; lines are UTF-8
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    return _STDLIB_DECODER.decode(raw)
+
+
+def _select_backend() -> Tuple[str, Callable[[bytes], Any], Tuple[type, ...]]:
+    if _orjson is not None:
+        return "orjson", _orjson.loads, (_orjson.JSONDecodeError,)
+    if _msgspec is not None:
+        return "msgspec", _msgspec.json.decode, (_msgspec.DecodeError,)
+    return "json", _stdlib_decode, (json.JSONDecodeError, UnicodeDecodeError)
+
+
+JSON_BACKEND, _decode, _DECODE_ERRORS = _select_backend()
+
+
+def loads(raw: Union[bytes, str]) -> Any:
+    """Decode one JSON document with the selected backend."""
+    return _decode(raw)
+
+
+def _matches(raw: bytes, needles: Optional[Tuple[bytes, ...]]) -> bool:
+    return needles is None or any(n in raw for n in needles)
+
+
+def _encode_needles(contains: Optional[Iterable[Union[str, bytes]]]) -> Optional[Tuple[bytes, ...]]:
+    if contains is None:
+        return None
+    return tuple(n.encode("utf-8") if isinstance(n, str) else n for n in contains)
+
+
+def iter_jsonl_spans(
+    path: Path,
+    *,
+    contains: Optional[Iterable[Union[str, bytes]]] = None,
+    fields: Optional[Iterable[str]] = None,
+    strict: bool = False,
+) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """Yield ``(byte offset, byte length, record)`` for each JSON object line.
+
+    Blank lines and non-object records are skipped; malformed lines are
+    skipped too unless ``strict`` is set. ``contains`` keeps only lines
+    holding at least one of the given substrings (checked on the raw bytes,
+    before decoding); ``fields`` trims each record to those top-level keys.
+    """
+    needles = _encode_needles(contains)
+    keep = tuple(fields) if fields is not None else None
+    with Path(path).open("rb") as fh:
+        offset = 0
+        for raw in fh:
+            start, offset = offset, offset + len(raw)
+            line = raw.strip()
+            if not line or not _matches(line, needles):
+                continue
+            try:
+                obj = _decode(line)
+            except _DECODE_ERRORS:
+                if strict:
+                    raise
+                continue
+            if not isinstance(obj, dict):
+                continue
+            if keep is not None:
+                obj = {k: obj[k] for k in keep if k in obj}
+            yield start, len(raw), obj
+
+
+def iter_jsonl(
+    path: Path,
+    *,
+    contains: Optional[Iterable[Union[str, bytes]]] = None,
+    fields: Optional[Iterable[str]] = None,
+    strict: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Yield each JSON object in a JSONL file (see :func:`iter_jsonl_spans`)."""
+    for _, _, obj in iter_jsonl_spans(path, contains=contains, fields=fields, strict=strict):
+        yield obj
+
+
+def load_jsonl(
+    path: Path,
+    *,
+    contains: Optional[Iterable[Union[str, bytes]]] = None,
+    fields: Optional[Iterable[str]] = None,
+    strict: bool = False,
+) -> List[Dict[str, Any]]:
+    """Read every JSON object in a JSONL file into a list."""
+    return list(iter_jsonl(path, contains=contains, fields=fields, strict=strict))
+
+
+def _decode_record(raw: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        obj = _decode(raw.strip())
+    except _DECODE_ERRORS:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def read_records(path: Path, spans: Iterable[Tuple[int, int]]) -> Iterator[Optional[Dict[str, Any]]]:
+    """Decode the records at known byte spans, in order; ``None`` for spans that no longer parse."""
+    with Path(path).open("rb") as fh:
+        for start, length in spans:
+            fh.seek(start)
+            yield _decode_record(fh.read(length))
+
+
+def read_record(path: Path, start: int, length: int) -> Optional[Dict[str, Any]]:
+    """Decode the single record stored at a known byte span; ``None`` if it no longer parses."""
+    return next(read_records(path, [(start, length)]))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark JSONL parse throughput for elements/chunks files.
+
+Compares the standard library ``json`` per-line loop (what the readers used
+before ``chunking_pipeline.jsonl_reader``) against the shared reader with
+each installed decoder backend, and reports MB/s.
+
+Usage:
+    uv run python scripts/bench_jsonl.py                       # 3 largest elements files under outputs/
+    uv run python scripts/bench_jsonl.py path/to/run.elements.jsonl --repeat 5
+    uv run python scripts/bench_jsonl.py --top 10 --glob "*.chunks.jsonl"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chunking_pipeline import jsonl_reader
+
+
+def _stdlib_loop(path: Path) -> int:
+    count = 0
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            count += 1
+    return count
+
+
+def _reader_with(decode: Callable, errors: tuple) -> Callable[[Path], int]:
+    def run(path: Path) -> int:
+        saved = jsonl_reader._decode, jsonl_reader._DECODE_ERRORS
+        jsonl_reader._decode, jsonl_reader._DECODE_ERRORS = decode, errors
+        try:
+            return sum(1 for _ in jsonl_reader.iter_jsonl(path))
+        finally:
+            jsonl_reader._decode, jsonl_reader._DECODE_ERRORS = saved
+
+    return run
+
+
+def _candidates() -> Dict[str, Callable[[Path], int]]:
+    runs: Dict[str, Callable[[Path], int]] = {"stdlib loop": _stdlib_loop}
+    runs["reader/json"] = _reader_with(jsonl_reader._stdlib_decode, (json.JSONDecodeError, UnicodeDecodeError))
+    if jsonl_reader._orjson is not None:
+        orjson = jsonl_reader._orjson
+        runs["reader/orjson"] = _reader_with(orjson.loads, (orjson.JSONDecodeError,))
+    if jsonl_reader._msgspec is not None:
+        msgspec = jsonl_reader._msgspec
+        runs["reader/msgspec"] = _reader_with(msgspec.json.decode, (msgspec.DecodeError,))
+    return runs
+
+
+def _bench(fn: Callable[[Path], int], path: Path, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSONL parse throughput")
+    parser.add_argument("paths", nargs="*", type=Path, help="JSONL files (default: largest under outputs/)")
+    parser.add_argument("--glob", default="*.elements.jsonl", help="Pattern used when no paths are given")
+    parser.add_argument("--top", type=int, default=3, help="How many of the largest files to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend (best time is reported)")
+    args = parser.parse_args(argv)
+
+    paths = args.paths
+    if not paths:
+        root = Path(__file__).resolve().parent.parent / "outputs"
+        paths = sorted(root.rglob(args.glob), key=lambda p: p.stat().st_size, reverse=True)[: args.top]
+    if not paths:
+        print("No JSONL files found; pass paths explicitly.", file=sys.stderr)
+        return 1
+
+    print(f"Default reader backend: {jsonl_reader.JSON_BACKEND}")
+    runs = _candidates()
+    for path in paths:
+        size_mb = path.stat().st_size / (1 << 20)
+        records = _stdlib_loop(path)
+        print(f"\n{path} ({size_mb:.1f} MB, {records} records)")
+        baseline = None
+        for name, fn in runs.items():
+            seconds = _bench(fn, path, args.repeat)
+            baseline = baseline or seconds
+            mbps = size_mb / seconds if seconds else float("inf")
+            print(f"  {name:<16} {seconds * 1000:9.1f} ms  {mbps:8.1f} MB/s  x{baseline / seconds:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+"""Content-addressed image blobs served by URL.
+
+Element details and figure uploads used to inline whole images as base64
+data URIs. Instead, images are copied once into ``BLOB_STORE_DIR`` under the
+SHA-256 of their bytes, and JSON responses carry ``/api/blobs/<sha256>.<ext>``
+URLs. Since a URL never changes meaning, the blob route can answer with a
+strong ETag and an immutable ``Cache-Control``, and browsers only fetch an
+image when it is actually shown.
+
+Blobs are copies, not links, because the figure pass rewrites its PNGs in
+place. Issuing or serving a blob refreshes its mtime and the least recently
+used blobs are evicted once the store exceeds ``BLOB_STORE_MAX_MB``. Blobs
+used within ``BLOB_STORE_PIN_HOURS`` are never evicted, so a URL stays valid
+for at least that long after a client received it; after that it may 404 and
+the client has to refetch the payload that referenced it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .config import BLOB_STORE_DIR, BLOB_STORE_MAX_MB, BLOB_STORE_PIN_HOURS
+from .extraction_cache import file_digest
+
+logger = logging.getLogger("chunking.blob_store")
+
+BLOB_URL_PREFIX = "/api/blobs/"
+
+_NAME_RE = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]{1,8})$")
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+
+# (path, size, mtime_ns) -> digest, so unchanged files are not re-hashed per request
+_DIGEST_CACHE_SIZE = 4096
+_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_digests_lock = threading.Lock()
+
+_evict_lock = threading.Lock()
+_store_size: Optional[int] = None
+
+
+def _extension(mime_type: Optional[str], name: str = "") -> str:
+    suffix = Path(name).suffix.lower()
+    if suffix and _NAME_RE.match("0" * 64 + suffix):
+        return suffix
+    ext = _EXTENSIONS.get(mime_type or "") or mimetypes.guess_extension(mime_type or "") or ".bin"
+    return ext if _NAME_RE.match("0" * 64 + ext) else ".bin"
+
+
+def blob_path(digest: str, ext: str) -> Path:
+    return BLOB_STORE_DIR / digest[:2] / f"{digest}{ext}"
+
+
+def blob_url(digest: str, ext: str) -> str:
+    return f"{BLOB_URL_PREFIX}{digest}{ext}"
+
+
+def _cached_digest(path: Path) -> str:
+    st = path.stat()
+    stamp = (str(path), st.st_size, st.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(stamp)
+        if digest is not None:
+            _digests.move_to_end(stamp)
+            return digest
+    digest = file_digest(path)
+    with _digests_lock:
+        _digests[stamp] = digest
+        while len(_digests) > _DIGEST_CACHE_SIZE:
+            _digests.popitem(last=False)
+    return digest
+
+
+def _write_blob(dest: Path, write) -> None:
+    global _store_size
+    if dest.exists():
+        try:
+            os.utime(dest)  # re-issued URL: pin it like a freshly written blob
+        except OSError:
+            pass
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(dest.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp, dest)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    with _evict_lock:
+        if _store_size is not None:
+            _store_size += dest.stat().st_size
+    _evict()
+
+
+def store_blob_file(path: Path, mime_type: Optional[str] = None) -> Optional[str]:
+    """Copy an image file into the blob store and return its URL (``None`` on failure)."""
+    try:
+        digest = _cached_digest(path)
+        ext = _extension(mime_type, path.name)
+
+        def _copy(fh) -> None:
+            with path.open("rb") as src:
+                for chunk in iter(lambda: src.read(1 << 20), b""):
+                    fh.write(chunk)
+
+        _write_blob(blob_path(digest, ext), _copy)
+        return blob_url(digest, ext)
+    except OSError as exc:
+        logger.warning(f"Failed to store image blob for {path}: {exc}")
+        return None
+
+
+def store_blob_bytes(data: bytes, mime_type: Optional[str] = None) -> Optional[str]:
+    """Store image bytes in the blob store and return their URL (``None`` on failure)."""
+    digest = hashlib.sha256(data).hexdigest()
+    ext = _extension(mime_type)
+    try:
+        _write_blob(blob_path(digest, ext), lambda fh: fh.write(data))
+    except OSError as exc:
+        logger.warning(f"Failed to store image blob {digest}: {exc}")
+        return None
+    return blob_url(digest, ext)
+
+
+def resolve_blob(name: str) -> Optional[Tuple[Path, str, str]]:
+    """``(path, digest, media type)`` for a ``<sha256>.<ext>`` blob name, or ``None`` if unknown."""
+    match = _NAME_RE.match(name)
+    if not match:
+        return None
+    digest, ext = match.groups()
+    path = blob_path(digest, ext)
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    return path, digest, media_type
+
+
+def _evict() -> None:
+    global _store_size
+    max_bytes = BLOB_STORE_MAX_MB << 20
+    with _evict_lock:
+        if _store_size is not None and _store_size <= max_bytes:
+            return
+        entries = []
+        for path in BLOB_STORE_DIR.glob("*/*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        # Drop down to 90% so eviction does not run on every write
+        target = int(max_bytes * 0.9) if total > max_bytes else total
+        pinned_since = time.time() - BLOB_STORE_PIN_HOURS * 3600
+        for mtime, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= target or mtime >= pinned_since:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        _store_size = total
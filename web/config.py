@@ -7,6 +7,8 @@ from typing import Iterable, Optional
 from urllib.error import URLError
 from urllib.request import urlopen
 
+from chunking_pipeline.env import azure_output_dir, env_int, env_true
+
 ROOT = Path(__file__).resolve().parents[1]
 DATASET_DIR = ROOT / "dataset"
 
@@ -20,10 +22,27 @@ else:
     OUT_DIR = ROOT / "outputs" / "unstructured"
 REVIEWS_DIR = OUT_DIR / "reviews"
 
-AZURE_OUT_DIR = (
-    Path(os.environ.get("AZURE_OUTPUT_DIR"))
-    if os.environ.get("AZURE_OUTPUT_DIR")
-    else (Path(_DATA_DIR) / "outputs" / "azure" if _DATA_DIR else ROOT / "outputs" / "azure")
+AZURE_OUT_DIR = azure_output_dir()
+
+# Durable extraction job store (SQLite, see web/job_store.py)
+EXTRACTION_JOBS_DB = (
+    Path(os.environ["EXTRACTION_JOBS_DB"])
+    if os.environ.get("EXTRACTION_JOBS_DB")
+    else AZURE_OUT_DIR / "extraction_jobs.sqlite3"
+)
+
+# Content-addressed cache of Azure DI results (see web/extraction_cache.py)
+EXTRACTION_CACHE_DIR = (
+    Path(os.environ["EXTRACTION_CACHE_DIR"])
+    if os.environ.get("EXTRACTION_CACHE_DIR")
+    else AZURE_OUT_DIR / ".cache" / "extractions"
+)
+
+# Content-addressed image blobs served at /api/blobs (see web/blob_store.py)
+BLOB_STORE_DIR = (
+    Path(os.environ["BLOB_STORE_DIR"])
+    if os.environ.get("BLOB_STORE_DIR")
+    else AZURE_OUT_DIR / ".cache" / "blobs"
 )
 
 _PDF_DIR_ENV = os.environ.get("PDF_DIR")
@@ -91,11 +110,27 @@ def ensure_dirs() -> None:
         cfg["out_dir"].mkdir(parents=True, exist_ok=True)
 
 
-def env_true(name: str) -> bool:
-    v = os.environ.get(name)
-    if v is None:
-        return False
-    return str(v).strip().lower() in {"1", "true", "yes", "on"}
+# Parsed element indexes kept in memory (LRU); see web/element_index.py
+ELEMENT_INDEX_CACHE_SIZE = max(1, env_int("ELEMENT_INDEX_CACHE_SIZE", 32))
+
+# Opt-in page-sharded Azure DI analysis (see chunking_pipeline/azure_shards.py)
+AZURE_DI_SHARDS = max(1, env_int("AZURE_DI_SHARDS", 1))
+AZURE_DI_SHARD_MIN_PAGES = max(1, env_int("AZURE_DI_SHARD_MIN_PAGES", 10))
+
+# Figures whose vision steps (OCR, SAM3, mermaid) run concurrently per extraction job
+FIGURE_WORKERS = max(1, env_int("FIGURE_WORKERS", 4))
+
+# Figure text positions: "auto" reads words from the PDF text layer and OCRs the
+# rest in batches, "batch" packs every figure into one Azure DI request per
+# FIGURE_OCR_BATCH_SIZE figures, "single" sends one request per figure
+FIGURE_OCR_MODE = (os.environ.get("FIGURE_OCR_MODE") or "auto").strip().lower()
+FIGURE_OCR_BATCH_SIZE = max(1, env_int("FIGURE_OCR_BATCH_SIZE", 50))
+
+# Size cap for the image blob store; least recently served blobs are evicted first
+BLOB_STORE_MAX_MB = max(1, env_int("BLOB_STORE_MAX_MB", 1024))
+# Blobs issued or served within this window are never evicted, so URLs already
+# handed to clients keep resolving for at least this long
+BLOB_STORE_PIN_HOURS = max(0, env_int("BLOB_STORE_PIN_HOURS", 24))
 
 
 def latest_by_mtime(paths: Iterable[Path]) -> Optional[Path]:
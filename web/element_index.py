@@ -0,0 +1,155 @@
+"""Persistent sidecar index for elements/chunks JSONL files.
+
+Building the element index means parsing every line of a run's JSONL, which
+is slow for large documents and used to happen again after every restart.
+The parsed index (per-element boxes, page lists, type counts and the byte
+span of each element's line) is stored next to the source as ``<name>.idx``
+(e.g. ``doc.pages1-50.elements.idx``), a small SQLite file that is read back
+into the in-process index cache in one pass instead of re-parsing the JSONL.
+The sidecar records the source file's size and mtime and is ignored once
+either changes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("chunking.routes.elements")
+
+INDEX_FORMAT_VERSION = 2
+INDEX_SUFFIX = ".idx"
+
+# (by_id, by_page, type_counts, offsets) as built by web/routes/elements.py;
+# offsets map element ids and original element ids to the (start, length)
+# byte span of the JSONL line that holds them.
+ElementIndex = Tuple[
+    Dict[str, Dict[str, Any]],
+    Dict[int, List[str]],
+    Dict[str, int],
+    Dict[str, Tuple[int, int]],
+]
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE elements (
+    element_id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    page_trimmed INTEGER,
+    layout_w REAL,
+    layout_h REAL,
+    x REAL,
+    y REAL,
+    w REAL,
+    h REAL,
+    type TEXT,
+    orig_id TEXT,
+    ord INTEGER
+);
+CREATE TABLE pages (page INTEGER NOT NULL, seq INTEGER NOT NULL, element_id TEXT NOT NULL);
+CREATE TABLE type_counts (type TEXT PRIMARY KEY, count INTEGER NOT NULL);
+CREATE TABLE offsets (key TEXT PRIMARY KEY, start INTEGER NOT NULL, length INTEGER NOT NULL);
+"""
+
+_ENTRY_FIELDS = ("page_trimmed", "layout_w", "layout_h", "x", "y", "w", "h", "type", "orig_id")
+
+
+def index_path(source: Path) -> Path:
+    """Sidecar path for ``source`` (``.jsonl`` replaced with ``.idx``)."""
+    return source.with_suffix(INDEX_SUFFIX)
+
+
+def _source_stamp(source: Path) -> Dict[str, str]:
+    st = source.stat()
+    return {
+        "version": str(INDEX_FORMAT_VERSION),
+        "source_size": str(st.st_size),
+        "source_mtime_ns": str(st.st_mtime_ns),
+    }
+
+
+def load_element_index(source: Path) -> Optional[ElementIndex]:
+    """Read the sidecar index for ``source``; ``None`` if missing, stale or unreadable."""
+    path = index_path(source)
+    if not path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        if any(meta.get(k) != v for k, v in _source_stamp(source).items()):
+            return None
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for row in conn.execute(
+            "SELECT element_id, page_trimmed, layout_w, layout_h, x, y, w, h, type, orig_id, ord "
+            "FROM elements ORDER BY seq"
+        ):
+            entry = dict(zip(_ENTRY_FIELDS, row[1:10]))
+            if row[10] is not None:
+                entry["order"] = row[10]
+            by_id[row[0]] = entry
+        by_page: Dict[int, List[str]] = {}
+        for page, element_id in conn.execute("SELECT page, element_id FROM pages ORDER BY page, seq"):
+            by_page.setdefault(page, []).append(element_id)
+        type_counts = dict(conn.execute("SELECT type, count FROM type_counts").fetchall())
+        offsets = {
+            key: (start, length)
+            for key, start, length in conn.execute("SELECT key, start, length FROM offsets")
+        }
+        return by_id, by_page, type_counts, offsets
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Ignoring unreadable element index %s: %s", path, exc)
+        return None
+    finally:
+        conn.close()
+
+
+def write_element_index(source: Path, index: ElementIndex) -> None:
+    """Write the sidecar index for ``source``; failures are logged and otherwise ignored."""
+    by_id, by_page, type_counts, offsets = index
+    dest = index_path(source)
+    try:
+        stamp = _source_stamp(source)
+        fd, tmp = tempfile.mkstemp(dir=str(dest.parent), suffix=".idx.tmp")
+        os.close(fd)
+    except OSError as exc:  # pragma: no cover - best-effort
+        logger.warning("Failed to write element index %s: %s", dest, exc)
+        return
+    try:
+        conn = sqlite3.connect(tmp)
+        try:
+            conn.executescript(_SCHEMA)
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", stamp.items())
+            conn.executemany(
+                "INSERT INTO elements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (element_id, seq, *(entry.get(f) for f in _ENTRY_FIELDS), entry.get("order"))
+                    for seq, (element_id, entry) in enumerate(by_id.items())
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO pages (page, seq, element_id) VALUES (?, ?, ?)",
+                (
+                    (page, seq, element_id)
+                    for page, ids in by_page.items()
+                    for seq, element_id in enumerate(ids)
+                ),
+            )
+            conn.executemany("INSERT INTO type_counts (type, count) VALUES (?, ?)", type_counts.items())
+            conn.executemany(
+                "INSERT INTO offsets (key, start, length) VALUES (?, ?, ?)",
+                ((key, start, length) for key, (start, length) in offsets.items()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp, dest)
+    except (sqlite3.Error, OSError) as exc:
+        Path(tmp).unlink(missing_ok=True)
+        logger.warning("Failed to write element index %s: %s", dest, exc)
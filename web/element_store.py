@@ -0,0 +1,165 @@
+"""Columnar (Parquet) copy of an elements JSONL file.
+
+``_write_elements_jsonl`` also writes ``<run>.elements.parquet`` with one row
+per element and flat columns: id, type, page, bbox, layout size, text, HTML,
+plus the byte span of the element's JSONL line. Readers that only need those
+fields (element index, figure lookup, feedback snippets) scan the columns
+they need instead of decoding every JSON line; anything else seeks straight
+to the JSONL line.
+
+Requires ``pyarrow`` (``uv sync --extra columnar``). Without it nothing is
+written and every reader falls back to the JSONL. A Parquet file is ignored
+once the JSONL it was written for changes.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:  # optional dependency
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pc = None
+    pq = None
+
+logger = logging.getLogger("chunking.element_store")
+
+STORE_FORMAT_VERSION = "1"
+_STAMP_KEY = b"ingestlab.source_stamp"
+
+# Column name -> pyarrow type factory name (resolved at write time)
+_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("element_id", "string"),
+    ("original_element_id", "string"),
+    ("type", "string"),
+    ("page", "int32"),
+    ("x", "float64"),
+    ("y", "float64"),
+    ("w", "float64"),
+    ("h", "float64"),
+    ("layout_w", "float64"),
+    ("layout_h", "float64"),
+    ("text", "string"),
+    ("text_as_html", "string"),
+    ("json_offset", "int64"),
+    ("json_length", "int64"),
+)
+
+
+def element_store_available() -> bool:
+    return pq is not None
+
+
+def parquet_path(elements_path: Path) -> Path:
+    return elements_path.with_name(elements_path.name.replace(".elements.jsonl", ".elements.parquet"))
+
+
+def _source_stamp(elements_path: Path) -> bytes:
+    st = elements_path.stat()
+    return f"{STORE_FORMAT_VERSION}:{st.st_size}:{st.st_mtime_ns}".encode("ascii")
+
+
+def _element_row(el: Dict[str, Any], offset: int, length: int) -> Dict[str, Any]:
+    md = el.get("metadata") or {}
+    coords = md.get("coordinates") or {}
+    pts = coords.get("points") or []
+    x = y = w = h = None
+    if pts:
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        x, y = min(xs), min(ys)
+        w, h = max(xs) - x, max(ys) - y
+    page = el.get("page_number") or md.get("page_number") or (md.get("page_numbers") or [None])[0]
+    return {
+        "element_id": el.get("element_id"),
+        "original_element_id": md.get("original_element_id"),
+        "type": el.get("type"),
+        "page": page if isinstance(page, int) else None,
+        "x": x,
+        "y": y,
+        "w": w,
+        "h": h,
+        "layout_w": coords.get("layout_width"),
+        "layout_h": coords.get("layout_height"),
+        "text": el.get("text") or md.get("text"),
+        "text_as_html": md.get("text_as_html"),
+        "json_offset": offset,
+        "json_length": length,
+    }
+
+
+def write_element_store(
+    elements_path: Path,
+    elements: Sequence[Dict[str, Any]],
+    spans: Sequence[Tuple[int, int]],
+) -> Optional[Path]:
+    """Write the Parquet copy of a just-written elements JSONL.
+
+    ``spans`` holds the ``(offset, length)`` of each element's JSONL line.
+    Returns the written path, or ``None`` when pyarrow is unavailable or the
+    write failed (logged; the JSONL stays authoritative).
+    """
+    if pq is None:
+        return None
+    dest = parquet_path(elements_path)
+    tmp = dest.with_name(dest.name + ".tmp")
+    try:
+        rows = [_element_row(el, off, length) for el, (off, length) in zip(elements, spans)]
+        schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in _COLUMNS])
+        schema = schema.with_metadata({_STAMP_KEY: _source_stamp(elements_path)})
+        table = pa.Table.from_pylist(rows, schema=schema)
+        pq.write_table(table, tmp, compression="zstd")
+        tmp.replace(dest)
+        return dest
+    except (OSError, pa.ArrowException, ValueError, TypeError) as exc:
+        tmp.unlink(missing_ok=True)
+        logger.warning("Failed to write element store %s: %s", dest, exc)
+        return None
+
+
+def load_element_columns(
+    elements_path: Path,
+    columns: Sequence[str],
+    *,
+    types: Optional[Sequence[str]] = None,
+    ids: Optional[Sequence[str]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Read selected columns as row dicts, or ``None`` if no current Parquet copy exists.
+
+    ``types`` keeps rows whose type matches case-insensitively; ``ids`` keeps
+    rows whose ``element_id`` or ``original_element_id`` is listed. Both are
+    evaluated as column scans before any row is materialized.
+    """
+    if pq is None:
+        return None
+    path = parquet_path(elements_path)
+    if not path.exists():
+        return None
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(_STAMP_KEY) != _source_stamp(elements_path):
+            return None
+        needed = list(dict.fromkeys([*columns, *(["type"] if types else []), *(["element_id", "original_element_id"] if ids else [])]))
+        table = pq.read_table(path, columns=needed)
+        mask = None
+        if types:
+            wanted_types = pa.array([t.lower() for t in types])
+            mask = pc.is_in(pc.utf8_lower(table["type"]), value_set=wanted_types)
+        if ids:
+            wanted_ids = pa.array(list(ids))
+            id_mask = pc.or_(
+                pc.is_in(table["element_id"], value_set=wanted_ids),
+                pc.is_in(table["original_element_id"], value_set=wanted_ids),
+            )
+            mask = id_mask if mask is None else pc.and_(mask, id_mask)
+        if mask is not None:
+            table = table.filter(pc.fill_null(mask, False))
+        return table.select(list(columns)).to_pylist()
+    except (OSError, pa.ArrowException, KeyError) as exc:
+        logger.warning("Ignoring unreadable element store %s: %s", path, exc)
+        return None
@@ -0,0 +1,131 @@
+"""Content-addressed cache for Azure Document Intelligence results.
+
+Entries are keyed by the SHA-256 of the source document plus everything that
+changes what Azure returns (pages, model, API version, features, outputs,
+locale), so re-runs and tag variants of the same input reuse the stored
+elements instead of calling Azure again.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .config import EXTRACTION_CACHE_DIR, env_true
+
+logger = logging.getLogger("chunking.routes.extractions")
+
+CACHE_FORMAT_VERSION = 1
+
+
+def extraction_cache_enabled() -> bool:
+    return not env_true("DISABLE_EXTRACTION_CACHE")
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extraction_cache_key(
+    source_digest: str,
+    *,
+    file_type: str,
+    pages: str,
+    model_id: str,
+    api_version: str,
+    features: Optional[Sequence[str]],
+    outputs: Optional[Sequence[str]],
+    locale: Optional[str],
+) -> str:
+    """Combine the document digest and the analysis config into one cache key."""
+    config = {
+        "v": CACHE_FORMAT_VERSION,
+        "source": source_digest,
+        "file_type": file_type,
+        "pages": pages,
+        "model_id": model_id,
+        "api_version": api_version,
+        "features": sorted(str(f).lower() for f in features or []),
+        "outputs": sorted(str(o).lower() for o in outputs or []),
+        "locale": locale or None,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str, suffix: str) -> Path:
+    return EXTRACTION_CACHE_DIR / key[:2] / f"{key}{suffix}"
+
+
+def _atomic_write(dest: Path, write) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(dest.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp, dest)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def load_cached_extraction(key: str) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+    """Return ``(elements, result_metadata)`` for a cached result, if any."""
+    path = _entry_path(key, ".json.gz")
+    if not path.exists():
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable extraction cache entry %s: %s", path, exc)
+        return None
+    return payload.get("elements") or [], payload.get("metadata") or {}
+
+
+def store_cached_extraction(
+    key: str,
+    elements: List[Dict[str, Any]],
+    result_metadata: Dict[str, Any],
+) -> None:
+    """Store an extraction result; failures are logged and otherwise ignored."""
+    payload = {"elements": elements, "metadata": result_metadata}
+
+    def write(fh) -> None:
+        with gzip.GzipFile(fileobj=fh, mode="wb", compresslevel=5) as gz:
+            gz.write(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+
+    try:
+        _atomic_write(_entry_path(key, ".json.gz"), write)
+    except OSError as exc:  # pragma: no cover - best-effort
+        logger.warning("Failed to write extraction cache entry %s: %s", key, exc)
+
+
+def load_cached_file(key: str, suffix: str, dest: Path) -> bool:
+    """Copy a cached side file (e.g. a converted PDF) to ``dest`` if present."""
+    path = _entry_path(key, suffix)
+    if not path.exists():
+        return False
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(path, dest)
+    return True
+
+
+def store_cached_file(key: str, suffix: str, src: Path) -> None:
+    if not src.exists():
+        return
+    try:
+        _atomic_write(_entry_path(key, suffix), lambda fh: fh.write(src.read_bytes()))
+    except OSError as exc:  # pragma: no cover - best-effort
+        logger.warning("Failed to cache %s for %s: %s", src.name, key, exc)
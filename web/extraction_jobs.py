@@ -1,26 +1,174 @@
 from __future__ import annotations
 
-import io
+import contextvars
+import heapq
+import importlib
 import json
 import logging
+import os
 import shlex
+import signal
+import sqlite3
 import subprocess
 import sys
 import threading
 import time
 import traceback
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from queue import Queue
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, TextIO, Tuple
 
-from .config import DEFAULT_PROVIDER, relative_to_root
+from .config import DEFAULT_PROVIDER, EXTRACTION_JOBS_DB, env_int, relative_to_root
+from .job_store import JobStore, open_job_store
 
 logger = logging.getLogger("chunking.extraction_jobs")
 
+# Worker pool sizing. Threads run the jobs themselves (Azure DI calls are
+# I/O-bound); the optional process pool is used for CPU-bound helpers such
+# as PDF slicing and spreadsheet preview rendering via run_cpu_bound().
+EXTRACTION_WORKERS = max(1, env_int("EXTRACTION_WORKERS", 2))
+EXTRACTION_PROCESS_WORKERS = max(0, env_int("EXTRACTION_PROCESS_WORKERS", 0))
+# Finished jobs older than this are evicted from the job store (0 = keep forever).
+EXTRACTION_JOB_TTL_HOURS = max(0, env_int("EXTRACTION_JOB_TTL_HOURS", 168))
+# A job interrupted by more restarts than this is marked failed instead of re-queued.
+MAX_RECOVERY_ATTEMPTS = 3
+_EVICTION_INTERVAL_SECONDS = 600.0
 
-def _tail_text(value: Optional[str], limit: int = 8000) -> Optional[str]:
+# Progress fields pushed to subscribers as deltas (see ExtractionJobManager.subscribe).
+_PROGRESS_FIELDS = ("progress_current", "progress_total", "progress_message", "progress_stage")
+
+JobListener = Callable[[str, Dict[str, Any]], None]
+
+# Deadlines. EXTRACTION_JOB_TIMEOUT bounds a whole job (0 = no limit);
+# EXTRACTION_STAGE_TIMEOUTS bounds time spent in one progress_stage, e.g.
+# "convert=600,azure=1800". A callable that ignores cancellation for
+# longer than the grace period is abandoned and its worker replaced.
+EXTRACTION_JOB_TIMEOUT = max(0, env_int("EXTRACTION_JOB_TIMEOUT", 0))
+DEFAULT_STAGE_TIMEOUTS = {"convert": 600, "azure": 1800}
+CANCEL_GRACE_SECONDS = 30.0
+_WATCHDOG_INTERVAL_SECONDS = 2.0
+_COMMAND_POLL_SECONDS = 0.5
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Scheduling classes, highest priority first. Interactive jobs (single-page
+# re-runs) always go before bulk uploads; figure reprocessing runs last.
+PRIORITY_CLASSES = ("interactive", "bulk", "figures")
+# ETA model: EWMA of seconds per page for each (file type, stage).
+_ETA_EWMA_ALPHA = 0.3
+_ETA_HISTORY_JOBS = 100
+# Page count assumed for whole-document ("all") jobs when estimating ETAs.
+_UNKNOWN_PAGE_ESTIMATE = 10
+
+
+class JobCancelled(BaseException):
+    """Raised inside a callable job once cancellation has been requested.
+
+    Derives from BaseException (like asyncio.CancelledError) so the broad
+    ``except Exception`` fallbacks inside extraction code do not swallow it.
+    """
+
+
+def _parse_limits(raw: Optional[str], label: str) -> Dict[str, int]:
+    """Parse ``name=limit`` pairs, e.g. ``azure/document_intelligence=4``."""
+    limits: Dict[str, int] = {}
+    for part in (raw or "").split(","):
+        name, sep, value = part.strip().partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            limit = int(value.strip())
+        except ValueError:
+            logger.warning("Ignoring invalid %s: %s", label, part)
+            continue
+        if limit > 0:
+            limits[name.strip()] = limit
+    return limits
+
+
+def _page_count(pages: Any) -> Optional[int]:
+    """Count pages in a spec like ``"1-3,7"``; None for ``"all"``/unparseable."""
+    text = str(pages or "").strip()
+    if not text or text == "all":
+        return None
+    total = 0
+    for part in text.split(","):
+        start, sep, end = part.strip().partition("-")
+        if not start:
+            continue
+        try:
+            first = int(start)
+            last = int(end) if sep else first
+        except ValueError:
+            return None
+        total += abs(last - first) + 1
+    return total or None
+
+
+def _infer_priority(metadata: Dict[str, Any]) -> str:
+    explicit = str(metadata.get("priority") or "").strip().lower()
+    if explicit in PRIORITY_CLASSES:
+        return explicit
+    return "interactive" if _page_count(metadata.get("pages")) == 1 else "bulk"
+
+
+def _fair_share_key(metadata: Dict[str, Any]) -> str:
+    return str(metadata.get("submitter") or metadata.get("doc_name") or metadata.get("pdf_name") or "")
+
+
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    """Terminate a command job and every child it spawned."""
+    if proc.poll() is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGTERM)
+        else:  # pragma: no cover - non-POSIX
+            proc.terminate()
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        # The group may exit between the timeout and the kill
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:  # pragma: no cover - non-POSIX
+                proc.kill()
+        except ProcessLookupError:
+            pass
+    except ProcessLookupError:
+        pass
+
+
+_TAIL_LIMIT = 8000
+
+
+def _callable_path(fn: Optional[Callable[..., Any]]) -> Optional[str]:
+    """Return ``module:qualname`` for an importable callable, else None."""
+    if fn is None:
+        return None
+    module = getattr(fn, "__module__", None)
+    qualname = getattr(fn, "__qualname__", None)
+    if not module or not qualname or "<locals>" in qualname or "<lambda>" in qualname:
+        return None
+    return f"{module}:{qualname}"
+
+
+def _resolve_callable(path: str) -> Optional[Callable[[Dict[str, Any]], None]]:
+    module_name, _, qualname = path.partition(":")
+    try:
+        target: Any = importlib.import_module(module_name)
+        for attr in qualname.split("."):
+            target = getattr(target, attr)
+    except (ImportError, AttributeError) as exc:
+        logger.warning("Cannot resolve job callable %s: %s", path, exc)
+        return None
+    return target if callable(target) else None
+
+
+def _tail_text(value: Optional[str], limit: int = _TAIL_LIMIT) -> Optional[str]:
     if not value:
         return None
     text = value.strip()
@@ -29,6 +177,84 @@ def _tail_text(value: Optional[str], limit: int = 8000) -> Optional[str]:
     return text[-limit:]
 
 
+class _TailBuffer:
+    """Write-only text sink that retains just the last ``limit`` characters.
+
+    Used instead of an unbounded StringIO so a chatty extractor cannot grow a
+    job's captured output beyond a fixed size.
+    """
+
+    def __init__(self, limit: int = _TAIL_LIMIT) -> None:
+        self.limit = limit
+        self._parts: Deque[str] = deque()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        if not text:
+            return 0
+        with self._lock:
+            if len(text) >= self.limit:
+                self._parts.clear()
+                self._parts.append(text[-self.limit :])
+                self._size = self.limit
+            else:
+                self._parts.append(text)
+                self._size += len(text)
+                while self._size - len(self._parts[0]) >= self.limit:
+                    self._size -= len(self._parts.popleft())
+        return len(text)
+
+    def getvalue(self) -> str:
+        with self._lock:
+            return "".join(self._parts)
+
+
+# Per-job capture targets. Each worker thread sets these while it runs a
+# callable job; writes from any other thread (or outside a job) fall through
+# to the real stream. Threads started by a job only inherit the capture if
+# they run inside a copy of the job's context (contextvars.copy_context()).
+_JOB_STDOUT: contextvars.ContextVar[Optional[_TailBuffer]] = contextvars.ContextVar(
+    "extraction_job_stdout", default=None
+)
+_JOB_STDERR: contextvars.ContextVar[Optional[_TailBuffer]] = contextvars.ContextVar(
+    "extraction_job_stderr", default=None
+)
+
+
+class _JobRoutedStream:
+    """sys.stdout/sys.stderr replacement that routes writes to the current job."""
+
+    def __init__(self, target: contextvars.ContextVar[Optional[_TailBuffer]], fallback: TextIO) -> None:
+        self._target = target
+        self._fallback = fallback
+
+    def write(self, text: str) -> int:
+        buf = self._target.get()
+        if buf is None:
+            return self._fallback.write(text)
+        return buf.write(text)
+
+    def writelines(self, lines: List[str]) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        if self._target.get() is None:
+            self._fallback.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fallback, name)
+
+
+def _install_job_streams() -> None:
+    """Route sys.stdout/sys.stderr through the per-job capture (idempotent)."""
+    if not isinstance(sys.stdout, _JobRoutedStream):
+        sys.stdout = _JobRoutedStream(_JOB_STDOUT, sys.stdout)  # type: ignore[assignment]
+    if not isinstance(sys.stderr, _JobRoutedStream):
+        sys.stderr = _JobRoutedStream(_JOB_STDERR, sys.stderr)  # type: ignore[assignment]
+
+
 @dataclass
 class ExtractionJob:
     """A queued or running extraction job.
@@ -53,6 +279,21 @@ class ExtractionJob:
     progress_total: Optional[int] = None
     progress_message: Optional[str] = None
     progress_stage: Optional[str] = None
+    # Wall-clock seconds spent per progress stage, for deadline tuning
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    stage_started_at: Optional[float] = None
+    # Cancellation / deadline state (not serialized)
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    stop_reason: Optional[str] = None
+    stop_requested_at: Optional[float] = None
+    abandoned: bool = False
+    process: Optional[subprocess.Popen] = field(default=None, repr=False)
+    slot: Optional[threading.BoundedSemaphore] = field(default=None, repr=False)
+    # Scheduling (see JobScheduler); estimates are refreshed on read
+    priority: str = "bulk"
+    owner: str = ""
+    queue_position: Optional[int] = None
+    eta_seconds: Optional[float] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -62,6 +303,10 @@ class ExtractionJob:
             "provider": self.metadata.get("provider", DEFAULT_PROVIDER),
             "pdf": self.metadata.get("pdf_name"),
             "pages": self.metadata.get("pages"),
+            "file_type": self.metadata.get("file_type"),
+            "priority": self.priority,
+            "queue_position": self.queue_position,
+            "eta_seconds": self.eta_seconds,
             "created_at": self.created_at,
             "started_at": self.started_at,
             "finished_at": self.finished_at,
@@ -75,22 +320,184 @@ class ExtractionJob:
             "progress_total": self.progress_total,
             "progress_message": self.progress_message,
             "progress_stage": self.progress_stage,
+            "stage_timings": dict(self.stage_timings),
         }
 
 
-class ExtractionJobManager:
+class JobScheduler:
+    """Blocking job queue with priority classes and per-owner round-robin.
+
+    Jobs are served strictly by ``PRIORITY_CLASSES`` order; within a class,
+    owners (submitter or document) take turns so one large upload cannot
+    starve everyone else's jobs.
+    """
+
     def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._lanes: Dict[str, "OrderedDict[str, Deque[ExtractionJob]]"] = {
+            name: OrderedDict() for name in PRIORITY_CLASSES
+        }
+
+    def put(self, job: ExtractionJob) -> None:
+        with self._cond:
+            self._lanes[job.priority].setdefault(job.owner, deque()).append(job)
+            self._cond.notify()
+
+    def get(self, reserve: Optional[Callable[[ExtractionJob], bool]] = None) -> ExtractionJob:
+        """Take the next job to run, waiting until one is available.
+
+        ``reserve(job)`` is asked before a job is handed out and may refuse
+        it (e.g. its provider is at its concurrency limit); refused jobs stay
+        queued in place and later jobs are considered instead. Call
+        ``wake()`` when a refusal may no longer hold.
+        """
+        with self._cond:
+            while True:
+                for name in PRIORITY_CLASSES:
+                    lane = self._lanes[name]
+                    for owner, jobs in list(lane.items()):
+                        job = next((j for j in jobs if reserve is None or reserve(j)), None)
+                        if job is None:
+                            continue
+                        jobs.remove(job)
+                        del lane[owner]
+                        if jobs:
+                            lane[owner] = jobs  # owner goes to the back of the line
+                        return job
+                self._cond.wait()
+
+    def wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def remove(self, job: ExtractionJob) -> bool:
+        with self._cond:
+            lane = self._lanes[job.priority]
+            jobs = lane.get(job.owner)
+            if not jobs or job not in jobs:
+                return False
+            jobs.remove(job)
+            if not jobs:
+                del lane[job.owner]
+            return True
+
+    def order(self) -> List[ExtractionJob]:
+        """Queued jobs in the order they would be dispatched."""
+        ordered: List[ExtractionJob] = []
+        with self._cond:
+            for name in PRIORITY_CLASSES:
+                turns = [deque(jobs) for jobs in self._lanes[name].values()]
+                while turns:
+                    for jobs in turns:
+                        ordered.append(jobs.popleft())
+                    turns = [jobs for jobs in turns if jobs]
+        return ordered
+
+
+class ExtractionJobManager:
+    def __init__(
+        self,
+        *,
+        workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        provider_limits: Optional[Dict[str, int]] = None,
+        store_path: Optional[Path] = None,
+    ) -> None:
+        # Live (queued/running) jobs. Finished jobs are dropped from memory
+        # once persisted and served from the store instead.
         self.jobs: Dict[str, ExtractionJob] = {}
-        self.queue: Queue[ExtractionJob] = Queue()
+        self.queue = JobScheduler()
         self.lock = threading.Lock()
-        worker = threading.Thread(target=self._worker, name="chunk-runner", daemon=True)
+        self.worker_count = max(1, workers if workers is not None else EXTRACTION_WORKERS)
+        self.process_workers = max(
+            0, process_workers if process_workers is not None else EXTRACTION_PROCESS_WORKERS
+        )
+        if provider_limits is None:
+            provider_limits = _parse_limits(
+                os.environ.get("EXTRACTION_PROVIDER_CONCURRENCY"), "provider concurrency limit"
+            )
+        # One semaphore per limited provider; providers without a limit may
+        # use every worker thread.
+        self._provider_slots: Dict[str, threading.BoundedSemaphore] = {
+            name: threading.BoundedSemaphore(limit) for name, limit in provider_limits.items()
+        }
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+        # Opened by start(), so importing this module touches no files
+        self._store_path = store_path or EXTRACTION_JOBS_DB
+        self.store: Optional[JobStore] = None
+        self.ttl_seconds = EXTRACTION_JOB_TTL_HOURS * 3600
+        self._last_eviction = 0.0
+        self._listeners: Dict[str, List[JobListener]] = {}
+        self.job_timeout = EXTRACTION_JOB_TIMEOUT
+        self.stage_timeouts: Dict[str, int] = {
+            **DEFAULT_STAGE_TIMEOUTS,
+            **_parse_limits(os.environ.get("EXTRACTION_STAGE_TIMEOUTS"), "stage timeout"),
+        }
+        # file_type -> stage -> EWMA seconds per page, seeded from job history
+        self._stage_rates: Dict[str, Dict[str, float]] = {}
+        self._provider_limits = provider_limits
+        self.workers: List[threading.Thread] = []
+        self._worker_seq = 0
+        self._watchdog: Optional[threading.Thread] = None
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Open the job store and start the worker threads and watchdog.
+
+        Called from the app's lifespan at startup; also run on the first
+        submitted job. Safe to call more than once.
+        """
+        with self._start_lock:
+            if self._started:
+                return
+            self.store = open_job_store(self._store_path)
+            self._seed_stage_rates()
+            _install_job_streams()
+            for _ in range(self.worker_count):
+                self._start_worker()
+            self._watchdog = threading.Thread(target=self._watchdog_loop, name="chunk-runner-watchdog", daemon=True)
+            self._watchdog.start()
+            self._started = True
+        logger.info(
+            "ExtractionJobManager started workers=%s process_workers=%s provider_limits=%s store=%s",
+            self.worker_count,
+            self.process_workers,
+            self._provider_limits or {},
+            self._store_path if self.store is not None else None,
+        )
+
+    def _start_worker(self) -> None:
+        with self.lock:
+            idx = self._worker_seq
+            self._worker_seq += 1
+        worker = threading.Thread(target=self._worker, name=f"chunk-runner-{idx}", daemon=True)
         worker.start()
-        self.worker = worker
-        logger.info("ExtractionJobManager initialized")
+        self.workers.append(worker)
+
+    def _reserve_slot(self, job: ExtractionJob) -> bool:
+        """Take a provider slot for ``job`` without blocking; False if its provider is saturated.
+
+        Runs under the scheduler's lock, so it must not take ``self.lock``.
+        """
+        slot = self._provider_slots.get(job.metadata.get("provider") or DEFAULT_PROVIDER)
+        if slot is None:
+            return True
+        if not slot.acquire(blocking=False):
+            return False
+        job.slot = slot
+        return True
 
     def _worker(self) -> None:
         while True:
-            job = self.queue.get()
+            # Jobs for saturated providers are skipped rather than waited on,
+            # so they cannot hold up jobs for other providers behind them.
+            job = self.queue.get(self._reserve_slot)
+            if job.status != "queued":
+                # Cancelled while waiting in the queue; already retired.
+                self._release_slot(job)
+                continue
             try:
                 self._execute(job)
             except Exception as exc:  # pragma: no cover - fail-safe logging
@@ -98,7 +505,342 @@ class ExtractionJobManager:
                 job.status = "failed"
                 job.error = f"Worker crashed: {exc}"
             finally:
-                self.queue.task_done()
+                self._release_slot(job)
+            if job.abandoned:
+                # The watchdog already retired this job and started a
+                # replacement worker; let this thread end.
+                logger.warning("Abandoned worker for job %s exited", job.id)
+                return
+            self._retire(job)
+
+    def _release_slot(self, job: ExtractionJob) -> None:
+        with self.lock:
+            slot, job.slot = job.slot, None
+        if slot is not None:
+            slot.release()
+            # Queued jobs for this provider may have been skipped while it was full
+            self.queue.wake()
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running job and return its record.
+
+        Queued jobs are retired immediately. Running commands have their
+        process group killed; running callables see ``JobCancelled`` at their
+        next progress report and are abandoned by the watchdog if they do not
+        stop within ``CANCEL_GRACE_SECONDS``. Returns None for unknown jobs.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                dequeued = False
+            else:
+                # Only a job still sitting in the scheduler can be retired here;
+                # once a worker has taken it, it must be stopped like a running job.
+                dequeued = job.status == "queued" and self.queue.remove(job)
+                if dequeued:
+                    job.status = "cancelled"
+                    job.error = "Cancelled before start"
+        if job is None:
+            return self.store.get(job_id) if self.store is not None else None
+        if dequeued:
+            self._retire(job)
+            logger.info("Cancelled queued extraction job %s", job.id)
+        elif job.status not in FINISHED_STATUSES:
+            self._request_stop(job, "cancelled")
+        return job.to_dict()
+
+    def raise_if_cancelled(self, job_id: str) -> None:
+        """Raise ``JobCancelled`` if a stop was requested for ``job_id``.
+
+        Callable jobs call this at safe points (e.g. progress reports).
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is not None and job.cancel_event.is_set():
+            raise JobCancelled(job.stop_reason or "cancelled")
+
+    def _request_stop(self, job: ExtractionJob, reason: str) -> None:
+        with self.lock:
+            if job.cancel_event.is_set():
+                return
+            job.stop_reason = reason
+            job.stop_requested_at = time.time()
+            job.cancel_event.set()
+            proc = job.process
+        logger.info("Stopping extraction job %s: %s", job.id, reason)
+        if proc is not None:
+            _kill_process_group(proc)
+
+    def _deadline_reason(self, job: ExtractionJob, now: float) -> Optional[str]:
+        if self.job_timeout and job.started_at and now - job.started_at > self.job_timeout:
+            return f"timeout: job exceeded {self.job_timeout}s"
+        stage = job.progress_stage
+        limit = self.stage_timeouts.get(stage) if stage else None
+        if limit and job.stage_started_at and now - job.stage_started_at > limit:
+            return f"timeout: stage {stage} exceeded {limit}s"
+        return None
+
+    def _watchdog_loop(self) -> None:
+        while True:
+            time.sleep(_WATCHDOG_INTERVAL_SECONDS)
+            try:
+                self._check_deadlines()
+            except Exception as exc:  # pragma: no cover - fail-safe logging
+                logger.exception("Extraction job watchdog failed: %s", exc)
+
+    def _check_deadlines(self) -> None:
+        now = time.time()
+        with self.lock:
+            running = [job for job in self.jobs.values() if job.status == "running"]
+        for job in running:
+            if not job.cancel_event.is_set():
+                reason = self._deadline_reason(job, now)
+                if reason:
+                    self._request_stop(job, reason)
+                continue
+            stuck = (
+                job.callable_fn is not None
+                and not job.abandoned
+                and job.stop_requested_at is not None
+                and now - job.stop_requested_at > CANCEL_GRACE_SECONDS
+            )
+            if stuck:
+                self._abandon(job)
+
+    def _abandon(self, job: ExtractionJob) -> None:
+        """Give up on a callable that ignored cancellation and free its worker slot."""
+        if job.finished_at is not None:
+            return
+        job.abandoned = True
+        self._mark_stopped(job)
+        job.error = f"{job.error} (worker abandoned after {CANCEL_GRACE_SECONDS:.0f}s)"
+        self._release_slot(job)
+        self._retire(job)
+        logger.error("Abandoned unresponsive extraction job %s; starting replacement worker", job.id)
+        self._start_worker()
+
+    def _mark_stopped(self, job: ExtractionJob) -> None:
+        reason = job.stop_reason or "cancelled"
+        job.finished_at = time.time()
+        if reason.startswith("timeout"):
+            job.status = "failed"
+            job.error = f"Timed out ({reason.split(': ', 1)[-1]})"
+        else:
+            job.status = "cancelled"
+            job.error = "Cancelled"
+
+    def _persist(self, job: ExtractionJob) -> None:
+        if self.store is None:
+            return
+        with self.lock:
+            record = job.to_dict()
+            metadata = dict(job.metadata)
+        try:
+            self.store.save(
+                record=record,
+                metadata=metadata,
+                callable_path=_callable_path(job.callable_fn),
+                command=job.command,
+            )
+        except sqlite3.Error as exc:  # pragma: no cover - best-effort
+            logger.warning("Failed to persist extraction job %s: %s", job.id, exc)
+
+    def _retire(self, job: ExtractionJob) -> None:
+        """Persist a finished job and release it from memory."""
+        if job.finished_at is None:
+            job.finished_at = time.time()
+        self._close_stage(job, job.finished_at)
+        job.queue_position = None
+        job.eta_seconds = None
+        self._learn_stage_rates(job.to_dict())
+        self._persist(job)
+        self._publish(job.id, "done", job.to_dict())
+        if self.store is None:
+            return
+        with self.lock:
+            self.jobs.pop(job.id, None)
+        self._evict_expired()
+
+    def subscribe(self, job_id: str, listener: JobListener) -> Callable[[], None]:
+        """Register ``listener(event, data)`` for a job's updates.
+
+        Events are ``progress`` (only the fields that changed, including
+        ``status`` when the job starts) and a final ``done`` carrying the full
+        job record with log tails. Listeners run on worker threads and must
+        not block. Returns a function that removes the listener.
+        """
+        with self.lock:
+            self._listeners.setdefault(job_id, []).append(listener)
+
+        def unsubscribe() -> None:
+            with self.lock:
+                listeners = self._listeners.get(job_id)
+                if listeners and listener in listeners:
+                    listeners.remove(listener)
+                if not listeners:
+                    self._listeners.pop(job_id, None)
+
+        return unsubscribe
+
+    def _publish(self, job_id: str, event: str, data: Dict[str, Any]) -> None:
+        with self.lock:
+            listeners = list(self._listeners.get(job_id, ()))
+        for listener in listeners:
+            try:
+                listener(event, data)
+            except Exception as exc:  # pragma: no cover - a dead subscriber must not break the job
+                logger.debug("Job listener for %s failed: %s", job_id, exc)
+
+    def _evict_expired(self, *, force: bool = False) -> None:
+        if self.store is None or self.ttl_seconds <= 0:
+            return
+        now = time.time()
+        if not force and now - self._last_eviction < _EVICTION_INTERVAL_SECONDS:
+            return
+        self._last_eviction = now
+        try:
+            removed = self.store.evict_finished(self.ttl_seconds)
+        except sqlite3.Error as exc:  # pragma: no cover - best-effort
+            logger.warning("Failed to evict expired extraction jobs: %s", exc)
+            return
+        if removed:
+            logger.info("Evicted %s finished extraction jobs older than %sh", removed, EXTRACTION_JOB_TTL_HOURS)
+
+    def recover_interrupted_jobs(self) -> int:
+        """Re-queue jobs that were queued or running when the server stopped.
+
+        Call once at startup, after the modules that define job callables are
+        importable. Jobs whose callable can no longer be resolved, or that
+        have already been interrupted ``MAX_RECOVERY_ATTEMPTS`` times, are
+        marked failed instead. Returns the number of re-queued jobs.
+        """
+        self.start()
+        if self.store is None:
+            return 0
+        self._evict_expired(force=True)
+        requeued = 0
+        for row in self.store.active():
+            record = row["record"]
+            with self.lock:
+                if row["id"] in self.jobs:
+                    continue
+            metadata = dict(row["metadata"])
+            attempts = int(metadata.get("_recovery_attempts") or 0) + 1
+            metadata["_recovery_attempts"] = attempts
+            callable_fn = _resolve_callable(row["callable"]) if row["callable"] else None
+            if (callable_fn is None and not row["command"]) or attempts > MAX_RECOVERY_ATTEMPTS:
+                record.update(
+                    status="failed",
+                    finished_at=time.time(),
+                    error="Interrupted by server restart and could not be resumed",
+                )
+                try:
+                    self.store.save(
+                        record=record,
+                        metadata=metadata,
+                        callable_path=row["callable"],
+                        command=row["command"],
+                    )
+                except sqlite3.Error as exc:  # pragma: no cover - best-effort
+                    logger.warning("Failed to mark interrupted job %s failed: %s", row["id"], exc)
+                continue
+            job = ExtractionJob(
+                id=row["id"],
+                command=row["command"],
+                callable_fn=callable_fn,
+                metadata=metadata,
+                created_at=record.get("created_at") or time.time(),
+            )
+            self._submit(job)
+            requeued += 1
+            logger.info(
+                "Re-queued interrupted extraction job %s slug=%s attempt=%s",
+                job.id,
+                metadata.get("slug_with_pages"),
+                attempts,
+            )
+        return requeued
+
+    def run_cpu_bound(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a CPU-bound helper, in the process pool when one is configured.
+
+        With ``EXTRACTION_PROCESS_WORKERS=0`` (the default) the helper runs
+        inline on the calling worker thread. ``fn`` and its arguments must be
+        picklable when the process pool is enabled.
+        """
+        if self.process_workers <= 0:
+            return fn(*args, **kwargs)
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+            pool = self._process_pool
+        return pool.submit(fn, *args, **kwargs).result()
+
+    def _seed_stage_rates(self) -> None:
+        if self.store is None:
+            return
+        try:
+            records, _ = self.store.list(limit=_ETA_HISTORY_JOBS, status="succeeded")
+        except sqlite3.Error as exc:  # pragma: no cover - best-effort
+            logger.warning("Failed to load job history for ETAs: %s", exc)
+            return
+        for record in reversed(records):  # oldest first so recent jobs weigh most
+            self._learn_stage_rates(record)
+
+    def _learn_stage_rates(self, record: Dict[str, Any]) -> None:
+        timings = record.get("stage_timings")
+        if record.get("status") != "succeeded" or not timings:
+            return
+        pages = _page_count(record.get("pages")) or _UNKNOWN_PAGE_ESTIMATE
+        with self.lock:
+            rates = self._stage_rates.setdefault(record.get("file_type") or "pdf", {})
+            for stage, seconds in timings.items():
+                rate = float(seconds) / pages
+                prev = rates.get(stage)
+                rates[stage] = rate if prev is None else prev + _ETA_EWMA_ALPHA * (rate - prev)
+
+    def _estimate_duration(self, job: ExtractionJob) -> Optional[float]:
+        rates = self._stage_rates.get(job.metadata.get("file_type") or "pdf")
+        if not rates:
+            return None
+        return sum(rates.values()) * (_page_count(job.metadata.get("pages")) or _UNKNOWN_PAGE_ESTIMATE)
+
+    def _refresh_estimates(self) -> None:
+        """Recompute queue positions and ETAs for live jobs.
+
+        Simulates the workers draining the scheduler in dispatch order, using
+        per-stage timing history; jobs with no history get no ETA.
+        """
+        order = self.queue.order()
+        now = time.time()
+        with self.lock:
+            free_at: List[float] = []
+            for job in self.jobs.values():
+                if job.status != "running":
+                    continue
+                duration = self._estimate_duration(job)
+                remaining = max(0.0, duration - (now - (job.started_at or now))) if duration is not None else None
+                job.queue_position = None
+                job.eta_seconds = round(remaining, 1) if remaining is not None else None
+                free_at.append(remaining or 0.0)
+            free_at = sorted(free_at)[: self.worker_count]
+            free_at += [0.0] * (self.worker_count - len(free_at))
+            heapq.heapify(free_at)
+            for position, job in enumerate(order, start=1):
+                start = heapq.heappop(free_at)
+                duration = self._estimate_duration(job)
+                job.queue_position = position
+                job.eta_seconds = round(start + duration, 1) if duration is not None else None
+                heapq.heappush(free_at, start + (duration or 0.0))
+
+    def _submit(self, job: ExtractionJob) -> None:
+        self.start()
+        job.priority = _infer_priority(job.metadata)
+        job.owner = _fair_share_key(job.metadata)
+        with self.lock:
+            self.jobs[job.id] = job
+        self._persist(job)
+        self.queue.put(job)
 
     def enqueue(
         self,
@@ -115,9 +857,7 @@ class ExtractionJobManager:
         job.metadata.setdefault("slug_with_pages", metadata.get("slug_with_pages"))
         display_cmd = " ".join(shlex.quote(part) for part in command)
         job.metadata["display_command"] = display_cmd
-        with self.lock:
-            self.jobs[job_id] = job
-            self.queue.put(job)
+        self._submit(job)
         logger.info(
             "Queued command job %s for %s (pages=%s) slug=%s",
             job.id,
@@ -155,9 +895,7 @@ class ExtractionJobManager:
         # Display callable name for debugging
         callable_name = getattr(callable_fn, "__name__", str(callable_fn))
         job.metadata["display_command"] = f"<callable: {callable_name}>"
-        with self.lock:
-            self.jobs[job_id] = job
-            self.queue.put(job)
+        self._submit(job)
         logger.info(
             "Queued callable job %s for %s (pages=%s) slug=%s callable=%s",
             job.id,
@@ -169,8 +907,16 @@ class ExtractionJobManager:
         return job
 
     def _execute(self, job: ExtractionJob) -> None:
+        if job.cancel_event.is_set():
+            # Cancelled between leaving the scheduler and starting
+            self._mark_stopped(job)
+            logger.info("Extraction job %s stopped before start: %s", job.id, job.stop_reason)
+            return
         job.status = "running"
         job.started_at = time.time()
+        job.stage_started_at = job.started_at
+        self._persist(job)
+        self._publish(job.id, "progress", {"status": job.status, "started_at": job.started_at})
         logger.info(
             "Starting extraction job %s slug=%s callable=%s command=%s",
             job.id,
@@ -193,23 +939,37 @@ class ExtractionJobManager:
 
     def _execute_callable(self, job: ExtractionJob) -> None:
         """Execute a callable-based job."""
-        # Capture stdout/stderr from the callable
-        old_stdout, old_stderr = sys.stdout, sys.stderr
-        captured_stdout = io.StringIO()
-        captured_stderr = io.StringIO()
+        # Capture stdout/stderr written by this job only (see _JobRoutedStream)
+        captured_stdout = _TailBuffer()
+        captured_stderr = _TailBuffer()
+        stdout_token = _JOB_STDOUT.set(captured_stdout)
+        stderr_token = _JOB_STDERR.set(captured_stderr)
 
         # Inject job_id into metadata so callable can report progress
         job.metadata["_job_id"] = job.id
 
         try:
-            sys.stdout = captured_stdout
-            sys.stderr = captured_stderr
             job.callable_fn(job.metadata)  # type: ignore[misc]
+            if job.abandoned:
+                return
             job.finished_at = time.time()
             job.stdout_tail = _tail_text(captured_stdout.getvalue())
             job.stderr_tail = _tail_text(captured_stderr.getvalue())
+            if job.cancel_event.is_set():
+                # Finished without reaching another cancellation point
+                self._mark_stopped(job)
+                logger.info("Callable job %s stopped: %s", job.id, job.stop_reason)
+                return
             self._finalize_success(job)
-        except Exception as exc:
+        except (JobCancelled, Exception) as exc:
+            if job.abandoned:
+                return
+            if job.cancel_event.is_set():
+                self._mark_stopped(job)
+                job.stdout_tail = _tail_text(captured_stdout.getvalue())
+                job.stderr_tail = _tail_text(captured_stderr.getvalue())
+                logger.info("Callable job %s stopped: %s", job.id, job.stop_reason)
+                return
             job.finished_at = time.time()
             job.stdout_tail = _tail_text(captured_stdout.getvalue())
             tb_str = traceback.format_exc()
@@ -223,14 +983,42 @@ class ExtractionJobManager:
                 exc,
             )
         finally:
-            sys.stdout, sys.stderr = old_stdout, old_stderr
+            _JOB_STDOUT.reset(stdout_token)
+            _JOB_STDERR.reset(stderr_token)
 
     def _execute_command(self, job: ExtractionJob) -> None:
-        """Execute a command-based job via subprocess."""
-        proc = subprocess.run(job.command, capture_output=True, text=True)
+        """Execute a command-based job via subprocess.
+
+        The command runs in its own session so cancellation and deadlines can
+        kill the whole process group.
+        """
+        proc = subprocess.Popen(
+            job.command,  # type: ignore[arg-type]
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        with self.lock:
+            job.process = proc
+        try:
+            while True:
+                try:
+                    stdout, stderr = proc.communicate(timeout=_COMMAND_POLL_SECONDS)
+                    break
+                except subprocess.TimeoutExpired:
+                    if job.cancel_event.is_set():
+                        _kill_process_group(proc)
+        finally:
+            with self.lock:
+                job.process = None
         job.finished_at = time.time()
-        job.stdout_tail = _tail_text(proc.stdout)
-        job.stderr_tail = _tail_text(proc.stderr)
+        job.stdout_tail = _tail_text(stdout)
+        job.stderr_tail = _tail_text(stderr)
+        if job.cancel_event.is_set():
+            self._mark_stopped(job)
+            logger.info("Command job %s stopped: %s", job.id, job.stop_reason)
+            return
         if proc.returncode != 0:
             job.status = "failed"
             job.error = f"Extraction failed with exit code {proc.returncode}"
@@ -320,14 +1108,43 @@ class ExtractionJobManager:
         job.status = "succeeded"
         logger.info("Extraction job %s succeeded slug=%s", job.id, slug_with_pages)
 
-    def list_jobs(self) -> List[Dict[str, Any]]:
+    def list_jobs(
+        self,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        status: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of jobs (newest first) and the total matching count.
+
+        Rows come from the job store; live jobs are overlaid so their
+        progress fields are current.
+        """
+        if self.store is None:
+            self._refresh_estimates()
+            with self.lock:
+                jobs = [job for job in self.jobs.values() if not status or job.status == status]
+                jobs.sort(key=lambda j: j.created_at, reverse=True)
+                return [job.to_dict() for job in jobs[offset : offset + limit]], len(jobs)
+        records, total = self.store.list(limit=limit, offset=offset, status=status)
+        self._refresh_estimates()
         with self.lock:
-            return [job.to_dict() for job in sorted(self.jobs.values(), key=lambda j: j.created_at, reverse=True)]
+            for idx, record in enumerate(records):
+                live = self.jobs.get(record["id"])
+                if live is not None:
+                    records[idx] = live.to_dict()
+        return records, total
 
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            live = job_id in self.jobs
+        if live:
+            self._refresh_estimates()
         with self.lock:
             job = self.jobs.get(job_id)
-            return job.to_dict() if job else None
+            if job:
+                return job.to_dict()
+        return self.store.get(job_id) if self.store is not None else None
 
     def update_progress(
         self,
@@ -347,29 +1164,41 @@ class ExtractionJobManager:
             message: Human-readable progress message
             stage: Current processing stage name
         """
-        with self.lock:
-            job = self.jobs.get(job_id)
-            if not job:
-                return
-            if current is not None:
-                job.progress_current = current
-            if total is not None:
-                job.progress_total = total
-            if message is not None:
-                job.progress_message = message
-            if stage is not None:
-                job.progress_stage = stage
+        updates = {
+            "progress_current": current,
+            "progress_total": total,
+            "progress_message": message,
+            "progress_stage": stage,
+        }
+        self._apply_progress(job_id, {k: v for k, v in updates.items() if v is not None})
 
     def clear_progress(self, job_id: str) -> None:
         """Clear progress fields for a job (typically on completion)."""
+        self._apply_progress(job_id, dict.fromkeys(_PROGRESS_FIELDS))
+
+    def _apply_progress(self, job_id: str, updates: Dict[str, Any]) -> None:
+        delta: Dict[str, Any] = {}
         with self.lock:
             job = self.jobs.get(job_id)
             if not job:
                 return
-            job.progress_current = None
-            job.progress_total = None
-            job.progress_message = None
-            job.progress_stage = None
+            if "progress_stage" in updates and updates["progress_stage"] != job.progress_stage:
+                self._close_stage(job, time.time())
+            for key, value in updates.items():
+                if getattr(job, key) != value:
+                    setattr(job, key, value)
+                    delta[key] = value
+        if delta:
+            self._publish(job_id, "progress", delta)
+
+    @staticmethod
+    def _close_stage(job: ExtractionJob, now: float) -> None:
+        """Add the time spent in the current stage to ``stage_timings``."""
+        started, job.stage_started_at = job.stage_started_at, now
+        if started is None or job.progress_stage is None:
+            return
+        stage = job.progress_stage
+        job.stage_timings[stage] = round(job.stage_timings.get(stage, 0.0) + now - started, 3)
 
 
 EXTRACTION_JOB_MANAGER = ExtractionJobManager()
@@ -10,7 +10,10 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from openai import OpenAI, OpenAIError
 
+from chunking_pipeline.jsonl_reader import iter_jsonl
+
 from .config import PROVIDERS, get_out_dir, relative_to_root
+from .element_store import load_element_columns
 from .routes.reviews import _summarize_reviews
 from .routes.elements import _ensure_index
 from .file_utils import resolve_slug_file
@@ -226,31 +229,37 @@ def _load_element_snippets(slug: str, provider: str, item_ids: List[str]) -> Dic
         path = resolve_slug_file(slug, "{slug}.pages*.elements.jsonl", provider=provider)
     except Exception:
         return {}
+    rows = load_element_columns(
+        path, ("element_id", "original_element_id", "text", "text_as_html"), ids=sorted(wanted)
+    )
+    if rows is not None:
+        for row in rows:
+            text = row["text"] or ""
+            if not text and row["text_as_html"]:
+                text = re.sub(r"<[^>]+>", " ", row["text_as_html"])
+            target_id = row["element_id"] if row["element_id"] in wanted else row["original_element_id"]
+            if target_id:
+                snippets.setdefault(target_id, _normalize_text_snippet(text))
+        return snippets
     try:
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                element_id = obj.get("element_id")
-                md = obj.get("metadata") or {}
-                if element_id not in wanted and md.get("original_element_id") not in wanted:
-                    continue
-                text = obj.get("text") or md.get("text") or ""
-                if not text:
-                    html = md.get("text_as_html") or ""
-                    if html:
-                        text = re.sub(r"<[^>]+>", " ", html)
-                snippet = _normalize_text_snippet(text)
-                target_id = element_id if element_id in wanted else md.get("original_element_id")
-                if target_id:
-                    snippets[target_id] = snippet
-                if snippets.keys() >= wanted:
-                    break
+        # Only lines mentioning a wanted id are decoded
+        for obj in iter_jsonl(path, contains=wanted):
+            element_id = obj.get("element_id")
+            md = obj.get("metadata") or {}
+            if element_id not in wanted and md.get("original_element_id") not in wanted:
+                continue
+            text = obj.get("text") or md.get("text") or ""
+            if not text:
+                html = md.get("text_as_html") or ""
+                if html:
+                    text = re.sub(r"<[^>]+>", " ", html)
+            snippet = _normalize_text_snippet(text)
+            target_id = element_id if element_id in wanted else md.get("original_element_id")
+            if target_id:
+                # First match wins, as on the Parquet path
+                snippets.setdefault(target_id, snippet)
+            if snippets.keys() >= wanted:
+                break
     except Exception:
         return snippets
     return snippets
@@ -0,0 +1,221 @@
+"""Render figure regions of a PDF to PNG, and read their words from its text layer.
+
+Shared by the extraction figure pass and the figure image route. Batched
+cropping opens the PDF once, renders every figure of a page from the same
+loaded page, and hands the rendered pixels to a small thread pool that
+encodes and writes the PNGs. PyMuPDF objects are only touched from the
+calling thread; the writers work on plain pixel buffers through Pillow.
+
+``figure_text_positions`` clips the PDF's own words to each figure box, so
+figures in born-digital PDFs get text positions without an OCR call.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+logger = logging.getLogger("chunking.figure_crops")
+
+PNG_WRITERS = min(4, os.cpu_count() or 1)
+
+# (output path, 1-indexed page number, element coordinates)
+FigureCrop = Tuple[Path, int, Dict[str, Any]]
+
+_PIXMAP_MODES = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}
+
+
+def figure_clip(page: "fitz.Page", coordinates: Dict[str, Any]) -> Optional["fitz.Rect"]:
+    """Clip rectangle (PDF points) for an element's coordinates on ``page``."""
+    points = coordinates.get("points", [])
+    if len(points) < 4:
+        logger.warning(f"Invalid coordinates: {coordinates}")
+        return None
+
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    x0, y0 = min(xs), min(ys)
+    x1, y1 = max(xs), max(ys)
+
+    # Handle PixelSpace coordinate system (used for images converted to PDF)
+    # Azure DI returns coordinates in pixels, but fitz creates PDFs in points
+    # (at 72 DPI). High-DPI images (e.g., Retina screenshots at 144 DPI) result
+    # in a PDF that's half the pixel dimensions. We need to scale coordinates.
+    coord_system = coordinates.get("system", "")
+    layout_width = coordinates.get("layout_width")
+    layout_height = coordinates.get("layout_height")
+
+    if coord_system == "PixelSpace" and layout_width and layout_height:
+        scale_x = page.rect.width / layout_width
+        scale_y = page.rect.height / layout_height
+        x0, y0 = x0 * scale_x, y0 * scale_y
+        x1, y1 = x1 * scale_x, y1 * scale_y
+        logger.debug(
+            f"Scaled PixelSpace coords: scale=({scale_x:.3f}, {scale_y:.3f}), "
+            f"rect=({x0:.1f}, {y0:.1f}, {x1:.1f}, {y1:.1f})"
+        )
+
+    return fitz.Rect(x0, y0, x1, y1)
+
+
+def _render(page: "fitz.Page", coordinates: Dict[str, Any], dpi: int) -> Optional["fitz.Pixmap"]:
+    clip = figure_clip(page, coordinates)
+    if clip is None:
+        return None
+    zoom = dpi / 72.0
+    return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+
+
+def crop_figure(
+    pdf_path: Path,
+    page_number: int,
+    coordinates: Dict[str, Any],
+    dpi: int = 300,
+) -> Optional[bytes]:
+    """Extract a figure region from a PDF page as PNG bytes.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_number: 1-indexed page number
+        coordinates: Dict with 'points' (4 corners) and layout dimensions
+        dpi: Resolution for rendering (default 300)
+
+    Returns:
+        PNG image bytes or None if extraction fails
+    """
+    try:
+        with fitz.open(pdf_path) as doc:
+            page_idx = page_number - 1
+            if page_idx < 0 or page_idx >= len(doc):
+                logger.warning(f"Page {page_number} out of range for {pdf_path}")
+                return None
+            pix = _render(doc[page_idx], coordinates, dpi)
+            return pix.tobytes("png") if pix is not None else None
+    except Exception as e:
+        logger.exception(f"Failed to extract figure from PDF: {e}")
+        return None
+
+
+def _write_png(path: Path, mode: str, size: Tuple[int, int], samples: bytes) -> Path:
+    Image.frombytes(mode, size, samples).save(path, format="PNG")
+    return path
+
+
+def crop_figures(
+    pdf_path: Path,
+    crops: Iterable[FigureCrop],
+    dpi: int = 300,
+    workers: int = PNG_WRITERS,
+) -> Set[Path]:
+    """Render many figure regions of one PDF and write each as a PNG file.
+
+    The PDF is opened once and each page is loaded once for all of its
+    figures. Returns the set of paths that were written; failures are logged
+    and left out, so callers can fall back per figure.
+    """
+    by_page: Dict[int, List[Tuple[Path, Dict[str, Any]]]] = {}
+    for path, page_number, coordinates in crops:
+        by_page.setdefault(page_number, []).append((path, coordinates))
+    if not by_page:
+        return set()
+
+    written: Set[Path] = set()
+    workers = max(1, workers)
+
+    def _collect(done: Iterable[Future]) -> None:
+        for future in done:
+            try:
+                written.add(future.result())
+            except Exception as e:
+                logger.warning(f"Failed to write figure image: {e}")
+
+    try:
+        doc = fitz.open(pdf_path)
+    except Exception as e:
+        logger.exception(f"Failed to open {pdf_path} for figure extraction: {e}")
+        return written
+
+    with doc, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="figure-png") as pool:
+        pending: Set[Future] = set()
+        for page_number in sorted(by_page):
+            page_idx = page_number - 1
+            if page_idx < 0 or page_idx >= len(doc):
+                logger.warning(f"Page {page_number} out of range for {pdf_path}")
+                continue
+            page = doc[page_idx]
+            for path, coordinates in by_page[page_number]:
+                try:
+                    pix = _render(page, coordinates, dpi)
+                except Exception as e:
+                    logger.warning(f"Failed to render figure {path.name} on page {page_number}: {e}")
+                    continue
+                if pix is None:
+                    continue
+                if pix.colorspace is None or pix.colorspace.n not in (1, 3):
+                    pix = fitz.Pixmap(fitz.csRGB, pix)
+                mode = _PIXMAP_MODES[pix.n]
+                pending.add(pool.submit(_write_png, path, mode, (pix.width, pix.height), pix.samples))
+                # Bound the rendered buffers held in memory while writers catch up
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+        _collect(wait(pending).done)
+    return written
+
+
+def _clipped_words(page: "fitz.Page", clip: "fitz.Rect") -> List[Dict[str, Any]]:
+    """Words inside ``clip`` as ``{x, y, width, height, content}`` normalized to 0-1 of the clip."""
+    if clip.width <= 0 or clip.height <= 0:
+        return []
+    positions: List[Dict[str, Any]] = []
+    for x0, y0, x1, y1, content, *_ in page.get_text("words", clip=clip):
+        if not content.strip():
+            continue
+        x0, y0 = max(x0, clip.x0), max(y0, clip.y0)
+        x1, y1 = min(x1, clip.x1), min(y1, clip.y1)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        positions.append({
+            "x": round((x0 - clip.x0) / clip.width, 4),
+            "y": round((y0 - clip.y0) / clip.height, 4),
+            "width": round((x1 - x0) / clip.width, 4),
+            "height": round((y1 - y0) / clip.height, 4),
+            "content": content,
+        })
+    return positions
+
+
+def figure_text_positions(pdf_path: Path, crops: Iterable[FigureCrop]) -> Dict[Path, List[Dict[str, Any]]]:
+    """Text positions for figure crops taken from the PDF's text layer.
+
+    Returns positions in the same 0-1 format as the Azure DI figure OCR,
+    keyed by crop path. Figures without any words in the text layer (scanned
+    pages, raster diagrams) are left out so callers can OCR them instead.
+    """
+    by_page: Dict[int, List[Tuple[Path, Dict[str, Any]]]] = {}
+    for path, page_number, coordinates in crops:
+        by_page.setdefault(page_number, []).append((path, coordinates))
+    results: Dict[Path, List[Dict[str, Any]]] = {}
+    if not by_page:
+        return results
+    try:
+        with fitz.open(pdf_path) as doc:
+            for page_number in sorted(by_page):
+                page_idx = page_number - 1
+                if page_idx < 0 or page_idx >= len(doc):
+                    continue
+                page = doc[page_idx]
+                for path, coordinates in by_page[page_number]:
+                    clip = figure_clip(page, coordinates)
+                    words = _clipped_words(page, clip) if clip is not None else []
+                    if words:
+                        results[path] = words
+    except Exception as e:
+        logger.warning(f"Failed to read figure text from {pdf_path}: {e}")
+    return results
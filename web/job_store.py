@@ -0,0 +1,145 @@
+"""Durable storage for extraction jobs.
+
+Jobs are persisted to a small SQLite database (WAL mode) so that finished
+jobs survive restarts and jobs that were queued or running when the server
+stopped can be re-queued on startup. The in-memory manager only keeps live
+jobs; history is served from here.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("chunking.extraction_jobs")
+
+ACTIVE_STATUSES = ("queued", "running")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    callable TEXT,
+    command TEXT,
+    metadata TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at);
+"""
+
+
+class JobStore:
+    """SQLite-backed job table shared by all worker threads."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def save(
+        self,
+        *,
+        record: Dict[str, Any],
+        metadata: Dict[str, Any],
+        callable_path: Optional[str],
+        command: Optional[List[str]],
+    ) -> None:
+        """Insert or replace a job row from its ``to_dict()`` record."""
+        row = (
+            record["id"],
+            record["status"],
+            record["created_at"],
+            record.get("finished_at"),
+            callable_path,
+            json.dumps(command) if command is not None else None,
+            json.dumps(metadata, ensure_ascii=False, default=str),
+            json.dumps(record, ensure_ascii=False, default=str),
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(id, status, created_at, finished_at, callable, command, metadata, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT record FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["record"]) if row else None
+
+    def list(
+        self,
+        *,
+        limit: int,
+        offset: int = 0,
+        status: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of job records (newest first) and the total count."""
+        where = ""
+        params: Tuple[Any, ...] = ()
+        if status:
+            where = " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT record FROM jobs{where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + (limit, offset),
+            ).fetchall()
+        return [json.loads(row["record"]) for row in rows], total
+
+    def active(self) -> List[Dict[str, Any]]:
+        """Return jobs left queued/running, oldest first, with their inputs."""
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, callable, command, metadata, record FROM jobs "
+                f"WHERE status IN ({placeholders}) ORDER BY created_at ASC",
+                ACTIVE_STATUSES,
+            ).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "callable": row["callable"],
+                "command": json.loads(row["command"]) if row["command"] else None,
+                "metadata": json.loads(row["metadata"]),
+                "record": json.loads(row["record"]),
+            }
+            for row in rows
+        ]
+
+    def evict_finished(self, ttl_seconds: float) -> int:
+        """Delete finished jobs older than ``ttl_seconds``; returns rows removed."""
+        cutoff = time.time() - ttl_seconds
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        with self._lock:
+            cur = self._conn.execute(
+                f"DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ? "
+                f"AND status NOT IN ({placeholders})",
+                (cutoff, *ACTIVE_STATUSES),
+            )
+        return cur.rowcount or 0
+
+
+def open_job_store(path: Path) -> Optional[JobStore]:
+    """Open the job store, or return None (in-memory only) if it is unusable."""
+    try:
+        return JobStore(path)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Extraction job store unavailable at %s, keeping jobs in memory only: %s", path, exc)
+        return None
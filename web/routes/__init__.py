@@ -1,4 +1,5 @@
 from .admin import router as admin_router
+from .blobs import router as blobs_router
 from .chunker import router as chunker_router
 from .chunks import router as chunks_router
 from .elements import clear_index_cache, router as elements_router
@@ -10,6 +11,7 @@ from .reviews import router as reviews_router
 
 __all__ = [
     "admin_router",
+    "blobs_router",
     "chunker_router",
     "chunks_router",
     "elements_router",
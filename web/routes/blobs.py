@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from ..blob_store import resolve_blob
+
+router = APIRouter()
+
+# Blob URLs are content-addressed, so a response never goes stale
+_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+
+@router.get("/api/blobs/{name}")
+def api_blob(name: str, request: Request) -> Response:
+    """Serve an image blob by ``<sha256>.<ext>`` with ETag revalidation and Range support."""
+    found = resolve_blob(name)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Blob not found")
+    path, digest, media_type = found
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
+import os
+import re
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Request
 
@@ -21,12 +29,32 @@ from src.extractors.section_based_chunker import (
 )
 from src.models.elements import Element
 
-from ..config import DEFAULT_PROVIDER, PROVIDERS, get_out_dir
+from chunking_pipeline.chunk_compare import compare_chunkers, save_chunks
+from chunking_pipeline.jsonl_reader import iter_jsonl, load_jsonl
+
+from ..config import DEFAULT_PROVIDER, PROVIDERS, env_int, get_out_dir
 from ..extraction_jobs import EXTRACTION_JOB_MANAGER
+from .chunks import write_chunk_overlay
 
 logger = logging.getLogger("chunking.routes.chunker")
 router = APIRouter()
 
+# Bounded pool for chunker runs so large re-chunks neither block the event
+# loop nor pile up unbounded threads.
+CHUNKER_WORKERS = max(1, env_int("CHUNKER_WORKERS", 2))
+_CHUNK_EXECUTOR = ThreadPoolExecutor(max_workers=CHUNKER_WORKERS, thread_name_prefix="chunker")
+
+# Parallel chunker comparisons (POST /api/chunk/compare)
+CHUNK_COMPARE_PROCESSES = max(1, env_int("CHUNK_COMPARE_PROCESSES", min(4, os.cpu_count() or 1)))
+CHUNK_COMPARE_MAX_VARIANTS = 16
+
+# Parsed element dicts per source file (LRU), keyed by path and checked against
+# mtime/size. Dicts rather than Element models: each run validates its own
+# models, which is cheaper than deep-copying shared ones.
+CHUNKER_ELEMENT_CACHE_SIZE = max(1, env_int("CHUNKER_ELEMENT_CACHE_SIZE", 8))
+_ELEMENT_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]]" = OrderedDict()
+_ELEMENT_CACHE_LOCK = threading.Lock()
+
 
 def _resolve_elements_or_chunks_file(slug: str, provider: str) -> Tuple[Path, bool]:
     """Find elements or chunks JSONL file for a given slug and provider.
@@ -62,16 +90,7 @@ def _resolve_elements_or_chunks_file(slug: str, provider: str) -> Tuple[Path, bo
 
 def _load_elements_from_elements_file(path: Path) -> List[Dict[str, Any]]:
     """Load elements from a v5.0+ elements JSONL file."""
-    elements = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                try:
-                    elements.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-    return elements
+    return load_jsonl(path)
 
 
 def _load_elements_from_chunks_file(path: Path) -> List[Dict[str, Any]]:
@@ -84,37 +103,28 @@ def _load_elements_from_chunks_file(path: Path) -> List[Dict[str, Any]]:
     elements = []
     seen_ids: set = set()
 
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                chunk = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    for chunk in iter_jsonl(path):
+        meta = chunk.get("metadata") or {}
 
-            meta = chunk.get("metadata") or {}
+        # Try to decode orig_elements first (Unstructured chunker format)
+        try:
+            orig_elements = decode_orig_elements(meta)
+        except Exception:
+            orig_elements = []
 
-            # Try to decode orig_elements first (Unstructured chunker format)
-            try:
-                orig_elements = decode_orig_elements(meta)
-            except Exception:
-                orig_elements = []
-
-            if orig_elements:
-                # Extract embedded original elements
-                for el in orig_elements:
-                    element_id = el.get("element_id")
-                    if element_id and element_id not in seen_ids:
-                        seen_ids.add(element_id)
-                        elements.append(el)
-            else:
-                # Treat chunk as a direct element (Azure DI legacy format)
-                element_id = chunk.get("element_id")
+        if orig_elements:
+            # Extract embedded original elements
+            for el in orig_elements:
+                element_id = el.get("element_id")
                 if element_id and element_id not in seen_ids:
                     seen_ids.add(element_id)
-                    elements.append(chunk)
+                    elements.append(el)
+        else:
+            # Treat chunk as a direct element (Azure DI legacy format)
+            element_id = chunk.get("element_id")
+            if element_id and element_id not in seen_ids:
+                seen_ids.add(element_id)
+                elements.append(chunk)
 
     return elements
 
@@ -202,13 +212,108 @@ def _detect_language_code(meta: Dict[str, Any]) -> str | None:
     return None
 
 
-def _save_chunks(chunks: List[Any], path: Path) -> None:
-    """Save chunks to a JSONL file."""
-    with path.open("w", encoding="utf-8") as f:
-        for chunk in chunks:
-            # Convert Pydantic models to dicts if needed
-            data = chunk.model_dump() if hasattr(chunk, "model_dump") else chunk
-            f.write(json.dumps(data, ensure_ascii=False) + "\n")
+def _apply_language_defaults(
+    config_dict: Dict[str, Any], slug: str, provider: str
+) -> Tuple[Optional[str], Optional[float]]:
+    """Auto-inject chars_per_token from the run's detected language if not set.
+
+    Mutates ``config_dict``; returns ``(detected_language, applied_chars_per_token)``.
+    """
+    if "chars_per_token" in config_dict:
+        return None, None
+    meta = _load_extraction_metadata(slug, provider)
+    detected_language = _detect_language_code(meta)
+    if not detected_language:
+        return None, None
+    cpt = chars_per_token_for_language(detected_language)
+    config_dict["chars_per_token"] = cpt
+    logger.info(f"Auto-set chars_per_token={cpt} for detected language '{detected_language}'")
+    return detected_language, cpt
+
+
+def _load_element_dicts(source_path: Path, is_elements: bool) -> List[Dict[str, Any]]:
+    """Element dicts for a source file, cached per file version.
+
+    Parameter tweaks in the chunker modal re-chunk the same source many
+    times; only the first run pays for reading and parsing the JSONL.
+    The returned dicts are shared and must not be modified.
+    """
+    st = source_path.stat()
+    key = str(source_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _ELEMENT_CACHE_LOCK:
+        cached = _ELEMENT_CACHE.get(key)
+        if cached and cached[0] == stamp:
+            _ELEMENT_CACHE.move_to_end(key)
+            logger.info(f"Reusing {len(cached[1])} parsed elements for {source_path.name}")
+            return cached[1]
+
+    logger.info(f"Loading elements from {source_path} (is_elements={is_elements})")
+    if is_elements:
+        elements = _load_elements_from_elements_file(source_path)
+    else:
+        elements = _load_elements_from_chunks_file(source_path)
+    with _ELEMENT_CACHE_LOCK:
+        _ELEMENT_CACHE[key] = (stamp, elements)
+        _ELEMENT_CACHE.move_to_end(key)
+        while len(_ELEMENT_CACHE) > CHUNKER_ELEMENT_CACHE_SIZE:
+            _ELEMENT_CACHE.popitem(last=False)
+    return elements
+
+
+def _run_chunker(
+    source_slug: str,
+    source_provider: str,
+    chunker_name: str,
+    chunker_info: Any,
+    config: Any,
+) -> Tuple[Path, int, Dict[str, Any]]:
+    """Load a run's elements, chunk them and write the chunks file (blocking).
+
+    Returns ``(output_path, source_element_count, summary)``.
+    """
+    # Find and load source elements (supports both v5.0+ and legacy formats)
+    try:
+        source_path, is_elements = _resolve_elements_or_chunks_file(source_slug, source_provider)
+    except HTTPException:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Source elements not found for {source_slug} ({source_provider})",
+        )
+
+    elements = _load_element_dicts(source_path, is_elements)
+    if not elements:
+        raise HTTPException(
+            status_code=400,
+            detail="Source file contains no elements",
+        )
+
+    logger.info(f"Loaded {len(elements)} elements, running {chunker_name} chunker")
+
+    # Convert dicts to Element models (chunker functions expect Pydantic models);
+    # fresh models per run, so a chunker cannot change what later runs see
+    element_models = [Element.model_validate(el) for el in elements]
+    chunks = chunker_info.chunker_fn(element_models, config)
+    stats = get_chunk_statistics(chunks)
+    summary = stats.model_dump()
+
+    logger.info(
+        f"Generated {summary['count']} chunks "
+        f"(avg {summary['avg_chars']} chars)"
+    )
+
+    # Save chunks to output file
+    # Output goes to same directory as source file, with .chunks.jsonl suffix
+    out_dir = get_out_dir(source_provider)
+    # Strip both .elements and .chunks suffixes from stem for output naming
+    output_stem = source_path.stem.replace(".elements", "").replace(".chunks", "")
+    output_path = out_dir / f"{output_stem}.chunks.jsonl"
+
+    logger.info(f"Saving chunks to {output_path}")
+    save_chunks(chunks, output_path)
+    write_chunk_overlay(output_path)
+
+    return output_path, len(element_models), summary
 
 
 @router.get("/api/chunkers")
@@ -271,20 +376,9 @@ async def api_chunk(request: Request) -> Dict[str, Any]:
 
     # Build config, with optional language-aware chars_per_token injection
     config_dict = payload.get("config") or {}
-    detected_language = None
-    applied_chars_per_token = None
-
-    # Auto-inject chars_per_token if user didn't explicitly set it
-    if "chars_per_token" not in config_dict:
-        meta = _load_extraction_metadata(source_slug, source_provider)
-        detected_language = _detect_language_code(meta)
-        if detected_language:
-            cpt = chars_per_token_for_language(detected_language)
-            config_dict["chars_per_token"] = cpt
-            applied_chars_per_token = cpt
-            logger.info(
-                f"Auto-set chars_per_token={cpt} for detected language '{detected_language}'"
-            )
+    detected_language, applied_chars_per_token = _apply_language_defaults(
+        config_dict, source_slug, source_provider
+    )
 
     try:
         config = chunker_info.config_model(**config_dict)
@@ -294,56 +388,17 @@ async def api_chunk(request: Request) -> Dict[str, Any]:
             detail=f"Invalid config for {chunker_name}: {e}",
         ) from e
 
-    # Find and load source elements (supports both v5.0+ and legacy formats)
-    try:
-        source_path, is_elements = _resolve_elements_or_chunks_file(source_slug, source_provider)
-    except HTTPException:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Source elements not found for {source_slug} ({source_provider})",
-        )
-
-    logger.info(f"Loading elements from {source_path} (is_elements={is_elements})")
-    if is_elements:
-        elements = _load_elements_from_elements_file(source_path)
-    else:
-        elements = _load_elements_from_chunks_file(source_path)
-
-    if not elements:
-        raise HTTPException(
-            status_code=400,
-            detail="Source file contains no elements",
-        )
-
-    logger.info(f"Loaded {len(elements)} elements, running {chunker_name} chunker")
-
-    # Convert dicts to Element models (chunker functions expect Pydantic models)
-    element_models = [Element.model_validate(el) for el in elements]
-
-    # Run chunker
-    chunks = chunker_info.chunker_fn(element_models, config)
-    stats = get_chunk_statistics(chunks)
-    summary = stats.model_dump()
-
-    logger.info(
-        f"Generated {summary['count']} chunks "
-        f"(avg {summary['avg_chars']} chars)"
+    # Loading, validating and chunking are CPU-bound; keep them off the event loop
+    loop = asyncio.get_running_loop()
+    output_path, source_count, summary = await loop.run_in_executor(
+        _CHUNK_EXECUTOR,
+        functools.partial(_run_chunker, source_slug, source_provider, chunker_name, chunker_info, config),
     )
 
-    # Save chunks to output file
-    # Output goes to same directory as source file, with .chunks.jsonl suffix
-    out_dir = get_out_dir(source_provider)
-    # Strip both .elements and .chunks suffixes from stem for output naming
-    output_stem = source_path.stem.replace(".elements", "").replace(".chunks", "")
-    output_path = out_dir / f"{output_stem}.chunks.jsonl"
-
-    logger.info(f"Saving chunks to {output_path}")
-    _save_chunks(chunks, output_path)
-
     result: Dict[str, Any] = {
         "success": True,
         "chunks_file": str(output_path),
-        "source_elements": len(elements),
+        "source_elements": source_count,
         "summary": summary,
     }
     if detected_language:
@@ -351,3 +406,115 @@ async def api_chunk(request: Request) -> Dict[str, Any]:
     if applied_chars_per_token is not None:
         result["applied_chars_per_token"] = applied_chars_per_token
     return result
+
+
+@router.post("/api/chunk/compare")
+async def api_chunk_compare(request: Request) -> Dict[str, Any]:
+    """Run several chunker strategy/config variants on one run and compare them.
+
+    Request body:
+    {
+        "source_slug": "...",
+        "source_provider": "...",
+        "variants": [
+            {"chunker": "section_based", "config": {...}, "label": "small"},
+            ...
+        ]
+    }
+
+    Variants run in parallel worker processes over one loaded element list.
+    Each writes ``{stem}.chunk_variants/{label}.chunks.jsonl`` (the main
+    ``{stem}.chunks.jsonl`` is left untouched) and reports its
+    ``get_chunk_statistics`` summary, or an ``error`` if it failed.
+    """
+    try:
+        payload = await request.json()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}") from e
+
+    source_slug = payload.get("source_slug")
+    if not source_slug:
+        raise HTTPException(status_code=400, detail="source_slug is required")
+    source_provider = payload.get("source_provider") or DEFAULT_PROVIDER
+    if source_provider not in PROVIDERS:
+        raise HTTPException(status_code=400, detail=f"Unknown provider: {source_provider}")
+
+    raw_variants = payload.get("variants")
+    if not isinstance(raw_variants, list) or not raw_variants:
+        raise HTTPException(status_code=400, detail="variants must be a non-empty list")
+    if len(raw_variants) > CHUNK_COMPARE_MAX_VARIANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {CHUNK_COMPARE_MAX_VARIANTS} variants per comparison",
+        )
+
+    try:
+        source_path, is_elements = _resolve_elements_or_chunks_file(source_slug, source_provider)
+    except HTTPException:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Source elements not found for {source_slug} ({source_provider})",
+        )
+    base_stem = source_path.stem.replace(".elements", "").replace(".chunks", "")
+    variants_dir = get_out_dir(source_provider) / f"{base_stem}.chunk_variants"
+
+    # Same language-aware chars_per_token default as /api/chunk, resolved once
+    _, default_cpt = _apply_language_defaults({}, source_slug, source_provider)
+
+    variants: List[Dict[str, Any]] = []
+    used_labels: set = set()
+    for idx, raw in enumerate(raw_variants):
+        if not isinstance(raw, dict):
+            raise HTTPException(status_code=400, detail=f"variants[{idx}] must be an object")
+        chunker_name = raw.get("chunker") or "section_based"
+        try:
+            chunker_info = get_chunker(chunker_name)
+        except KeyError:
+            raise HTTPException(status_code=400, detail=f"Unknown chunker strategy: {chunker_name}")
+        config_dict = dict(raw.get("config") or {})
+        if default_cpt is not None:
+            config_dict.setdefault("chars_per_token", default_cpt)
+        try:
+            config = chunker_info.config_model(**config_dict)
+        except Exception as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid config for variants[{idx}] ({chunker_name}): {e}",
+            ) from e
+        if hasattr(config, "model_dump"):
+            config_dict = config.model_dump(mode="json")
+        digest = hashlib.sha1(json.dumps(config_dict, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+        label = re.sub(r"[^A-Za-z0-9_.-]+", "-", str(raw.get("label") or f"{chunker_name}-{digest}")).strip("-.")
+        label = label or f"variant{idx}"
+        if label in used_labels:
+            label = f"{label}-{idx}"
+        used_labels.add(label)
+        variants.append(
+            {
+                "label": label,
+                "chunker": chunker_name,
+                "config": config_dict,
+                "output_path": str(variants_dir / f"{label}.chunks.jsonl"),
+            }
+        )
+
+    def _compare() -> Tuple[int, List[Dict[str, Any]]]:
+        elements = _load_element_dicts(source_path, is_elements)
+        if not elements:
+            raise HTTPException(status_code=400, detail="Source file contains no elements")
+        logger.info(f"Comparing {len(variants)} chunker variants on {len(elements)} elements from {source_path}")
+        return len(elements), compare_chunkers(elements, variants, processes=CHUNK_COMPARE_PROCESSES)
+
+    loop = asyncio.get_running_loop()
+    source_count, results = await loop.run_in_executor(_CHUNK_EXECUTOR, _compare)
+
+    for result in results:
+        output_path = Path(result.pop("output_path"))
+        if "error" not in result:
+            result["chunks_file"] = str(output_path)
+    return {
+        "success": all("error" not in r for r in results),
+        "source_elements": source_count,
+        "variants_dir": str(variants_dir),
+        "variants": results,
+    }
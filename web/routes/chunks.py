@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import json
+import logging
 import re
+import threading
+from collections import OrderedDict
 from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
@@ -11,9 +14,17 @@ from fastapi import APIRouter, HTTPException, Query
 
 from src.extractors.section_based_chunker import decode_orig_elements
 
+from chunking_pipeline.jsonl_reader import iter_jsonl, iter_jsonl_spans, read_records
+
 from ..config import DEFAULT_PROVIDER, get_out_dir
 
 router = APIRouter()
+logger = logging.getLogger("chunking.routes.chunks")
+OVERLAY_FORMAT_VERSION = 1
+# Per-file summary, line spans and table HTML, keyed by path and invalidated by mtime/size
+_SUMMARY_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_SUMMARY_CACHE_LOCK = threading.Lock()
+_SUMMARY_CACHE_SIZE = 64
 
 
 def _resolve_chunk_file(slug: str, provider: str) -> Path:
@@ -43,170 +54,263 @@ def _load_full_table_htmls(chunks_path: Path) -> Dict[str, str]:
         return {}
     result: Dict[str, str] = {}
     try:
-        with elements_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    el = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if "table" not in (el.get("type") or "").lower():
-                    continue
-                html = (el.get("metadata") or {}).get("text_as_html")
-                eid = el.get("element_id")
-                if html and eid:
-                    result[eid] = html
+        # Only table lines carry the HTML we want; skip decoding the rest
+        table_lines = iter_jsonl(
+            elements_path,
+            contains=("table", "Table", "TABLE"),
+            fields=("type", "element_id", "metadata"),
+        )
+        for el in table_lines:
+            if "table" not in (el.get("type") or "").lower():
+                continue
+            html = (el.get("metadata") or {}).get("text_as_html")
+            eid = el.get("element_id")
+            if html and eid:
+                result[eid] = html
     except OSError:
         pass
     return result
 
 
-@router.get("/api/chunks/{slug}")
-def api_chunks(slug: str, provider: str = Query(default=None)) -> Dict[str, Any]:
-    path = _resolve_chunk_file(slug, provider or DEFAULT_PROVIDER)
-    full_table_htmls = _load_full_table_htmls(path)
-    chunks: List[Dict[str, Any]] = []
+def _compute_chunk_overlay(obj: Dict[str, Any], full_table_htmls: Dict[str, str]) -> Dict[str, Any]:
+    """Overlay geometry for one chunk: element boxes, chunk bbox, page bboxes and table segment."""
+    meta = obj.get("metadata") or {}
+    orig_boxes: List[Dict[str, Any]] = []
+    orig_table_html: Optional[str] = None
+    orig_html_is_table = False
+    try:
+        decoded = decode_orig_elements(meta)
+    except Exception:
+        decoded = []
+    for el in decoded:
+        md = el.get("metadata") or {}
+        # Capture table HTML regardless of coordinates.
+        # Prefer the full table from the elements file (split chunks
+        # only carry partial HTML after the PaC metadata-copy fix).
+        eid = el.get("element_id")
+        full_html = full_table_htmls.get(eid) if eid else None
+        html_candidate = full_html or md.get("text_as_html") or el.get("text_as_html")
+        if html_candidate:
+            is_table = "table" in (el.get("type") or "").lower()
+            if not orig_table_html or (is_table and not orig_html_is_table):
+                orig_table_html = html_candidate
+                orig_html_is_table = is_table
+        coords = (md.get("coordinates") or {})
+        pts = coords.get("points") or []
+        if not pts:
+            continue
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        x = min(xs)
+        y = min(ys)
+        w = max(xs) - x
+        h = max(ys) - y
+        page_trimmed = md.get("page_number") or (md.get("page_numbers") or [None])[0]
+        box_entry = {
+            "page_trimmed": page_trimmed,
+            "layout_w": coords.get("layout_width"),
+            "layout_h": coords.get("layout_height"),
+            "x": x,
+            "y": y,
+            "w": w,
+            "h": h,
+            "type": el.get("type") or md.get("category"),
+            "element_id": el.get("element_id"),
+            "orig_id": md.get("original_element_id"),
+        }
+        orig_boxes.append(box_entry)
+    bbox = None
+    try:
+        ccoords = (meta.get("coordinates") or {})
+        pts = ccoords.get("points") or []
+        if pts:
+            xs = [p[0] for p in pts]
+            ys = [p[1] for p in pts]
+            x = min(xs)
+            y = min(ys)
+            w = max(xs) - x
+            h = max(ys) - y
+            page_trimmed = meta.get("page_number") or (meta.get("page_numbers") or [None])[0]
+            bbox = {
+                "page_trimmed": page_trimmed,
+                "layout_w": ccoords.get("layout_width"),
+                "layout_h": ccoords.get("layout_height"),
+                "x": x,
+                "y": y,
+                "w": w,
+                "h": h,
+            }
+    except Exception:
+        bbox = None
+    segment_bbox = None
+    segment_span_info: Optional[Tuple[int, int, int]] = None
+    if orig_table_html:
+        reference_bbox = _pick_table_bbox(orig_boxes) or bbox
+        seg_info = _compute_table_segment(meta, obj, orig_table_html, reference_bbox)
+        if seg_info:
+            segment_bbox, span, total_rows = seg_info
+            segment_span_info = (span[0], span[1], total_rows)
+            if segment_bbox and reference_bbox and not segment_bbox.get("page_trimmed"):
+                segment_bbox["page_trimmed"] = reference_bbox.get("page_trimmed")
+    # Handle multi-page bboxes (page_bboxes field from chunker)
+    page_bboxes_simplified: Optional[List[Dict[str, Any]]] = None
+    raw_page_bboxes = meta.get("page_bboxes")
+    if raw_page_bboxes:
+        page_bboxes_simplified = []
+        for pb in raw_page_bboxes:
+            pb_coords = pb.get("coordinates") or {}
+            pb_pts = pb_coords.get("points") or []
+            if pb_pts:
+                pb_xs = [p[0] for p in pb_pts]
+                pb_ys = [p[1] for p in pb_pts]
+                page_bboxes_simplified.append({
+                    "page_trimmed": pb.get("page_number"),
+                    "layout_w": pb_coords.get("layout_width"),
+                    "layout_h": pb_coords.get("layout_height"),
+                    "x": min(pb_xs),
+                    "y": min(pb_ys),
+                    "w": max(pb_xs) - min(pb_xs),
+                    "h": max(pb_ys) - min(pb_ys),
+                })
+
+    overlay: Dict[str, Any] = {
+        "orig_boxes": orig_boxes,
+        "bbox": bbox,
+    }
+    if page_bboxes_simplified:
+        overlay["page_bboxes"] = page_bboxes_simplified
+    if segment_bbox:
+        overlay["segment_bbox"] = segment_bbox
+    if segment_span_info:
+        start_idx, end_idx, total_rows = segment_span_info
+        overlay["segment_row_span"] = {
+            "start": start_idx,
+            "end": end_idx,
+            "total": total_rows,
+        }
+    return overlay
+
+
+def _build_chunk_entry(
+    obj: Dict[str, Any],
+    full_table_htmls: Dict[str, str],
+    overlay: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Build the UI payload for one chunk, using precomputed overlay geometry when given."""
+    text = obj.get("text") or ""
+    if overlay is None:
+        overlay = _compute_chunk_overlay(obj, full_table_htmls)
+    chunk_entry: Dict[str, Any] = {
+        "element_id": obj.get("element_id"),
+        "text": text,
+        "char_len": len(text),
+        "type": obj.get("type"),
+        "metadata": obj.get("metadata") or {},
+    }
+    chunk_entry.update((k, v) for k, v in overlay.items() if k != "pages")
+    return chunk_entry
+
+
+def overlay_path(chunks_path: Path) -> Path:
+    return chunks_path.with_name(chunks_path.name.replace(".chunks.jsonl", ".chunks.overlay"))
+
+
+def _overlay_stamp(chunks_path: Path) -> List[Optional[List[int]]]:
+    """Version marker for an overlay: the chunks file and its sibling elements file."""
+    elements_path = chunks_path.with_name(chunks_path.name.replace(".chunks.jsonl", ".elements.jsonl"))
+    return [list(st) if st else None for st in (_file_stamp(chunks_path), _file_stamp(elements_path))]
+
+
+def write_chunk_overlay(chunks_path: Path) -> Optional[Path]:
+    """Precompute overlay geometry for every chunk into a ``.chunks.overlay`` sidecar.
+
+    The sidecar is JSONL: a header line recording the source file versions,
+    then one compact record per chunk (boxes, segment span, page bboxes and
+    the pages it is drawn on) in chunk order. Failures are logged and
+    otherwise ignored; the read path then computes boxes per request.
+    """
+    dest = overlay_path(chunks_path)
+    full_table_htmls = _load_full_table_htmls(chunks_path)
+    tmp = dest.with_name(dest.name + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as fh:
+            header = {"v": OVERLAY_FORMAT_VERSION, "stamp": _overlay_stamp(chunks_path)}
+            fh.write(json.dumps(header) + "\n")
+            for _, _, obj in iter_jsonl_spans(chunks_path):
+                overlay = _compute_chunk_overlay(obj, full_table_htmls)
+                overlay["pages"] = _chunk_entry_pages({**overlay, "metadata": obj.get("metadata") or {}})
+                fh.write(json.dumps(overlay, ensure_ascii=False, separators=(",", ":")) + "\n")
+        tmp.replace(dest)
+    except OSError as exc:
+        tmp.unlink(missing_ok=True)
+        logger.warning(f"Failed to write chunk overlay {dest}: {exc}")
+        return None
+    return dest
+
+
+def _load_chunk_overlay(chunks_path: Path) -> Optional[List[Dict[str, Any]]]:
+    """Read the overlay sidecar if it matches the current chunks/elements files."""
+    path = overlay_path(chunks_path)
+    if not path.exists():
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            header = json.loads(fh.readline() or "{}")
+            if header.get("v") != OVERLAY_FORMAT_VERSION or header.get("stamp") != _overlay_stamp(chunks_path):
+                return None
+            return [json.loads(line) for line in fh if line.strip()]
+    except (OSError, ValueError) as exc:
+        logger.warning(f"Ignoring unreadable chunk overlay {path}: {exc}")
+        return None
+
+
+def _chunk_entry_pages(entry: Dict[str, Any]) -> List[int]:
+    """Pages a chunk is drawn on (same precedence as chunkPages() in the UI)."""
+    if entry.get("page_bboxes"):
+        return [pb["page_trimmed"] for pb in entry["page_bboxes"] if pb.get("page_trimmed") is not None]
+    box = entry.get("segment_bbox") or entry.get("bbox")
+    if box and box.get("page_trimmed") is not None:
+        return [box["page_trimmed"]]
+    page = (entry.get("metadata") or {}).get("page_number")
+    return [page] if page is not None else []
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _chunk_file_summary(path: Path) -> Dict[str, Any]:
+    """Summary stats, line spans and overlays (or full table HTML) for a chunks file.
+
+    Cached per file version (chunks file, its sibling elements file and the
+    overlay sidecar), so windowed requests only seek to and build the chunks
+    they return.
+    """
+    elements_path = path.with_name(path.name.replace(".chunks.jsonl", ".elements.jsonl"))
+    stamp = (_file_stamp(path), _file_stamp(elements_path), _file_stamp(overlay_path(path)))
+    key = str(path)
+    with _SUMMARY_CACHE_LOCK:
+        cached = _SUMMARY_CACHE.get(key)
+        if cached and cached["stamp"] == stamp:
+            _SUMMARY_CACHE.move_to_end(key)
+            return cached
+
+    spans: List[Tuple[int, int]] = []
     count = 0
     total = 0
     min_len: Optional[int] = None
     max_len: Optional[int] = None
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            text = obj.get("text") or ""
-            length = len(text)
-            count += 1
-            total += length
-            min_len = length if min_len is None else min(min_len, length)
-            max_len = length if max_len is None else max(max_len, length)
-            meta = obj.get("metadata") or {}
-            orig_boxes: List[Dict[str, Any]] = []
-            orig_table_html: Optional[str] = None
-            orig_html_is_table = False
-            try:
-                decoded = decode_orig_elements(meta)
-            except Exception:
-                decoded = []
-            for el in decoded:
-                md = el.get("metadata") or {}
-                # Capture table HTML regardless of coordinates.
-                # Prefer the full table from the elements file (split chunks
-                # only carry partial HTML after the PaC metadata-copy fix).
-                eid = el.get("element_id")
-                full_html = full_table_htmls.get(eid) if eid else None
-                html_candidate = full_html or md.get("text_as_html") or el.get("text_as_html")
-                if html_candidate:
-                    is_table = "table" in (el.get("type") or "").lower()
-                    if not orig_table_html or (is_table and not orig_html_is_table):
-                        orig_table_html = html_candidate
-                        orig_html_is_table = is_table
-                coords = (md.get("coordinates") or {})
-                pts = coords.get("points") or []
-                if not pts:
-                    continue
-                xs = [p[0] for p in pts]
-                ys = [p[1] for p in pts]
-                x = min(xs)
-                y = min(ys)
-                w = max(xs) - x
-                h = max(ys) - y
-                page_trimmed = md.get("page_number") or (md.get("page_numbers") or [None])[0]
-                box_entry = {
-                    "page_trimmed": page_trimmed,
-                    "layout_w": coords.get("layout_width"),
-                    "layout_h": coords.get("layout_height"),
-                    "x": x,
-                    "y": y,
-                    "w": w,
-                    "h": h,
-                    "type": el.get("type") or md.get("category"),
-                    "element_id": el.get("element_id"),
-                    "orig_id": md.get("original_element_id"),
-                }
-                orig_boxes.append(box_entry)
-            bbox = None
-            try:
-                ccoords = (meta.get("coordinates") or {})
-                pts = ccoords.get("points") or []
-                if pts:
-                    xs = [p[0] for p in pts]
-                    ys = [p[1] for p in pts]
-                    x = min(xs)
-                    y = min(ys)
-                    w = max(xs) - x
-                    h = max(ys) - y
-                    page_trimmed = meta.get("page_number") or (meta.get("page_numbers") or [None])[0]
-                    bbox = {
-                        "page_trimmed": page_trimmed,
-                        "layout_w": ccoords.get("layout_width"),
-                        "layout_h": ccoords.get("layout_height"),
-                        "x": x,
-                        "y": y,
-                        "w": w,
-                        "h": h,
-                    }
-            except Exception:
-                bbox = None
-            segment_bbox = None
-            segment_span_info: Optional[Tuple[int, int, int]] = None
-            if orig_table_html:
-                reference_bbox = _pick_table_bbox(orig_boxes) or bbox
-                seg_info = _compute_table_segment(meta, obj, orig_table_html, reference_bbox)
-                if seg_info:
-                    segment_bbox, span, total_rows = seg_info
-                    segment_span_info = (span[0], span[1], total_rows)
-                    if segment_bbox and reference_bbox and not segment_bbox.get("page_trimmed"):
-                        segment_bbox["page_trimmed"] = reference_bbox.get("page_trimmed")
-            # Handle multi-page bboxes (page_bboxes field from chunker)
-            page_bboxes_simplified: Optional[List[Dict[str, Any]]] = None
-            raw_page_bboxes = meta.get("page_bboxes")
-            if raw_page_bboxes:
-                page_bboxes_simplified = []
-                for pb in raw_page_bboxes:
-                    pb_coords = pb.get("coordinates") or {}
-                    pb_pts = pb_coords.get("points") or []
-                    if pb_pts:
-                        pb_xs = [p[0] for p in pb_pts]
-                        pb_ys = [p[1] for p in pb_pts]
-                        page_bboxes_simplified.append({
-                            "page_trimmed": pb.get("page_number"),
-                            "layout_w": pb_coords.get("layout_width"),
-                            "layout_h": pb_coords.get("layout_height"),
-                            "x": min(pb_xs),
-                            "y": min(pb_ys),
-                            "w": max(pb_xs) - min(pb_xs),
-                            "h": max(pb_ys) - min(pb_ys),
-                        })
-
-            chunk_entry: Dict[str, Any] = {
-                "element_id": obj.get("element_id"),
-                "text": text,
-                "char_len": length,
-                "type": obj.get("type"),
-                "metadata": meta,
-                "orig_boxes": orig_boxes,
-                "bbox": bbox,
-            }
-            if page_bboxes_simplified:
-                chunk_entry["page_bboxes"] = page_bboxes_simplified
-            if segment_bbox:
-                chunk_entry["segment_bbox"] = segment_bbox
-            if segment_span_info:
-                start_idx, end_idx, total_rows = segment_span_info
-                chunk_entry["segment_row_span"] = {
-                    "start": start_idx,
-                    "end": end_idx,
-                    "total": total_rows,
-                }
-            chunks.append(chunk_entry)
+    for start, length, obj in iter_jsonl_spans(path):
+        text_len = len(obj.get("text") or "")
+        count += 1
+        total += text_len
+        min_len = text_len if min_len is None else min(min_len, text_len)
+        max_len = text_len if max_len is None else max(max_len, text_len)
+        spans.append((start, length))
     summary = {
         "count": count,
         "total_chars": total,
@@ -214,7 +318,98 @@ def api_chunks(slug: str, provider: str = Query(default=None)) -> Dict[str, Any]
         "max_chars": max_len or 0,
         "avg_chars": (total / count) if count else 0,
     }
-    return {"summary": summary, "chunks": chunks}
+    overlays = _load_chunk_overlay(path)
+    if overlays is not None and len(overlays) != len(spans):
+        overlays = None
+    cached = {
+        "stamp": stamp,
+        "summary": summary,
+        "spans": spans,
+        # Table HTML only feeds overlays computed on the fly, so skip scanning
+        # the elements file when the sidecar already has them
+        "table_htmls": _load_full_table_htmls(path) if overlays is None else {},
+        "overlays": overlays,
+        # Filled on the first page-filtered request unless the overlay sidecar has them
+        "pages": [o.get("pages") or [] for o in overlays] if overlays is not None else None,
+    }
+    with _SUMMARY_CACHE_LOCK:
+        _SUMMARY_CACHE[key] = cached
+        _SUMMARY_CACHE.move_to_end(key)
+        while len(_SUMMARY_CACHE) > _SUMMARY_CACHE_SIZE:
+            _SUMMARY_CACHE.popitem(last=False)
+    return cached
+
+
+def _chunk_pages(path: Path, cached: Dict[str, Any]) -> List[List[int]]:
+    """Pages each chunk is drawn on; needs every entry built once per file version."""
+    pages = cached.get("pages")
+    if pages is None:
+        pages = [
+            _chunk_entry_pages(_build_chunk_entry(obj, cached["table_htmls"]))
+            for _, _, obj in iter_jsonl_spans(path)
+        ]
+        cached["pages"] = pages
+    return pages
+
+
+def _parse_field_list(raw: Optional[str]) -> Optional[set]:
+    if not raw:
+        return None
+    fields = {f.strip() for f in raw.split(",") if f.strip()}
+    return fields or None
+
+
+def _project_chunk(entry: Dict[str, Any], fields: Optional[set], omit: Optional[set]) -> Dict[str, Any]:
+    if fields:
+        entry = {k: v for k, v in entry.items() if k in fields or k == "element_id"}
+    if omit:
+        entry = {k: v for k, v in entry.items() if k not in omit}
+    return entry
+
+
+@router.get("/api/chunks/{slug}")
+def api_chunks(
+    slug: str,
+    provider: str = Query(default=None),
+    offset: int = Query(default=0, ge=0, description="Index of the first chunk to return (after page filtering)"),
+    limit: Optional[int] = Query(default=None, ge=1, description="Maximum chunks to return; omit for all"),
+    page: Optional[int] = Query(default=None, ge=1, description="Only chunks drawn on this trimmed page"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated chunk fields to return"),
+    omit: Optional[str] = Query(default=None, description="Comma-separated chunk fields to drop (e.g. metadata)"),
+) -> Dict[str, Any]:
+    path = _resolve_chunk_file(slug, provider or DEFAULT_PROVIDER)
+    cached = _chunk_file_summary(path)
+    full_table_htmls = cached["table_htmls"]
+    overlays = cached["overlays"]
+    positions = list(range(len(cached["spans"])))
+    if page is not None:
+        chunk_pages = _chunk_pages(path, cached)
+        positions = [i for i in positions if page in chunk_pages[i]]
+    window = positions[offset : offset + limit] if limit else positions[offset:]
+
+    fields_set = _parse_field_list(fields)
+    omit_set = _parse_field_list(omit)
+    chunks: List[Dict[str, Any]] = []
+    records = read_records(path, [cached["spans"][i] for i in window])
+    for i, obj in zip(window, records):
+        if obj is None:
+            # File rewritten since it was scanned; rescan on the next request
+            with _SUMMARY_CACHE_LOCK:
+                _SUMMARY_CACHE.pop(str(path), None)
+            continue
+        overlay = overlays[i] if overlays is not None else None
+        entry = _build_chunk_entry(obj, full_table_htmls, overlay)
+        chunks.append(_project_chunk(entry, fields_set, omit_set))
+
+    next_offset = offset + len(window)
+    return {
+        "summary": cached["summary"],
+        "chunks": chunks,
+        "total": len(positions),
+        "offset": offset,
+        "limit": limit,
+        "next_offset": next_offset if next_offset < len(positions) else None,
+    }
 
 
 class _TableHTMLParser(HTMLParser):
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import json
 import base64
 import logging
 import mimetypes
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -11,12 +12,19 @@ from fastapi import APIRouter, HTTPException, Query
 
 from src.extractors.section_based_chunker import decode_orig_elements
 
-from ..config import DEFAULT_PROVIDER, get_out_dir
+from chunking_pipeline.jsonl_reader import iter_jsonl_spans, read_record
+
+from ..blob_store import store_blob_bytes, store_blob_file
+from ..config import DEFAULT_PROVIDER, ELEMENT_INDEX_CACHE_SIZE, get_out_dir
+from ..element_index import ElementIndex, load_element_index, write_element_index
+from ..element_store import load_element_columns
 from ..file_utils import resolve_slug_file
 
 router = APIRouter()
 logger = logging.getLogger("chunking.routes.elements")
-_INDEX_CACHE: Dict[str, Dict[str, Any]] = {}
+# LRU of parsed indexes; the persistent copy lives in the .idx sidecar files
+_INDEX_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_INDEX_CACHE_LOCK = threading.Lock()
 
 
 def _cache_key(slug: str, provider: str) -> str:
@@ -24,7 +32,8 @@ def _cache_key(slug: str, provider: str) -> str:
 
 
 def clear_index_cache(slug: str, provider: str) -> None:
-    _INDEX_CACHE.pop(_cache_key(slug, provider), None)
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE.pop(_cache_key(slug, provider), None)
 
 
 def _resolve_elements_or_chunks_file(slug: str, provider: str) -> Tuple[Path, bool]:
@@ -53,64 +62,111 @@ def _resolve_elements_or_chunks_file(slug: str, provider: str) -> Tuple[Path, bo
     )
 
 
-def _index_from_elements_file(path: Path) -> Tuple[Dict[str, Dict[str, Any]], Dict[int, List[str]], Dict[str, int]]:
-    """Build index from a v5.0+ elements.jsonl file."""
+def _record_offset(offsets: Dict[str, Tuple[int, int]], start: int, length: int, *ids: Any) -> None:
+    """Map element ids (and original ids) to the byte span of the line holding them; first line wins."""
+    for key in ids:
+        if key and isinstance(key, str):
+            offsets.setdefault(key, (start, length))
+
+
+_STORE_INDEX_COLUMNS = (
+    "element_id", "original_element_id", "type", "page",
+    "x", "y", "w", "h", "layout_w", "layout_h", "json_offset", "json_length",
+)
+
+
+def _index_from_element_store(path: Path) -> Optional[ElementIndex]:
+    """Build index from the Parquet copy of an elements file; ``None`` if there is none."""
+    rows = load_element_columns(path, _STORE_INDEX_COLUMNS)
+    if rows is None:
+        return None
     by_id: Dict[str, Dict[str, Any]] = {}
     by_page: Dict[int, List[str]] = {}
     type_counts: Dict[str, int] = {}
+    offsets: Dict[str, Tuple[int, int]] = {}
     order_idx = 0
 
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    for row in rows:
+        element_id = row["element_id"]
+        el_type = row["type"] or "Unknown"
+        _record_offset(offsets, row["json_offset"], row["json_length"], element_id, row["original_element_id"])
+        if not element_id:
+            continue
+        page_trimmed = row["page"]
+        by_id[element_id] = {
+            "page_trimmed": page_trimmed,
+            "layout_w": row["layout_w"],
+            "layout_h": row["layout_h"],
+            "x": row["x"] if row["x"] is not None else 0,
+            "y": row["y"] if row["y"] is not None else 0,
+            "w": row["w"] if row["w"] is not None else 0,
+            "h": row["h"] if row["h"] is not None else 0,
+            "type": el_type,
+            "orig_id": row["original_element_id"],
+            "order": order_idx,
+        }
+        order_idx += 1
+        if page_trimmed is not None:
+            by_page.setdefault(page_trimmed, []).append(element_id)
+        type_counts[el_type] = type_counts.get(el_type, 0) + 1
 
-            element_id = obj.get("element_id")
-            el_type = obj.get("type") or "Unknown"
-            md = obj.get("metadata", {})
-            coords = md.get("coordinates") or {}
-            pts = coords.get("points") or []
-            if not element_id:
-                continue
-            x = y = w = h = None
-            if pts:
-                xs = [p[0] for p in pts]
-                ys = [p[1] for p in pts]
-                x = min(xs)
-                y = min(ys)
-                w = max(xs) - x
-                h = max(ys) - y
-            page_trimmed = (
-                obj.get("page_number")
-                or md.get("page_number")
-                or (md.get("page_numbers") or [None])[0]
-            )
-            by_id[element_id] = {
-                "page_trimmed": page_trimmed,
-                "layout_w": coords.get("layout_width"),
-                "layout_h": coords.get("layout_height"),
-                "x": x if x is not None else 0,
-                "y": y if y is not None else 0,
-                "w": w if w is not None else 0,
-                "h": h if h is not None else 0,
-                "type": el_type,
-                "orig_id": md.get("original_element_id"),
-                "order": order_idx,
-            }
-            order_idx += 1
-            if isinstance(page_trimmed, int):
-                by_page.setdefault(page_trimmed, []).append(element_id)
-            type_counts[el_type] = type_counts.get(el_type, 0) + 1
+    return by_id, by_page, type_counts, offsets
+
+
+def _index_from_elements_file(path: Path) -> ElementIndex:
+    """Build index from a v5.0+ elements.jsonl file (or its Parquet copy)."""
+    from_store = _index_from_element_store(path)
+    if from_store is not None:
+        return from_store
+    by_id: Dict[str, Dict[str, Any]] = {}
+    by_page: Dict[int, List[str]] = {}
+    type_counts: Dict[str, int] = {}
+    offsets: Dict[str, Tuple[int, int]] = {}
+    order_idx = 0
+
+    for start, length, obj in iter_jsonl_spans(path):
+        element_id = obj.get("element_id")
+        el_type = obj.get("type") or "Unknown"
+        md = obj.get("metadata", {})
+        coords = md.get("coordinates") or {}
+        pts = coords.get("points") or []
+        _record_offset(offsets, start, length, element_id, md.get("original_element_id"))
+        if not element_id:
+            continue
+        x = y = w = h = None
+        if pts:
+            xs = [p[0] for p in pts]
+            ys = [p[1] for p in pts]
+            x = min(xs)
+            y = min(ys)
+            w = max(xs) - x
+            h = max(ys) - y
+        page_trimmed = (
+            obj.get("page_number")
+            or md.get("page_number")
+            or (md.get("page_numbers") or [None])[0]
+        )
+        by_id[element_id] = {
+            "page_trimmed": page_trimmed,
+            "layout_w": coords.get("layout_width"),
+            "layout_h": coords.get("layout_height"),
+            "x": x if x is not None else 0,
+            "y": y if y is not None else 0,
+            "w": w if w is not None else 0,
+            "h": h if h is not None else 0,
+            "type": el_type,
+            "orig_id": md.get("original_element_id"),
+            "order": order_idx,
+        }
+        order_idx += 1
+        if isinstance(page_trimmed, int):
+            by_page.setdefault(page_trimmed, []).append(element_id)
+        type_counts[el_type] = type_counts.get(el_type, 0) + 1
 
-    return by_id, by_page, type_counts
+    return by_id, by_page, type_counts, offsets
 
 
-def _index_from_chunks_file(path: Path) -> Tuple[Dict[str, Dict[str, Any]], Dict[int, List[str]], Dict[str, int]]:
+def _index_from_chunks_file(path: Path) -> ElementIndex:
     """Build index from a legacy chunks.jsonl file.
 
     Handles two formats:
@@ -120,72 +176,32 @@ def _index_from_chunks_file(path: Path) -> Tuple[Dict[str, Dict[str, Any]], Dict
     by_id: Dict[str, Dict[str, Any]] = {}
     by_page: Dict[int, List[str]] = {}
     type_counts: Dict[str, int] = {}
+    offsets: Dict[str, Tuple[int, int]] = {}
     seen_element_ids: set = set()
 
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                chunk = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            meta = chunk.get("metadata") or {}
-
-            # Try to decode orig_elements first (Unstructured chunker format)
-            try:
-                orig_elements = decode_orig_elements(meta)
-            except Exception:
-                orig_elements = []
-
-            if orig_elements:
-                # Process embedded original elements
-                for el in orig_elements:
-                    element_id = el.get("element_id")
-                    if not element_id or element_id in seen_element_ids:
-                        continue
-                    seen_element_ids.add(element_id)
-
-                    el_type = el.get("type") or "Unknown"
-                    md = el.get("metadata") or {}
-                    coords = md.get("coordinates") or {}
-                    pts = coords.get("points") or []
-
-                    x = y = w = h = None
-                    if pts:
-                        xs = [p[0] for p in pts]
-                        ys = [p[1] for p in pts]
-                        x = min(xs)
-                        y = min(ys)
-                        w = max(xs) - x
-                        h = max(ys) - y
-
-                    page_trimmed = md.get("page_number") or (md.get("page_numbers") or [None])[0]
-                    by_id[element_id] = {
-                        "page_trimmed": page_trimmed,
-                        "layout_w": coords.get("layout_width"),
-                        "layout_h": coords.get("layout_height"),
-                        "x": x if x is not None else 0,
-                        "y": y if y is not None else 0,
-                        "w": w if w is not None else 0,
-                        "h": h if h is not None else 0,
-                        "type": el_type,
-                        "orig_id": md.get("original_element_id"),
-                    }
-                    if isinstance(page_trimmed, int):
-                        by_page.setdefault(page_trimmed, []).append(element_id)
-                    type_counts[el_type] = type_counts.get(el_type, 0) + 1
-            else:
-                # Treat chunk as a direct element (Azure DI legacy format)
-                element_id = chunk.get("element_id")
+    for start, length, chunk in iter_jsonl_spans(path):
+        meta = chunk.get("metadata") or {}
+
+        # Try to decode orig_elements first (Unstructured chunker format)
+        try:
+            orig_elements = decode_orig_elements(meta)
+        except Exception:
+            orig_elements = []
+
+        if orig_elements:
+            # Process embedded original elements
+            for el in orig_elements:
+                element_id = el.get("element_id")
+                _record_offset(
+                    offsets, start, length, element_id, (el.get("metadata") or {}).get("original_element_id")
+                )
                 if not element_id or element_id in seen_element_ids:
                     continue
                 seen_element_ids.add(element_id)
 
-                el_type = chunk.get("type") or "Unknown"
-                coords = meta.get("coordinates") or {}
+                el_type = el.get("type") or "Unknown"
+                md = el.get("metadata") or {}
+                coords = md.get("coordinates") or {}
                 pts = coords.get("points") or []
 
                 x = y = w = h = None
@@ -197,11 +213,7 @@ def _index_from_chunks_file(path: Path) -> Tuple[Dict[str, Dict[str, Any]], Dict
                     w = max(xs) - x
                     h = max(ys) - y
 
-                page_trimmed = (
-                    chunk.get("page_number")
-                    or meta.get("page_number")
-                    or (meta.get("page_numbers") or [None])[0]
-                )
+                page_trimmed = md.get("page_number") or (md.get("page_numbers") or [None])[0]
                 by_id[element_id] = {
                     "page_trimmed": page_trimmed,
                     "layout_w": coords.get("layout_width"),
@@ -211,36 +223,96 @@ def _index_from_chunks_file(path: Path) -> Tuple[Dict[str, Dict[str, Any]], Dict
                     "w": w if w is not None else 0,
                     "h": h if h is not None else 0,
                     "type": el_type,
-                    "orig_id": meta.get("original_element_id"),
+                    "orig_id": md.get("original_element_id"),
                 }
                 if isinstance(page_trimmed, int):
                     by_page.setdefault(page_trimmed, []).append(element_id)
                 type_counts[el_type] = type_counts.get(el_type, 0) + 1
+        else:
+            # Treat chunk as a direct element (Azure DI legacy format)
+            element_id = chunk.get("element_id")
+            _record_offset(offsets, start, length, element_id, meta.get("original_element_id"))
+            if not element_id or element_id in seen_element_ids:
+                continue
+            seen_element_ids.add(element_id)
 
-    return by_id, by_page, type_counts
+            el_type = chunk.get("type") or "Unknown"
+            coords = meta.get("coordinates") or {}
+            pts = coords.get("points") or []
+
+            x = y = w = h = None
+            if pts:
+                xs = [p[0] for p in pts]
+                ys = [p[1] for p in pts]
+                x = min(xs)
+                y = min(ys)
+                w = max(xs) - x
+                h = max(ys) - y
+
+            page_trimmed = (
+                chunk.get("page_number")
+                or meta.get("page_number")
+                or (meta.get("page_numbers") or [None])[0]
+            )
+            by_id[element_id] = {
+                "page_trimmed": page_trimmed,
+                "layout_w": coords.get("layout_width"),
+                "layout_h": coords.get("layout_height"),
+                "x": x if x is not None else 0,
+                "y": y if y is not None else 0,
+                "w": w if w is not None else 0,
+                "h": h if h is not None else 0,
+                "type": el_type,
+                "orig_id": meta.get("original_element_id"),
+            }
+            if isinstance(page_trimmed, int):
+                by_page.setdefault(page_trimmed, []).append(element_id)
+            type_counts[el_type] = type_counts.get(el_type, 0) + 1
+
+    return by_id, by_page, type_counts, offsets
+
+
+def build_element_index(path: Path, is_elements: Optional[bool] = None) -> ElementIndex:
+    """Parse an elements/chunks JSONL file and persist its ``.idx`` sidecar."""
+    if is_elements is None:
+        is_elements = path.name.endswith(".elements.jsonl")
+    if is_elements:
+        index = _index_from_elements_file(path)
+    else:
+        index = _index_from_chunks_file(path)
+    write_element_index(path, index)
+    return index
 
 
 def _ensure_index(slug: str, provider: str) -> Dict[str, Any]:
     key = _cache_key(slug, provider)
     path, is_elements = _resolve_elements_or_chunks_file(slug, provider)
     mtime = path.stat().st_mtime
-    cached = _INDEX_CACHE.get(key)
-    if cached and cached.get("mtime") == mtime and cached.get("path") == path:
-        return cached
+    with _INDEX_CACHE_LOCK:
+        cached = _INDEX_CACHE.get(key)
+        if cached and cached.get("mtime") == mtime and cached.get("path") == path:
+            _INDEX_CACHE.move_to_end(key)
+            return cached
 
-    if is_elements:
-        by_id, by_page, type_counts = _index_from_elements_file(path)
-    else:
-        by_id, by_page, type_counts = _index_from_chunks_file(path)
+    index = load_element_index(path)
+    if index is None:
+        index = build_element_index(path, is_elements)
+    by_id, by_page, type_counts, offsets = index
 
     cached = {
         "mtime": mtime,
         "path": path,
+        "is_elements": is_elements,
         "by_id": by_id,
         "by_page": by_page,
         "type_counts": type_counts,
+        "offsets": offsets,
     }
-    _INDEX_CACHE[key] = cached
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE[key] = cached
+        _INDEX_CACHE.move_to_end(key)
+        while len(_INDEX_CACHE) > ELEMENT_INDEX_CACHE_SIZE:
+            _INDEX_CACHE.popitem(last=False)
     return cached
 
 
@@ -291,83 +363,95 @@ def api_boxes(
     return result
 
 
-def _scan_element(
-    slug: str, element_id: str, provider: str, path: Optional[Path] = None
-) -> Tuple[Optional[Dict[str, Any]], Optional[Path]]:
-    if path:
-        target = path
-        is_elements = target.name.endswith(".elements.jsonl")
-    else:
-        target, is_elements = _resolve_elements_or_chunks_file(slug, provider)
+def _match_element(obj: Dict[str, Any], element_id: str, is_elements: bool) -> Optional[Dict[str, Any]]:
+    """Return the element in one JSONL record whose id or original id is ``element_id``."""
+    if is_elements:
+        # v5.0+ elements file - direct element lookup
+        md = obj.get("metadata") or {}
+        if obj.get("element_id") == element_id or md.get("original_element_id") == element_id:
+            return obj
+        return None
+
+    # Legacy chunks file - try orig_elements first, then direct element
+    meta = obj.get("metadata") or {}
+    try:
+        orig_elements = decode_orig_elements(meta)
+    except Exception:
+        orig_elements = []
+
+    if orig_elements:
+        for el in orig_elements:
+            el_md = el.get("metadata") or {}
+            if el.get("element_id") == element_id or el_md.get("original_element_id") == element_id:
+                return el
+        return None
+    # Direct element format (Azure DI legacy)
+    if obj.get("element_id") == element_id or meta.get("original_element_id") == element_id:
+        return obj
+    return None
 
-    with target.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
 
-            if is_elements:
-                # v5.0+ elements file - direct element lookup
-                md = obj.get("metadata") or {}
-                if obj.get("element_id") == element_id or md.get("original_element_id") == element_id:
-                    return obj, target
-            else:
-                # Legacy chunks file - try orig_elements first, then direct element
-                meta = obj.get("metadata") or {}
-                try:
-                    orig_elements = decode_orig_elements(meta)
-                except Exception:
-                    orig_elements = []
-
-                if orig_elements:
-                    for el in orig_elements:
-                        el_md = el.get("metadata") or {}
-                        if el.get("element_id") == element_id or el_md.get("original_element_id") == element_id:
-                            return el, target
-                else:
-                    # Direct element format (Azure DI legacy)
-                    if obj.get("element_id") == element_id or meta.get("original_element_id") == element_id:
-                        return obj, target
+def _scan_element(
+    slug: str, element_id: str, provider: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[Path]]:
+    """Look up one element by seeking to its line via the index's byte offsets."""
+    cache = _ensure_index(slug, provider)
+    target: Path = cache["path"]
+    span = cache.get("offsets", {}).get(element_id)
+    if span is None:
+        return None, target
+
+    obj = read_record(target, *span)
+    if obj is not None:
+        found = _match_element(obj, element_id, cache["is_elements"])
+        if found is not None:
+            return found, target
+    # The file changed under a stale index; drop it so the next request rebuilds
+    logger.warning(f"Element index for {slug} is out of date; rebuilding")
+    clear_index_cache(slug, provider)
     return None, target
 
 
 def _build_image_payload(md: Dict[str, Any], base_dir: Path) -> Dict[str, Any]:
+    """Point the element's image at a blob URL; inline it only if the blob store fails."""
     image_base64 = md.get("image_base64")
     image_mime_type = md.get("image_mime_type")
     image_url = md.get("image_url")
     image_path = md.get("image_path")
+    image_blob_url: Optional[str] = None
     image_data_uri: Optional[str] = None
     source: Optional[str] = None
 
     if image_base64:
-        image_data_uri = f"data:{image_mime_type or 'image/png'};base64,{image_base64}"
+        image_mime_type = image_mime_type or "image/png"
         source = "payload"
+        try:
+            image_blob_url = store_blob_bytes(base64.b64decode(image_base64), image_mime_type)
+        except ValueError:
+            pass
+        if image_blob_url is None:
+            image_data_uri = f"data:{image_mime_type};base64,{image_base64}"
     elif image_path:
         resolved = Path(image_path)
         if not resolved.is_absolute():
             resolved = base_dir / image_path
         if resolved.exists():
-            try:
-                blob = resolved.read_bytes()
-                mime = image_mime_type or mimetypes.guess_type(resolved.name)[0] or "application/octet-stream"
-                b64 = base64.b64encode(blob).decode("ascii")
-                image_data_uri = f"data:{mime};base64,{b64}"
-                source = "file"
-                image_mime_type = mime
-                image_base64 = b64
-                image_path = str(resolved)
-            except Exception:
-                pass
+            image_mime_type = image_mime_type or mimetypes.guess_type(resolved.name)[0] or "application/octet-stream"
+            image_path = str(resolved)
+            source = "file"
+            image_blob_url = store_blob_file(resolved, image_mime_type)
+            if image_blob_url is None:
+                try:
+                    b64 = base64.b64encode(resolved.read_bytes()).decode("ascii")
+                    image_data_uri = f"data:{image_mime_type};base64,{b64}"
+                except Exception:
+                    source = None
 
     return {
-        "image_base64": image_base64,
         "image_mime_type": image_mime_type,
         "image_url": image_url,
         "image_path": image_path,
+        "image_blob_url": image_blob_url,
         "image_data_uri": image_data_uri,
         "image_source": source,
     }
@@ -387,10 +471,10 @@ def api_element(slug: str, element_id: str, provider: str = Query(default=None))
             "expected_cols": None,
             "coordinates": {},
             "original_element_id": None,
-            "image_base64": None,
             "image_mime_type": None,
             "image_url": None,
             "image_path": None,
+            "image_blob_url": None,
             "image_data_uri": None,
         }
     md = obj.get("metadata", {})
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextvars
+import copy
 import json
 import logging
 import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 import fitz  # PyMuPDF
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from src.extractors.azure_di import (
     AzureDIConfig,
@@ -20,22 +27,51 @@ from src.extractors.azure_di import (
     slice_pdf,
 )
 
+from chunking_pipeline.azure_shards import (
+    AnalysisResult,
+    analyze_sharded,
+    element_page,
+    is_per_page_list,
+    merge_result_metadata,
+    renumber_element_pages,
+    restitch_elements,
+)
+
 from ..config import (
+    AZURE_DI_SHARD_MIN_PAGES,
+    AZURE_DI_SHARDS,
     DEFAULT_PROVIDER,
+    FIGURE_OCR_BATCH_SIZE,
+    FIGURE_OCR_MODE,
+    FIGURE_WORKERS,
     PROVIDERS,
     RES_DIR,
     get_out_dir,
     relative_to_root,
     safe_pages_tag,
 )
+from ..element_store import write_element_store
+from ..extraction_cache import (
+    extraction_cache_enabled,
+    extraction_cache_key,
+    file_digest,
+    load_cached_extraction,
+    load_cached_file,
+    store_cached_extraction,
+    store_cached_file,
+)
+from ..figure_crops import crop_figures, figure_text_positions
 from ..file_utils import get_file_type
-from ..extraction_jobs import EXTRACTION_JOB_MANAGER
-from .elements import clear_index_cache
+from ..extraction_jobs import EXTRACTION_JOB_MANAGER, PRIORITY_CLASSES
+from .elements import build_element_index, clear_index_cache
 from .reviews import review_file_path
 
 router = APIRouter()
 logger = logging.getLogger("chunking.routes.extractions")
 
+# Seconds between SSE keep-alive comments when a job is quiet.
+_JOB_EVENTS_HEARTBEAT_SECONDS = 15.0
+
 
 def _report_progress(
     metadata: Dict[str, Any],
@@ -45,9 +81,14 @@ def _report_progress(
     message: Optional[str] = None,
     stage: Optional[str] = None,
 ) -> None:
-    """Report progress for the current extraction job."""
+    """Report progress for the current extraction job.
+
+    Also the cancellation point for extraction callables: raises
+    ``JobCancelled`` once the job has been cancelled or hit a deadline.
+    """
     job_id = metadata.get("_job_id")
     if job_id:
+        EXTRACTION_JOB_MANAGER.raise_if_cancelled(job_id)
         EXTRACTION_JOB_MANAGER.update_progress(
             job_id, current=current, total=total, message=message, stage=stage
         )
@@ -125,8 +166,13 @@ def discover_extractions(provider: Optional[str] = None) -> List[Dict[str, Any]]
 
 
 @router.get("/api/extraction-jobs")
-def api_extraction_jobs() -> Dict[str, Any]:
-    return {"jobs": EXTRACTION_JOB_MANAGER.list_jobs()}
+def api_extraction_jobs(
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    status: Optional[str] = Query(default=None, description="Filter by status: queued, running, succeeded, failed"),
+) -> Dict[str, Any]:
+    jobs, total = EXTRACTION_JOB_MANAGER.list_jobs(limit=limit, offset=offset, status=status)
+    return {"jobs": jobs, "total": total, "limit": limit, "offset": offset}
 
 
 @router.get("/api/extraction-jobs/{job_id}")
@@ -137,6 +183,69 @@ def api_extraction_job_detail(job_id: str) -> Dict[str, Any]:
     return job
 
 
+def _sse_message(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.delete("/api/extraction-jobs/{job_id}")
+def api_cancel_extraction_job(job_id: str) -> Dict[str, Any]:
+    job = EXTRACTION_JOB_MANAGER.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/api/extraction-jobs/{job_id}/events")
+async def api_extraction_job_events(job_id: str, request: Request) -> StreamingResponse:
+    """Stream job updates as server-sent events.
+
+    Sends a ``snapshot`` of the job first, then ``progress`` events carrying
+    only the fields that changed, and a final ``done`` event with the full
+    record (including log tails) before closing.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue[Tuple[str, Dict[str, Any]]] = asyncio.Queue()
+
+    def on_event(event: str, data: Dict[str, Any]) -> None:
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+        except RuntimeError:  # event loop already closed
+            pass
+
+    # Subscribe before taking the snapshot so no update falls in between.
+    unsubscribe = EXTRACTION_JOB_MANAGER.subscribe(job_id, on_event)
+    snapshot = EXTRACTION_JOB_MANAGER.get_job(job_id)
+    if not snapshot:
+        unsubscribe()
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            yield _sse_message("snapshot", snapshot)
+            if snapshot.get("status") not in ("queued", "running"):
+                yield _sse_message("done", snapshot)
+                return
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(events.get(), timeout=_JOB_EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse_message(event, data)
+                if event == "done":
+                    return
+        finally:
+            unsubscribe()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/api/extractions")
 def api_extractions(provider: Optional[str] = Query(default=None)) -> List[Dict[str, Any]]:
     return discover_extractions(provider=provider)
@@ -146,11 +255,24 @@ def api_extractions(provider: Optional[str] = Query(default=None)) -> List[Dict[
 def api_delete_extraction(slug: str, provider: str = Query(default=DEFAULT_PROVIDER)) -> Dict[str, Any]:
     out_dir = get_out_dir(provider)
     removed: List[str] = []
-    patterns = [f"{slug}.elements.jsonl", f"{slug}.chunks.jsonl", f"{slug}.pdf", f"{slug}.extraction.json"]
+    patterns = [
+        f"{slug}.elements.jsonl",
+        f"{slug}.elements.idx",
+        f"{slug}.elements.parquet",
+        f"{slug}.chunks.jsonl",
+        f"{slug}.chunks.idx",
+        f"{slug}.chunks.overlay",
+        f"{slug}.pdf",
+        f"{slug}.extraction.json",
+    ]
     if ".pages" in slug:
         base, _, rest = slug.partition(".pages")
         patterns.append(f"{base}.pages{rest}.elements.jsonl")
+        patterns.append(f"{base}.pages{rest}.elements.idx")
+        patterns.append(f"{base}.pages{rest}.elements.parquet")
         patterns.append(f"{base}.pages{rest}.chunks.jsonl")
+        patterns.append(f"{base}.pages{rest}.chunks.idx")
+        patterns.append(f"{base}.pages{rest}.chunks.overlay")
         patterns.append(f"{base}.pages{rest}.pdf")
         patterns.append(f"{base}.pages{rest}.extraction.json")
     for globpat in patterns:
@@ -158,6 +280,11 @@ def api_delete_extraction(slug: str, provider: str = Query(default=DEFAULT_PROVI
             if p.exists():
                 p.unlink()
                 removed.append(relative_to_root(p))
+    # Chunker comparison outputs (POST /api/chunk/compare)
+    for variants_dir in out_dir.glob(f"{slug}.chunk_variants"):
+        if variants_dir.is_dir():
+            shutil.rmtree(variants_dir)
+            removed.append(relative_to_root(variants_dir))
     try:
         review_path = review_file_path(slug, provider=provider)
     except HTTPException:
@@ -240,84 +367,194 @@ EXTRACTABLE_PROVIDERS = {"azure/document_intelligence"}
 
 
 def _write_elements_jsonl(path: Path, elements: List[Dict[str, Any]]) -> None:
-    """Write elements to JSONL file."""
+    """Write elements to JSONL file, plus its columnar copy when pyarrow is installed."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
+    spans: List[Tuple[int, int]] = []
+    offset = 0
+    with path.open("wb") as fh:
         for el in elements:
-            fh.write(json.dumps(el, ensure_ascii=False) + "\n")
+            line = (json.dumps(el, ensure_ascii=False) + "\n").encode("utf-8")
+            fh.write(line)
+            spans.append((offset, len(line)))
+            offset += len(line)
+    write_element_store(path, elements, spans)
 
 
-def _write_extraction_metadata(path: Path, extraction_config: Dict[str, Any]) -> None:
-    """Write extraction configuration metadata to JSON file."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(extraction_config, fh, ensure_ascii=False, indent=2)
-        fh.write("\n")
+def _serialize_result_metadata(result_metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize extractor result metadata (Pydantic models included) to plain JSON types."""
+    serialized: Dict[str, Any] = {}
+    for key, val in result_metadata.items():
+        if isinstance(val, list):
+            serialized[key] = [item.model_dump() if hasattr(item, "model_dump") else item for item in val]
+        elif hasattr(val, "model_dump"):
+            serialized[key] = val.model_dump()
+        else:
+            serialized[key] = val
+    return serialized
 
 
-def _extract_figure_from_pdf(
-    pdf_path: Path,
-    page_number: int,
-    coordinates: Dict[str, Any],
-    dpi: int = 300,
-) -> Optional[bytes]:
-    """Extract a figure region from a PDF page as PNG bytes.
+# Bump when the layout of per-page cache entries changes; part of their cache key
+PAGE_ENTRY_VERSION = 3
 
-    Args:
-        pdf_path: Path to the PDF file
-        page_number: 1-indexed page number
-        coordinates: Dict with 'points' (4 corners) and layout dimensions
-        dpi: Resolution for rendering (default 300)
 
-    Returns:
-        PNG image bytes or None if extraction fails
+def _page_entry_metadata(result_metadata: Dict[str, Any], analyzed_page: int, element_count: int) -> Dict[str, Any]:
+    """Metadata for one page of an analysis: per-page lists filtered to that page, counts for one page."""
+    md: Dict[str, Any] = {}
+    for key, val in result_metadata.items():
+        if is_per_page_list(val):
+            md[key] = [dict(item, page_number=1) for item in val if item["page_number"] == analyzed_page]
+        else:
+            md[key] = val
+    if "page_count" in md:
+        md["page_count"] = 1
+    if "element_count" in md:
+        md["element_count"] = element_count
+    return md
+
+
+def _split_elements_by_page(
+    elements: List[Dict[str, Any]],
+    result_metadata: Dict[str, Any],
+    source_pages: List[int],
+) -> Dict[int, AnalysisResult]:
+    """Split an analysis of ``source_pages`` into per-page cache entries.
+
+    Page *i* of the analyzed PDF is ``source_pages[i - 1]``. Each element goes
+    to the entry of its first page, with page numbers rewritten relative to
+    that page (1 = the page itself, 2 = the next source page, ...), so an
+    element spanning pages stays whole and can be placed in any later range.
     """
-    try:
-        doc = fitz.open(pdf_path)
-        page_idx = page_number - 1
-        if page_idx < 0 or page_idx >= len(doc):
-            logger.warning(f"Page {page_number} out of range for {pdf_path}")
-            return None
+    analyzed_of = {page: idx for idx, page in enumerate(source_pages, start=1)}
+    by_page: Dict[int, List[Dict[str, Any]]] = {page: [] for page in source_pages}
+    for el in elements:
+        idx = element_page(el) or 1
+        source_page = source_pages[idx - 1] if 1 <= idx <= len(source_pages) else source_pages[0]
+        local = copy.deepcopy(el)
+        offsets = {
+            analyzed: page - source_page + 1
+            for analyzed, page in enumerate(source_pages, start=1)
+            if page >= source_page
+        }
+        renumber_element_pages(local, offsets, 1)
+        by_page[source_page].append(local)
+    return {
+        page: (page_elems, _page_entry_metadata(result_metadata, analyzed_of[page], len(page_elems)))
+        for page, page_elems in by_page.items()
+    }
 
-        page = doc[page_idx]
-        points = coordinates.get("points", [])
-        if len(points) < 4:
-            logger.warning(f"Invalid coordinates: {coordinates}")
-            return None
 
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        x0, y0 = min(xs), min(ys)
-        x1, y1 = max(xs), max(ys)
-
-        # Handle PixelSpace coordinate system (used for images converted to PDF)
-        # Azure DI returns coordinates in pixels, but fitz creates PDFs in points
-        # (at 72 DPI). High-DPI images (e.g., Retina screenshots at 144 DPI) result
-        # in a PDF that's half the pixel dimensions. We need to scale coordinates.
-        coord_system = coordinates.get("system", "")
-        layout_width = coordinates.get("layout_width")
-        layout_height = coordinates.get("layout_height")
-
-        if coord_system == "PixelSpace" and layout_width and layout_height:
-            # Scale coordinates from pixel space to PDF point space
-            scale_x = page.rect.width / layout_width
-            scale_y = page.rect.height / layout_height
-            x0, y0 = x0 * scale_x, y0 * scale_y
-            x1, y1 = x1 * scale_x, y1 * scale_y
-            logger.debug(
-                f"Scaled PixelSpace coords: scale=({scale_x:.3f}, {scale_y:.3f}), "
-                f"rect=({x0:.1f}, {y0:.1f}, {x1:.1f}, {y1:.1f})"
+def _merge_page_entries(
+    valid_pages: List[int],
+    page_entries: Dict[int, AnalysisResult],
+) -> AnalysisResult:
+    """Stitch per-page cache entries into one result for the trimmed PDF."""
+    trimmed_of = {page: idx for idx, page in enumerate(valid_pages, start=1)}
+    parts = []
+    metadata_parts = []
+    for trimmed_page, source_page in enumerate(valid_pages, start=1):
+        page_elems, page_md = page_entries[source_page]
+        # Relative page k lands on source page source_page + k - 1 if that page is in
+        # this range; pages outside it collapse onto the entry's own page
+        offsets = {page - source_page + 1: trimmed_of[page] for page in valid_pages if page >= source_page}
+        parts.append((copy.deepcopy(page_elems), offsets, trimmed_page))
+        metadata_parts.append({
+            key: [dict(item, page_number=trimmed_page) for item in val] if is_per_page_list(val) else val
+            for key, val in page_md.items()
+        })
+    elements = restitch_elements(parts)
+    metadata = merge_result_metadata(metadata_parts, len(elements), len(valid_pages))
+    return elements, metadata
+
+
+def _extract_pdf_pages_incremental(
+    metadata: Dict[str, Any],
+    *,
+    extractor: AzureDIExtractor,
+    config: AzureDIConfig,
+    input_file: Path,
+    trimmed_path: Path,
+    valid_pages: List[int],
+    page_cache_key: Optional[Callable[[int], Optional[str]]],
+    figures_output_dir: Optional[Path],
+    shards: int = 1,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Analyze the pages missing from the per-page cache and merge with cached ones.
+
+    With no cached pages this is a single Azure call on the trimmed PDF;
+    otherwise only the missing pages are sliced and sent, and the result is
+    stitched from page entries. Either way element ids are re-derived with
+    ``ensure_stable_element_id`` from the final page numbers. With
+    ``shards > 1`` the pages sent are analyzed as concurrent page shards.
+    """
+    page_entries: Dict[int, Tuple[List[Dict[str, Any]], Dict[str, Any]]] = {}
+    if page_cache_key:
+        for page in valid_pages:
+            key = page_cache_key(page)
+            entry = load_cached_extraction(key) if key else None
+            if entry is not None:
+                page_entries[page] = entry
+    missing = [page for page in valid_pages if page not in page_entries]
+
+    if missing:
+        if page_entries:
+            source_pdf = trimmed_path.with_name(f"{trimmed_path.stem}.missing.pdf")
+            EXTRACTION_JOB_MANAGER.run_cpu_bound(
+                slice_pdf, str(input_file), missing, str(source_pdf), warn_on_drop=False
             )
+            message = f"Sending {len(missing)} of {len(valid_pages)} pages to Azure Document Intelligence..."
+        else:
+            source_pdf = trimmed_path
+            message = "Sending to Azure Document Intelligence..."
+        _report_progress(metadata, stage="azure", message=message)
+
+        def _analyze(path: str) -> AnalysisResult:
+            # Shards run concurrently, so each gets its own client
+            shard_extractor = extractor if path == str(source_pdf) else AzureDIExtractor(config)
+            result = shard_extractor.extract(
+                path, options=AzureDIExtractOptions(figures_output_dir=figures_output_dir)
+            )
+            return [el.to_dict() for el in result.elements], _serialize_result_metadata(result.metadata)
 
-        clip = fitz.Rect(x0, y0, x1, y1)
-        zoom = dpi / 72.0
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, clip=clip)
-        doc.close()
-        return pix.tobytes("png")
-    except Exception as e:
-        logger.exception(f"Failed to extract figure from PDF: {e}")
-        return None
+        def _shard_done(done: int, total: int) -> None:
+            _report_progress(metadata, stage="azure", message=f"Analyzed {done} of {total} page shards")
+
+        try:
+            elems, result_metadata = analyze_sharded(
+                source_pdf,
+                len(missing),
+                _analyze,
+                shards=shards,
+                min_pages_per_shard=AZURE_DI_SHARD_MIN_PAGES,
+                on_shard_done=_shard_done,
+                run_cpu_bound=EXTRACTION_JOB_MANAGER.run_cpu_bound,
+            )
+        finally:
+            if source_pdf != trimmed_path:
+                source_pdf.unlink(missing_ok=True)
+        if page_cache_key:
+            for page, entry in _split_elements_by_page(elems, result_metadata, missing).items():
+                page_entries[page] = entry
+                key = page_cache_key(page)
+                if key:
+                    store_cached_extraction(key, *entry)
+        if len(missing) == len(valid_pages):
+            # Same id derivation as the stitched path, so a document gets the
+            # same element ids whether or not its pages came from the cache
+            identity = {page: page for page in range(1, len(valid_pages) + 1)}
+            return restitch_elements([(elems, identity, 1)]), result_metadata
+        logger.info(f"Reused {len(valid_pages) - len(missing)} cached pages for {input_file.name}; analyzed {missing}")
+    else:
+        _report_progress(metadata, stage="azure", message=f"All {len(valid_pages)} pages found in the page cache")
+
+    return _merge_page_entries(valid_pages, page_entries)
+
+
+def _write_extraction_metadata(path: Path, extraction_config: Dict[str, Any]) -> None:
+    """Write extraction configuration metadata to JSON file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(extraction_config, fh, ensure_ascii=False, indent=2)
+        fh.write("\n")
 
 
 def _convert_image_to_pdf(image_path: Path, out_dir: Path, slug_with_pages: str) -> Path:
@@ -477,6 +714,113 @@ def _convert_spreadsheet_to_pdf(
     return pdf_path
 
 
+class _FigureProgress:
+    """Thread-safe progress reporting for figures processed concurrently.
+
+    ``current`` is the number of figures whose vision steps have finished,
+    so the counter only moves forward while several figures are in flight.
+    """
+
+    def __init__(self, metadata: Dict[str, Any], total: int) -> None:
+        self.metadata = metadata
+        self.total = total
+        self.done = 0
+        self._lock = threading.Lock()
+
+    def report(self, message: str) -> None:
+        with self._lock:
+            current = self.done
+        _report_progress(self.metadata, current=current, total=self.total, message=message, stage="figures")
+
+    def finish(self, message: str) -> None:
+        with self._lock:
+            self.done += 1
+            current = self.done
+        _report_progress(self.metadata, current=current, total=self.total, message=message, stage="figures")
+
+
+def _process_figure_vision(
+    processor: Any,
+    el: Dict[str, Any],
+    image_path: Path,
+    figures_dir: Path,
+    run_id: Optional[str],
+    progress: _FigureProgress,
+    text_positions: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """Run OCR, SAM3 segmentation and mermaid extraction for one figure, updating ``el`` in place.
+
+    ``text_positions`` skips the per-figure OCR call when they were already
+    extracted in a batch.
+    """
+    element_id = el.get("element_id", "")
+    try:
+        ocr_text = el.get("content", "") or el.get("text", "")
+        if text_positions is None:
+            # Extract text positions from image using Azure DI (same as upload flow)
+            progress.report("Extracting text positions...")
+            text_positions = processor.extract_text_positions_from_image(image_path)
+        if text_positions:
+            logger.debug(
+                f"Extracted {len(text_positions)} text positions for {element_id}"
+            )
+
+        # Step 1: SAM3 segmentation (creates .sam3.json + .annotated.png)
+        progress.report("Running SAM3 segmentation...")
+        processor.segment_and_save(
+            image_path=image_path,
+            output_dir=figures_dir,
+            element_id=element_id,
+            ocr_text=ocr_text,
+            run_id=run_id,
+            text_positions=text_positions if text_positions else None,
+        )
+
+        # Step 2: Mermaid extraction (creates .json)
+        progress.report("Analyzing figure type...")
+        result = processor.extract_mermaid_and_save(
+            image_path=image_path,
+            output_dir=figures_dir,
+            element_id=element_id,
+            ocr_text=ocr_text,
+            run_id=run_id,
+            text_positions=text_positions if text_positions else None,
+        )
+
+        # Get the figure type for display
+        figure_type_raw = result.get("figure_type")
+        # Handle both enum and string values
+        if hasattr(figure_type_raw, "value"):
+            figure_type = figure_type_raw.value.lower()
+        elif figure_type_raw:
+            figure_type = str(figure_type_raw).replace("FigureType.", "").lower()
+        else:
+            figure_type = "unknown"
+
+        el["figure_processing"] = {
+            "figure_type": result.get("figure_type"),
+            "confidence": result.get("confidence"),
+            "processed_content": result.get("processed_content"),
+            "description": result.get("description"),
+            "step1_duration_ms": result.get("step1_duration_ms"),
+            "step2_duration_ms": result.get("step2_duration_ms"),
+        }
+        # Update element text with formatted figure understanding
+        # This ensures the chunk text includes the figure description
+        formatted_text = processor.format_understanding(result)
+        if formatted_text:
+            el["text"] = formatted_text
+            el["content"] = formatted_text
+
+        # Report completion with figure type (just the type, counter shown separately)
+        progress.finish(figure_type)
+        logger.info(f"Processed figure {element_id}: {result.get('figure_type')}")
+    except Exception as e:
+        logger.error(f"Vision processing failed for {element_id}: {e}")
+        el["figure_processing"] = {"error": str(e)}
+        progress.finish("failed")
+
+
 def _process_figures_after_extraction(
     elements: List[Dict[str, Any]],
     pdf_path: Path,
@@ -535,6 +879,19 @@ def _process_figures_after_extraction(
     # Ensure figures directory exists
     figures_dir.mkdir(parents=True, exist_ok=True)
 
+    # Crop every figure with coordinates in one pass over the PDF
+    crops = []
+    for el in figures:
+        md = el.get("metadata", {})
+        page_number = el.get("page_number") or md.get("page_number")
+        coordinates = md.get("coordinates", {})
+        if page_number and coordinates.get("points"):
+            crops.append((figures_dir / f"{el.get('element_id', '')}.png", page_number, coordinates))
+    if crops:
+        _report_progress(metadata, stage="figures", total=total_figures, message=f"Extracting {len(crops)} figure image{'s' if len(crops) > 1 else ''}...")
+    cropped = crop_figures(pdf_path, crops)
+
+    ready: List[Tuple[Dict[str, Any], Path]] = []
     figure_index = 0
     for el in elements:
         if el.get("type", "").lower() != "figure":
@@ -559,10 +916,10 @@ def _process_figures_after_extraction(
             logger.warning(f"Figure {element_id} missing page/coordinates and no base64_image, skipping")
             continue
 
-        # Extract figure from PDF or decode base64 image
+        # Figure cropped from the PDF above, or decode base64 image
+        image_path = figures_dir / f"{element_id}.png"
         if coordinates.get("points"):
-            png_bytes = _extract_figure_from_pdf(pdf_path, page_number, coordinates)
-            if not png_bytes:
+            if image_path not in cropped:
                 logger.warning(f"Failed to extract figure {element_id} from PDF")
                 continue
         else:
@@ -571,106 +928,49 @@ def _process_figures_after_extraction(
             except Exception as e:
                 logger.warning(f"Failed to decode base64 image for {element_id}: {e}")
                 continue
-
-        # Save extracted image
-        image_path = figures_dir / f"{element_id}.png"
-        image_path.write_bytes(png_bytes)
+            image_path.write_bytes(png_bytes)
 
         # Update element with image filename
         if "metadata" not in el:
             el["metadata"] = {}
         el["metadata"]["figure_image_filename"] = image_path.name
         logger.debug(f"Extracted figure {element_id} to {image_path}")
-
-        # Process through vision pipeline if available (two-step: segment then mermaid)
-        if vision_available and processor:
-            try:
-                ocr_text = el.get("content", "") or el.get("text", "")
-                # Extract text positions from image using Azure DI (same as upload flow)
-                _report_progress(
-                    metadata,
-                    current=figure_index,
-                    total=total_figures,
-                    message="Extracting text positions...",
-                    stage="figures",
-                )
-                text_positions = processor.extract_text_positions_from_image(image_path)
-                if text_positions:
-                    logger.debug(
-                        f"Extracted {len(text_positions)} text positions for {element_id}"
-                    )
-
-                # Step 1: SAM3 segmentation (creates .sam3.json + .annotated.png)
-                _report_progress(
-                    metadata,
-                    current=figure_index,
-                    total=total_figures,
-                    message="Running SAM3 segmentation...",
-                    stage="figures",
-                )
-                sam3_result = processor.segment_and_save(
-                    image_path=image_path,
-                    output_dir=figures_dir,
-                    element_id=element_id,
-                    ocr_text=ocr_text,
-                    run_id=run_id,
-                    text_positions=text_positions if text_positions else None,
-                )
-
-                # Step 2: Mermaid extraction (creates .json)
-                _report_progress(
-                    metadata,
-                    current=figure_index,
-                    total=total_figures,
-                    message="Analyzing figure type...",
-                    stage="figures",
-                )
-                result = processor.extract_mermaid_and_save(
-                    image_path=image_path,
-                    output_dir=figures_dir,
-                    element_id=element_id,
-                    ocr_text=ocr_text,
-                    run_id=run_id,
-                    text_positions=text_positions if text_positions else None,
-                )
-
-                # Get the figure type for display
-                figure_type_raw = result.get("figure_type")
-                # Handle both enum and string values
-                if hasattr(figure_type_raw, "value"):
-                    figure_type = figure_type_raw.value.lower()
-                elif figure_type_raw:
-                    figure_type = str(figure_type_raw).replace("FigureType.", "").lower()
-                else:
-                    figure_type = "unknown"
-
-                el["figure_processing"] = {
-                    "figure_type": result.get("figure_type"),
-                    "confidence": result.get("confidence"),
-                    "processed_content": result.get("processed_content"),
-                    "description": result.get("description"),
-                    "step1_duration_ms": result.get("step1_duration_ms"),
-                    "step2_duration_ms": result.get("step2_duration_ms"),
-                }
-                # Update element text with formatted figure understanding
-                # This ensures the chunk text includes the figure description
-                formatted_text = processor.format_understanding(result)
-                if formatted_text:
-                    el["text"] = formatted_text
-                    el["content"] = formatted_text
-
-                # Report completion with figure type (just the type, counter shown separately)
-                _report_progress(
-                    metadata,
-                    current=figure_index,
-                    total=total_figures,
-                    message=figure_type,
-                    stage="figures",
+        ready.append((el, image_path))
+
+    # Process through vision pipeline if available (two-step: segment then mermaid).
+    # The steps are remote calls, so figures run concurrently on a bounded pool.
+    if vision_available and processor and ready:
+        batch_positions: Dict[Path, List[Dict[str, Any]]] = {}
+        if FIGURE_OCR_MODE == "auto":
+            # Born-digital PDFs already carry the figure words; only OCR the rest
+            batch_positions = figure_text_positions(pdf_path, [c for c in crops if c[0] in cropped])
+            if batch_positions:
+                logger.info(f"Read text positions for {len(batch_positions)} figures from the PDF text layer")
+        remaining = [image_path for _, image_path in ready if image_path not in batch_positions]
+        if FIGURE_OCR_MODE in ("auto", "batch") and len(remaining) > 1:
+            _report_progress(metadata, stage="figures", total=total_figures, message=f"Extracting text positions for {len(remaining)} figures...")
+            batch_positions.update(
+                processor.extract_text_positions_batch(remaining, batch_size=FIGURE_OCR_BATCH_SIZE)
+            )
+        progress = _FigureProgress(metadata, total_figures)
+        workers = max(1, min(FIGURE_WORKERS, len(ready)))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="figure-vision")
+        try:
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    _process_figure_vision,
+                    processor, el, image_path, figures_dir, run_id, progress,
+                    batch_positions.get(image_path),
                 )
-                logger.info(f"Processed figure {element_id}: {result.get('figure_type')}")
-            except Exception as e:
-                logger.error(f"Vision processing failed for {element_id}: {e}")
-                el["figure_processing"] = {"error": str(e)}
+                for el, image_path in ready
+            ]
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        pool.shutdown(wait=True)
 
     return elements
 
@@ -697,14 +997,17 @@ def _execute_extraction(metadata: Dict[str, Any]) -> None:
         from src.extractors.spreadsheet import SpreadsheetExtractor
 
         result = SpreadsheetExtractor().extract(input_file)
+        elems = [el.to_dict() for el in result.elements]
+        result_metadata = _serialize_result_metadata(result.metadata)
         pages_for_config = "all"
 
         # Generate a rough PDF from the extracted tables for UI viewing
         _report_progress(metadata, stage="convert", message="Generating PDF preview...")
-        elems_for_pdf = [el.to_dict() for el in result.elements]
         slug_with_pages = metadata.get("slug_with_pages", "spreadsheet")
         out_dir = elements_path.parent
-        trimmed_path = _convert_spreadsheet_to_pdf(elems_for_pdf, out_dir, slug_with_pages)
+        trimmed_path = EXTRACTION_JOB_MANAGER.run_cpu_bound(
+            _convert_spreadsheet_to_pdf, elems, out_dir, slug_with_pages
+        )
 
     else:
         # Azure DI path for pdf/office/image
@@ -724,6 +1027,26 @@ def _execute_extraction(metadata: Dict[str, Any]) -> None:
         figures_output_dir = elements_path.parent if want_figures else None
         extractor = AzureDIExtractor(config)
 
+        # Result cache; bypassed when Azure must also download figure images,
+        # which a cached result would not reproduce.
+        use_cache = extraction_cache_enabled() and metadata.get("use_cache", True) and not want_figures
+        source_digest = file_digest(input_file) if use_cache else None
+        cache_hit = False
+
+        def _cache_key(pages_key: str) -> Optional[str]:
+            if not source_digest:
+                return None
+            return extraction_cache_key(
+                source_digest,
+                file_type=file_type,
+                pages=pages_key,
+                model_id=config.model_id,
+                api_version=config.api_version,
+                features=config.features,
+                outputs=config.outputs,
+                locale=config.locale,
+            )
+
         if file_type == "pdf":
             _report_progress(metadata, stage="prepare", message="Preparing PDF pages...")
             page_list = parse_pages(pages_str)
@@ -733,30 +1056,65 @@ def _execute_extraction(metadata: Dict[str, Any]) -> None:
             if dropped_pages:
                 logger.warning(f"Dropping out-of-range pages {dropped_pages}; document has {max_page} pages.")
 
-            slice_pdf(str(input_file), valid_pages, str(trimmed_path), warn_on_drop=False)
-            _report_progress(metadata, stage="azure", message="Sending to Azure Document Intelligence...")
-
-            extract_options = AzureDIExtractOptions(figures_output_dir=figures_output_dir)
-            result = extractor.extract(str(trimmed_path), options=extract_options)
+            EXTRACTION_JOB_MANAGER.run_cpu_bound(
+                slice_pdf, str(input_file), valid_pages, str(trimmed_path), warn_on_drop=False
+            )
             pages_for_config = ",".join(str(p) for p in valid_pages)
+            cache_key = _cache_key(pages_for_config)
+            cached = load_cached_extraction(cache_key) if cache_key else None
+            cache_hit = cached is not None
+            if cached is None:
+                cached = _extract_pdf_pages_incremental(
+                    metadata,
+                    extractor=extractor,
+                    config=config,
+                    input_file=input_file,
+                    trimmed_path=trimmed_path,
+                    valid_pages=valid_pages,
+                    page_cache_key=(lambda page: _cache_key(f"page:{page}:v{PAGE_ENTRY_VERSION}")) if source_digest else None,
+                    figures_output_dir=figures_output_dir,
+                    # Figure downloads are written per analysis, so they need a single call
+                    shards=1 if want_figures else int(metadata.get("shards") or AZURE_DI_SHARDS),
+                )
+                if cache_key:
+                    store_cached_extraction(cache_key, *cached)
 
         elif file_type == "office":
-            _report_progress(metadata, stage="convert", message="Converting Office document...")
-            logger.info(f"Processing Office document: {input_file.name}")
-            _report_progress(metadata, stage="azure", message="Sending to Azure Document Intelligence...")
-            extract_options = AzureDIExtractOptions(
-                figures_output_dir=figures_output_dir,
-                save_converted_pdf=trimmed_path,
-            )
-            result = extractor.extract(str(input_file), options=extract_options)
             pages_for_config = "all"
+            cache_key = _cache_key(pages_for_config)
+            cached = load_cached_extraction(cache_key) if cache_key else None
+            # The converted PDF comes out of the extractor, so a hit needs it cached too
+            if cached is not None and not (cache_key and load_cached_file(cache_key, ".pdf", trimmed_path)):
+                cached = None
+            cache_hit = cached is not None
+            if cached is None:
+                _report_progress(metadata, stage="convert", message="Converting Office document...")
+                logger.info(f"Processing Office document: {input_file.name}")
+                _report_progress(metadata, stage="azure", message="Sending to Azure Document Intelligence...")
+                extract_options = AzureDIExtractOptions(
+                    figures_output_dir=figures_output_dir,
+                    save_converted_pdf=trimmed_path,
+                )
+                result = extractor.extract(str(input_file), options=extract_options)
+                cached = ([el.to_dict() for el in result.elements], _serialize_result_metadata(result.metadata))
+                if cache_key:
+                    store_cached_extraction(cache_key, *cached)
+                    store_cached_file(cache_key, ".pdf", trimmed_path)
 
         elif file_type == "image":
-            _report_progress(metadata, stage="azure", message="Sending image to Azure Document Intelligence...")
-            logger.info(f"Processing image: {input_file.name}")
-            extract_options = AzureDIExtractOptions(figures_output_dir=figures_output_dir)
-            result = extractor.extract(str(input_file), options=extract_options)
             pages_for_config = "1"
+            cache_key = _cache_key(pages_for_config)
+            cached = load_cached_extraction(cache_key) if cache_key else None
+            if cached is None:
+                _report_progress(metadata, stage="azure", message="Sending image to Azure Document Intelligence...")
+                logger.info(f"Processing image: {input_file.name}")
+                extract_options = AzureDIExtractOptions(figures_output_dir=figures_output_dir)
+                result = extractor.extract(str(input_file), options=extract_options)
+                cached = ([el.to_dict() for el in result.elements], _serialize_result_metadata(result.metadata))
+                if cache_key:
+                    store_cached_extraction(cache_key, *cached)
+            else:
+                cache_hit = True
             _report_progress(metadata, stage="convert", message="Converting image to PDF...")
             slug_with_pages = metadata.get("slug_with_pages", "image")
             out_dir = elements_path.parent
@@ -765,8 +1123,10 @@ def _execute_extraction(metadata: Dict[str, Any]) -> None:
         else:
             raise ValueError(f"Unsupported file type: {file_type} for {input_file}")
 
-    # Convert elements to dict format for JSONL
-    elems = [el.to_dict() for el in result.elements]
+        if cache_hit:
+            logger.info(f"Extraction cache hit for {input_file.name} pages={pages_for_config}")
+            _report_progress(metadata, stage="azure", message="Reusing cached Azure Document Intelligence result")
+        elems, result_metadata = cached
 
     # Ensure every element has a stable ID (safety net for extractors that omit it)
     for el in elems:
@@ -823,16 +1183,9 @@ def _execute_extraction(metadata: Dict[str, Any]) -> None:
         extraction_config["languages"] = metadata["languages"]
 
     # Merge extraction metadata (detected languages, element count, etc.)
-    # Serialize Pydantic models (like DetectedLanguage) to dicts for JSON compatibility
-    for key, val in result.metadata.items():
-        if isinstance(val, list):
-            extraction_config[key] = [
-                item.model_dump() if hasattr(item, "model_dump") else item for item in val
-            ]
-        elif hasattr(val, "model_dump"):
-            extraction_config[key] = val.model_dump()
-        else:
-            extraction_config[key] = val
+    extraction_config.update(result_metadata)
+    if file_type != "spreadsheet" and cache_hit:
+        extraction_config["cached_result"] = True
 
     # Process figures: extract images from PDF and run vision pipeline if enabled
     # Only process if we have a PDF (trimmed_path exists)
@@ -854,6 +1207,7 @@ def _execute_extraction(metadata: Dict[str, Any]) -> None:
     # Write outputs
     _report_progress(metadata, stage="writing", message="Writing extraction results...")
     _write_elements_jsonl(elements_path, elems)
+    build_element_index(elements_path, is_elements=True)
     _write_extraction_metadata(meta_path, extraction_config)
 
     logger.info(f"Extraction complete: {len(elems)} elements written to {elements_path}")
@@ -877,6 +1231,20 @@ def api_extraction(payload: Dict[str, Any]) -> Dict[str, Any]:
     pages = str(payload.get("pages") or "").strip()
     if not doc_name:
         raise HTTPException(status_code=400, detail="Field 'pdf' is required")
+    # Scheduling hints; priority is inferred from the page count when omitted
+    priority = str(payload.get("priority") or "").strip().lower() or None
+    if priority and priority not in PRIORITY_CLASSES:
+        raise HTTPException(
+            status_code=400, detail=f"priority must be one of: {', '.join(PRIORITY_CLASSES)}"
+        )
+    submitter = str(payload.get("submitter") or "").strip() or None
+    shards_raw = payload.get("shards")
+    try:
+        shards = int(shards_raw) if shards_raw not in (None, "") else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="shards must be an integer")
+    if shards is not None and shards < 1:
+        raise HTTPException(status_code=400, detail="shards must be at least 1")
 
     # Detect file type early
     file_type = get_file_type(doc_name)
@@ -1051,6 +1419,10 @@ def api_extraction(payload: Dict[str, Any]) -> Dict[str, Any]:
         "raw_tag": raw_tag,
         "form_snapshot": payload.get("form_snapshot") or {},
         "provider": provider,
+        "priority": priority,
+        "submitter": submitter,
+        "use_cache": payload.get("use_cache", True) is not False,
+        "shards": shards,
         # Output paths (input_pdf key kept for backwards compatibility in _run_extraction)
         "input_pdf": str(input_file),
         "trimmed_path": str(trimmed_out),
@@ -8,7 +8,6 @@ EXPERIMENTAL: Depends on PolicyAsCode feature branch for full functionality.
 
 from __future__ import annotations
 
-import base64
 import io
 import json
 import logging
@@ -16,16 +15,22 @@ import mimetypes
 import shutil
 import tempfile
 import uuid
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import fitz  # PyMuPDF
 from fastapi import APIRouter, File, HTTPException, Query, UploadFile
 from fastapi.responses import FileResponse, Response
 from PIL import Image
 
+from chunking_pipeline.figure_cache import refresh_figure_cache
+from chunking_pipeline.jsonl_reader import iter_jsonl, load_jsonl, read_records
+
+from ..blob_store import store_blob_bytes
 from ..config import DEFAULT_PROVIDER, ROOT, get_out_dir
+from ..element_store import load_element_columns
+from ..figure_crops import crop_figure
 from ..file_utils import resolve_slug_file
 
 router = APIRouter()
@@ -60,61 +65,6 @@ def _resolve_pdf_file(slug: str, provider: str) -> Optional[Path]:
         return None
 
 
-def _extract_figure_from_pdf(
-    pdf_path: Path,
-    page_number: int,
-    coordinates: Dict[str, Any],
-    dpi: int = 300,
-) -> Optional[bytes]:
-    """Extract a figure region from a PDF page as PNG bytes.
-
-    Args:
-        pdf_path: Path to the PDF file
-        page_number: 1-indexed page number
-        coordinates: Dict with 'points' (4 corners) and layout dimensions
-        dpi: Resolution for rendering (default 300)
-
-    Returns:
-        PNG image bytes or None if extraction fails
-    """
-    try:
-        doc = fitz.open(pdf_path)
-        # Convert 1-indexed to 0-indexed
-        page_idx = page_number - 1
-        if page_idx < 0 or page_idx >= len(doc):
-            logger.warning(f"Page {page_number} out of range for {pdf_path}")
-            return None
-
-        page = doc[page_idx]
-
-        # Get coordinates - format is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-        points = coordinates.get("points", [])
-        if len(points) < 4:
-            logger.warning(f"Invalid coordinates: {coordinates}")
-            return None
-
-        # Extract bounding box from corner points
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        x0, y0 = min(xs), min(ys)
-        x1, y1 = max(xs), max(ys)
-
-        # Create clip rectangle (coordinates are in PDF points)
-        clip = fitz.Rect(x0, y0, x1, y1)
-
-        # Render the clipped region
-        zoom = dpi / 72.0  # PDF default is 72 dpi
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, clip=clip)
-
-        doc.close()
-        return pix.tobytes("png")
-
-    except Exception as e:
-        logger.exception(f"Failed to extract figure from PDF: {e}")
-        return None
-
-
 def _resolve_elements_file(slug: str, provider: str) -> Path:
     """Resolve elements JSONL file for a given slug."""
     try:
@@ -133,19 +83,17 @@ def _resolve_elements_file(slug: str, provider: str) -> Path:
 
 def _load_figures_from_elements(elements_path: Path) -> List[Dict[str, Any]]:
     """Load figure elements from an elements JSONL file."""
-    figures = []
-    with elements_path.open("r", encoding="utf-8") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                el = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if el.get("type", "").lower() == "figure":
-                figures.append(el)
-    return figures
+    # Columnar copy: scan the type column, then decode only the figure lines
+    rows = load_element_columns(elements_path, ("json_offset", "json_length"), types=("figure",))
+    if rows is not None:
+        spans = [(r["json_offset"], r["json_length"]) for r in rows]
+        return [el for el in read_records(elements_path, spans) if el is not None]
+    # Raw-line prefilter: only lines mentioning a figure are decoded
+    return [
+        el
+        for el in iter_jsonl(elements_path, contains=("igure", "IGURE"))
+        if el.get("type", "").lower() == "figure"
+    ]
 
 
 def _get_figures_dir(elements_path: Path) -> Path:
@@ -180,18 +128,7 @@ def _load_sam3_result(figures_dir: Path, element_id: str) -> Optional[Dict[str,
 
 def _load_all_elements(elements_path: Path) -> List[Dict[str, Any]]:
     """Load all elements from an elements JSONL file."""
-    elements = []
-    with elements_path.open("r", encoding="utf-8") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                el = json.loads(line)
-                elements.append(el)
-            except json.JSONDecodeError:
-                continue
-    return elements
+    return load_jsonl(elements_path)
 
 
 def _get_bbox_from_coordinates(coordinates: Dict[str, Any]) -> Optional[tuple]:
@@ -245,19 +182,6 @@ def _boxes_overlap(
     return True
 
 
-def _image_to_data_uri(image_path: Path) -> Optional[str]:
-    """Convert an image file to a data URI."""
-    if not image_path.exists():
-        return None
-    try:
-        mime_type = mimetypes.guess_type(image_path.name)[0] or "image/png"
-        data = image_path.read_bytes()
-        b64 = base64.b64encode(data).decode("ascii")
-        return f"data:{mime_type};base64,{b64}"
-    except IOError:
-        return None
-
-
 # =============================================================================
 # Upload Routes (must come BEFORE {slug} routes to avoid path conflicts)
 # =============================================================================
@@ -315,16 +239,15 @@ async def api_figure_upload(
     with meta_path.open("w", encoding="utf-8") as fh:
         json.dump(metadata, fh, ensure_ascii=False, indent=2)
 
-    # Include base64 of original image for display
-    b64 = base64.b64encode(content).decode("ascii")
-    data_uri = f"data:{content_type};base64,{b64}"
+    # Display URL for the original image; the route still serves it if the blob store fails
+    image_url = store_blob_bytes(content, content_type) or f"/api/figures/upload/{upload_id}/image/original"
 
     return {
         "status": "ok",
         "stage": "uploaded",
         "upload_id": upload_id,
         "filename": file.filename,
-        "original_image_data_uri": data_uri,
+        "original_image_url": image_url,
     }
 
 
@@ -930,6 +853,7 @@ def api_upload_extract_mermaid(upload_id: str) -> Dict[str, Any]:
 def api_upload_reprocess(
     upload_id: str,
     force_type: Optional[str] = Query(default=None, description="Force figure type: 'flowchart' or 'other'. If not provided, runs auto-classification."),
+    refresh: bool = Query(default=False, description="Recompute every vision step instead of reusing cached results for this image."),
 ) -> Dict[str, Any]:
     """Reprocess an uploaded image with optional forced type.
 
@@ -949,160 +873,26 @@ def api_upload_reprocess(
 
     upload_dir = _get_upload_dir(upload_id)
 
-    try:
-        from chunking_pipeline.figure_processor import get_processor
-
-        processor = get_processor()
-
-        if force_type == "flowchart":
-            # Forced flowchart pipeline: Direction → SAM3 → Mermaid
-            # Save forced classification
-            classification_data = {
-                "figure_type": "flowchart",
-                "confidence": 1.0,
-                "reasoning": "Type forced to flowchart by user",
-                "classified_at": datetime.now(timezone.utc).isoformat(),
-            }
-            classification_path = upload_dir / "classification.json"
-            with classification_path.open("w", encoding="utf-8") as fh:
-                json.dump(classification_data, fh, ensure_ascii=False, indent=2)
-
-            # Run direction detection
-            direction_result = processor.detect_direction_only(image_path, run_id=f"upload-{upload_id}")
-            direction_data = {
-                "direction": direction_result.get("direction"),
-                "direction_duration_ms": direction_result.get("direction_duration_ms"),
-                "detected_at": datetime.now(timezone.utc).isoformat(),
-            }
-            direction_path = upload_dir / "direction.json"
-            with direction_path.open("w", encoding="utf-8") as fh:
-                json.dump(direction_data, fh, ensure_ascii=False, indent=2)
-
-            # Extract text positions
-            text_positions = processor.extract_text_positions_from_image(image_path)
-
-            # Run SAM3 segmentation with forced flowchart type
-            # Run SAM3 with forced direction
-            try:
-                annotated_path, shape_positions, annotated_text_positions = processor._get_processor().segment_and_annotate(
-                    image_path,
-                    text_positions=text_positions,
-                    direction=direction_result.get("direction", "LR"),
-                )
-            except RuntimeError as e:
-                # SAM3 found no shapes - this is a user-facing error when forcing flowchart
-                error_msg = str(e)
-                if "no shapes" in error_msg.lower():
-                    raise HTTPException(
-                        status_code=400,
-                        detail="SAM3 found no shapes in this image. This image may not be a flowchart. Try 'Auto-detect' or 'Force Other' instead.",
-                    )
-                raise
-
-            # Copy annotated image if generated
-            if annotated_path:
-                src_annotated = Path(annotated_path)
-                if src_annotated.exists():
-                    dst_annotated = upload_dir / "annotated.png"
-                    shutil.copy2(src_annotated, dst_annotated)
-
-            # Save SAM3 results
-            sam3_data = {
-                "figure_type": "flowchart",
-                "confidence": 1.0,
-                "reasoning": "Type forced to flowchart by user",
-                "direction": direction_result.get("direction"),
-                "shape_positions": shape_positions,
-                "text_positions": annotated_text_positions or text_positions,
-                "segmented_at": datetime.now(timezone.utc).isoformat(),
-            }
-            sam3_path = upload_dir / "sam3.json"
-            with sam3_path.open("w", encoding="utf-8") as fh:
-                json.dump(sam3_data, fh, ensure_ascii=False, indent=2)
-
-            # Run Mermaid extraction
-            sam3_result = sam3_data.copy()
-            if (upload_dir / "annotated.png").exists():
-                sam3_result["annotated_path"] = str(upload_dir / "annotated.png")
-
-            mermaid_result = processor.extract_mermaid_from_sam3(
-                image_path, sam3_result, ocr_text="", run_id=f"upload-{upload_id}"
-            )
-
-            # Save full results
-            result_path = upload_dir / "result.json"
-            with result_path.open("w", encoding="utf-8") as fh:
-                json.dump(mermaid_result, fh, ensure_ascii=False, indent=2)
-
-            return {
-                "status": "ok",
-                "stage": "complete",
-                "force_type": force_type,
-                "upload_id": upload_id,
-                "figure_type": "flowchart",
-                "processed_content": mermaid_result.get("processed_content"),
-            }
-
-        elif force_type == "other":
-            # Forced OTHER pipeline: Just generate description
-            # Save forced classification
-            classification_data = {
-                "figure_type": "other",
-                "confidence": 1.0,
-                "reasoning": "Type forced to other by user",
-                "classified_at": datetime.now(timezone.utc).isoformat(),
-            }
-            classification_path = upload_dir / "classification.json"
-            with classification_path.open("w", encoding="utf-8") as fh:
-                json.dump(classification_data, fh, ensure_ascii=False, indent=2)
-
-            # Run description generation
-            description_result = processor.describe_only(image_path, ocr_text="", run_id=f"upload-{upload_id}")
-
-            # Save description results
-            description_data = {
-                "figure_type": "other",
-                "description": description_result.get("description"),
-                "processed_content": description_result.get("processed_content"),
-                "description_duration_ms": description_result.get("description_duration_ms"),
-                "described_at": datetime.now(timezone.utc).isoformat(),
-            }
-            description_path = upload_dir / "description.json"
-            with description_path.open("w", encoding="utf-8") as fh:
-                json.dump(description_data, fh, ensure_ascii=False, indent=2)
-
-            return {
-                "status": "ok",
-                "stage": "described",
-                "force_type": force_type,
-                "upload_id": upload_id,
-                "figure_type": "other",
-                "description": description_result.get("description"),
-            }
+    with refresh_figure_cache() if refresh else nullcontext():
+        try:
+            from chunking_pipeline.figure_processor import get_processor
 
-        else:
-            # No force_type - run full auto-detection pipeline
-            # This is equivalent to what runUploadFullPipeline does on frontend
-            # but as a single endpoint for convenience
-
-            # Step 1: Classification
-            classification_result = processor.classify_only(image_path, ocr_text="", run_id=f"upload-{upload_id}")
-
-            classification_data = {
-                "figure_type": classification_result.get("figure_type"),
-                "confidence": classification_result.get("confidence"),
-                "reasoning": classification_result.get("reasoning"),
-                "classification_duration_ms": classification_result.get("classification_duration_ms"),
-                "classified_at": datetime.now(timezone.utc).isoformat(),
-            }
-            classification_path = upload_dir / "classification.json"
-            with classification_path.open("w", encoding="utf-8") as fh:
-                json.dump(classification_data, fh, ensure_ascii=False, indent=2)
+            processor = get_processor()
 
-            figure_type = classification_result.get("figure_type")
+            if force_type == "flowchart":
+                # Forced flowchart pipeline: Direction → SAM3 → Mermaid
+                # Save forced classification
+                classification_data = {
+                    "figure_type": "flowchart",
+                    "confidence": 1.0,
+                    "reasoning": "Type forced to flowchart by user",
+                    "classified_at": datetime.now(timezone.utc).isoformat(),
+                }
+                classification_path = upload_dir / "classification.json"
+                with classification_path.open("w", encoding="utf-8") as fh:
+                    json.dump(classification_data, fh, ensure_ascii=False, indent=2)
 
-            if figure_type == "flowchart":
-                # Flowchart pipeline
+                # Run direction detection
                 direction_result = processor.detect_direction_only(image_path, run_id=f"upload-{upload_id}")
                 direction_data = {
                     "direction": direction_result.get("direction"),
@@ -1113,35 +903,49 @@ def api_upload_reprocess(
                 with direction_path.open("w", encoding="utf-8") as fh:
                     json.dump(direction_data, fh, ensure_ascii=False, indent=2)
 
-                # SAM3 segmentation
+                # Extract text positions
                 text_positions = processor.extract_text_positions_from_image(image_path)
-                segment_result = processor.segment_only(
-                    image_path, ocr_text="", run_id=f"upload-{upload_id}",
-                    text_positions=text_positions
-                )
 
-                if segment_result.get("annotated_path"):
-                    src_annotated = Path(segment_result["annotated_path"])
+                # Run SAM3 segmentation with forced flowchart type
+                # Run SAM3 with forced direction
+                try:
+                    annotated_path, shape_positions, annotated_text_positions = processor.segment_and_annotate(
+                        image_path,
+                        text_positions=text_positions,
+                        direction=direction_result.get("direction", "LR"),
+                    )
+                except RuntimeError as e:
+                    # SAM3 found no shapes - this is a user-facing error when forcing flowchart
+                    error_msg = str(e)
+                    if "no shapes" in error_msg.lower():
+                        raise HTTPException(
+                            status_code=400,
+                            detail="SAM3 found no shapes in this image. This image may not be a flowchart. Try 'Auto-detect' or 'Force Other' instead.",
+                        )
+                    raise
+
+                # Copy annotated image if generated
+                if annotated_path:
+                    src_annotated = Path(annotated_path)
                     if src_annotated.exists():
                         dst_annotated = upload_dir / "annotated.png"
                         shutil.copy2(src_annotated, dst_annotated)
-                        segment_result["annotated_path"] = str(dst_annotated)
 
+                # Save SAM3 results
                 sam3_data = {
-                    "figure_type": segment_result.get("figure_type"),
-                    "confidence": segment_result.get("confidence"),
-                    "reasoning": segment_result.get("reasoning"),
-                    "direction": segment_result.get("direction"),
-                    "shape_positions": segment_result.get("shape_positions"),
-                    "text_positions": segment_result.get("text_positions"),
-                    "sam3_duration_ms": segment_result.get("sam3_duration_ms"),
+                    "figure_type": "flowchart",
+                    "confidence": 1.0,
+                    "reasoning": "Type forced to flowchart by user",
+                    "direction": direction_result.get("direction"),
+                    "shape_positions": shape_positions,
+                    "text_positions": annotated_text_positions or text_positions,
                     "segmented_at": datetime.now(timezone.utc).isoformat(),
                 }
                 sam3_path = upload_dir / "sam3.json"
                 with sam3_path.open("w", encoding="utf-8") as fh:
                     json.dump(sam3_data, fh, ensure_ascii=False, indent=2)
 
-                # Mermaid extraction
+                # Run Mermaid extraction
                 sam3_result = sam3_data.copy()
                 if (upload_dir / "annotated.png").exists():
                     sam3_result["annotated_path"] = str(upload_dir / "annotated.png")
@@ -1150,6 +954,7 @@ def api_upload_reprocess(
                     image_path, sam3_result, ocr_text="", run_id=f"upload-{upload_id}"
                 )
 
+                # Save full results
                 result_path = upload_dir / "result.json"
                 with result_path.open("w", encoding="utf-8") as fh:
                     json.dump(mermaid_result, fh, ensure_ascii=False, indent=2)
@@ -1157,14 +962,29 @@ def api_upload_reprocess(
                 return {
                     "status": "ok",
                     "stage": "complete",
+                    "force_type": force_type,
                     "upload_id": upload_id,
                     "figure_type": "flowchart",
                     "processed_content": mermaid_result.get("processed_content"),
                 }
-            else:
-                # OTHER pipeline
+
+            elif force_type == "other":
+                # Forced OTHER pipeline: Just generate description
+                # Save forced classification
+                classification_data = {
+                    "figure_type": "other",
+                    "confidence": 1.0,
+                    "reasoning": "Type forced to other by user",
+                    "classified_at": datetime.now(timezone.utc).isoformat(),
+                }
+                classification_path = upload_dir / "classification.json"
+                with classification_path.open("w", encoding="utf-8") as fh:
+                    json.dump(classification_data, fh, ensure_ascii=False, indent=2)
+
+                # Run description generation
                 description_result = processor.describe_only(image_path, ocr_text="", run_id=f"upload-{upload_id}")
 
+                # Save description results
                 description_data = {
                     "figure_type": "other",
                     "description": description_result.get("description"),
@@ -1179,20 +999,125 @@ def api_upload_reprocess(
                 return {
                     "status": "ok",
                     "stage": "described",
+                    "force_type": force_type,
                     "upload_id": upload_id,
                     "figure_type": "other",
                     "description": description_result.get("description"),
                 }
 
-    except ImportError as e:
-        logger.exception(f"Import error during upload reprocess: {e}")
-        raise HTTPException(
-            status_code=503,
-            detail=f"Figure processing import error: {e}",
-        )
-    except Exception as e:
-        logger.exception(f"Failed to reprocess upload {upload_id}")
-        raise HTTPException(status_code=500, detail=str(e))
+            else:
+                # No force_type - run full auto-detection pipeline
+                # This is equivalent to what runUploadFullPipeline does on frontend
+                # but as a single endpoint for convenience
+
+                # Step 1: Classification
+                classification_result = processor.classify_only(image_path, ocr_text="", run_id=f"upload-{upload_id}")
+
+                classification_data = {
+                    "figure_type": classification_result.get("figure_type"),
+                    "confidence": classification_result.get("confidence"),
+                    "reasoning": classification_result.get("reasoning"),
+                    "classification_duration_ms": classification_result.get("classification_duration_ms"),
+                    "classified_at": datetime.now(timezone.utc).isoformat(),
+                }
+                classification_path = upload_dir / "classification.json"
+                with classification_path.open("w", encoding="utf-8") as fh:
+                    json.dump(classification_data, fh, ensure_ascii=False, indent=2)
+
+                figure_type = classification_result.get("figure_type")
+
+                if figure_type == "flowchart":
+                    # Flowchart pipeline
+                    direction_result = processor.detect_direction_only(image_path, run_id=f"upload-{upload_id}")
+                    direction_data = {
+                        "direction": direction_result.get("direction"),
+                        "direction_duration_ms": direction_result.get("direction_duration_ms"),
+                        "detected_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                    direction_path = upload_dir / "direction.json"
+                    with direction_path.open("w", encoding="utf-8") as fh:
+                        json.dump(direction_data, fh, ensure_ascii=False, indent=2)
+
+                    # SAM3 segmentation
+                    text_positions = processor.extract_text_positions_from_image(image_path)
+                    segment_result = processor.segment_only(
+                        image_path, ocr_text="", run_id=f"upload-{upload_id}",
+                        text_positions=text_positions
+                    )
+
+                    if segment_result.get("annotated_path"):
+                        src_annotated = Path(segment_result["annotated_path"])
+                        if src_annotated.exists():
+                            dst_annotated = upload_dir / "annotated.png"
+                            shutil.copy2(src_annotated, dst_annotated)
+                            segment_result["annotated_path"] = str(dst_annotated)
+
+                    sam3_data = {
+                        "figure_type": segment_result.get("figure_type"),
+                        "confidence": segment_result.get("confidence"),
+                        "reasoning": segment_result.get("reasoning"),
+                        "direction": segment_result.get("direction"),
+                        "shape_positions": segment_result.get("shape_positions"),
+                        "text_positions": segment_result.get("text_positions"),
+                        "sam3_duration_ms": segment_result.get("sam3_duration_ms"),
+                        "segmented_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                    sam3_path = upload_dir / "sam3.json"
+                    with sam3_path.open("w", encoding="utf-8") as fh:
+                        json.dump(sam3_data, fh, ensure_ascii=False, indent=2)
+
+                    # Mermaid extraction
+                    sam3_result = sam3_data.copy()
+                    if (upload_dir / "annotated.png").exists():
+                        sam3_result["annotated_path"] = str(upload_dir / "annotated.png")
+
+                    mermaid_result = processor.extract_mermaid_from_sam3(
+                        image_path, sam3_result, ocr_text="", run_id=f"upload-{upload_id}"
+                    )
+
+                    result_path = upload_dir / "result.json"
+                    with result_path.open("w", encoding="utf-8") as fh:
+                        json.dump(mermaid_result, fh, ensure_ascii=False, indent=2)
+
+                    return {
+                        "status": "ok",
+                        "stage": "complete",
+                        "upload_id": upload_id,
+                        "figure_type": "flowchart",
+                        "processed_content": mermaid_result.get("processed_content"),
+                    }
+                else:
+                    # OTHER pipeline
+                    description_result = processor.describe_only(image_path, ocr_text="", run_id=f"upload-{upload_id}")
+
+                    description_data = {
+                        "figure_type": "other",
+                        "description": description_result.get("description"),
+                        "processed_content": description_result.get("processed_content"),
+                        "description_duration_ms": description_result.get("description_duration_ms"),
+                        "described_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                    description_path = upload_dir / "description.json"
+                    with description_path.open("w", encoding="utf-8") as fh:
+                        json.dump(description_data, fh, ensure_ascii=False, indent=2)
+
+                    return {
+                        "status": "ok",
+                        "stage": "described",
+                        "upload_id": upload_id,
+                        "figure_type": "other",
+                        "description": description_result.get("description"),
+                    }
+
+        except ImportError as e:
+            logger.exception(f"Import error during upload reprocess: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail=f"Figure processing import error: {e}",
+            )
+        except Exception as e:
+            logger.exception(f"Failed to reprocess upload {upload_id}")
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 # =============================================================================
@@ -1508,7 +1433,7 @@ def api_figure_image_original(
             detail="Figure has no associated image and PDF not found for extraction",
         )
 
-    png_bytes = _extract_figure_from_pdf(pdf_path, page_number, coordinates)
+    png_bytes = crop_figure(pdf_path, page_number, coordinates)
     if not png_bytes:
         raise HTTPException(
             status_code=500,
@@ -1542,6 +1467,7 @@ def api_figure_reprocess(
     element_id: str,
     provider: str = Query(default=None),
     force_type: Optional[str] = Query(default=None, description="Force figure type: 'flowchart' or 'other'. If not provided, runs auto-classification."),
+    refresh: bool = Query(default=False, description="Recompute every vision step instead of reusing cached results for this image."),
 ) -> Dict[str, Any]:
     """Trigger reprocessing of a figure through the vision pipeline.
 
@@ -1584,36 +1510,37 @@ def api_figure_reprocess(
         raise HTTPException(status_code=404, detail="Image file not found")
 
     # Process through FigureProcessor
-    try:
-        from chunking_pipeline.figure_processor import get_processor
+    with refresh_figure_cache() if refresh else nullcontext():
+        try:
+            from chunking_pipeline.figure_processor import get_processor
 
-        processor = get_processor()
-        ocr_text = target.get("content", "") or target.get("text", "")
-        # Extract text positions from image using Azure DI (same as upload flow)
-        text_positions = processor.extract_text_positions_from_image(image_path)
-        if text_positions:
-            logger.info(
-                f"Extracted {len(text_positions)} text positions for reprocessing {element_id}"
+            processor = get_processor()
+            ocr_text = target.get("content", "") or target.get("text", "")
+            # Extract text positions from image using Azure DI (same as upload flow)
+            text_positions = processor.extract_text_positions_from_image(image_path)
+            if text_positions:
+                logger.info(
+                    f"Extracted {len(text_positions)} text positions for reprocessing {element_id}"
+                )
+            result = processor.process_and_save(
+                image_path=image_path,
+                output_dir=figures_dir,
+                element_id=element_id,
+                ocr_text=ocr_text,
+                run_id=slug,
+                text_positions=text_positions if text_positions else None,
+                force_type=force_type,
             )
-        result = processor.process_and_save(
-            image_path=image_path,
-            output_dir=figures_dir,
-            element_id=element_id,
-            ocr_text=ocr_text,
-            run_id=slug,
-            text_positions=text_positions if text_positions else None,
-            force_type=force_type,
-        )
-        return {"status": "ok", "result": result, "force_type": force_type}
-    except ImportError as e:
-        logger.exception(f"Import error during figure reprocessing: {e}")
-        raise HTTPException(
-            status_code=503,
-            detail=f"Figure processing import error: {e}",
-        )
-    except Exception as e:
-        logger.exception(f"Failed to reprocess figure {element_id}")
-        raise HTTPException(status_code=500, detail=str(e))
+            return {"status": "ok", "result": result, "force_type": force_type}
+        except ImportError as e:
+            logger.exception(f"Import error during figure reprocessing: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail=f"Figure processing import error: {e}",
+            )
+        except Exception as e:
+            logger.exception(f"Failed to reprocess figure {element_id}")
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/api/figures/{slug}/{element_id}/segment")
@@ -2,13 +2,18 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
 
+from chunking_pipeline.chunk_compare import shutdown_pool as shutdown_chunk_compare_pool
+
+from .blob_store import BLOB_URL_PREFIX
 from .config import (
     STATIC_DIR,
     ensure_chartjs_assets,
@@ -18,6 +23,7 @@ from .config import (
 )
 from .routes import (
     admin_router,
+    blobs_router,
     chunker_router,
     chunks_router,
     elements_router,
@@ -27,7 +33,7 @@ from .routes import (
     pdfs_router,
     reviews_router,
 )
-from .extraction_jobs import EXTRACTION_JOB_MANAGER  # noqa: F401 - ensure job manager thread starts
+from .extraction_jobs import EXTRACTION_JOB_MANAGER
 
 _LOGGING_CONFIGURED = False
 
@@ -39,7 +45,7 @@ def configure_chunking_logging() -> None:
     handler = logging.StreamHandler()
     handler.setLevel(logging.INFO)
     handler.setFormatter(logging.Formatter("[chunking] %(asctime)s %(levelname)s %(name)s: %(message)s"))
-    for name in ("chunking.routes.admin", "chunking.routes.extractions", "chunking.routes.chunker", "chunking.routes.images", "chunking.extraction_jobs"):
+    for name in ("chunking.routes.admin", "chunking.routes.extractions", "chunking.routes.chunker", "chunking.routes.images", "chunking.extraction_jobs", "chunking.element_store", "chunking.blob_store", "chunking.figure_crops"):
         logger = logging.getLogger(name)
         logger.setLevel(logging.INFO)
         logger.addHandler(handler)
@@ -49,7 +55,31 @@ def configure_chunking_logging() -> None:
 ensure_dirs()
 configure_chunking_logging()
 
-app = FastAPI(title="IngestLab")
+class BlobAwareGZipMiddleware(GZipMiddleware):
+    """GZip responses except image blobs.
+
+    Blobs are already-compressed images served with byte ranges, which gzip
+    would only make larger and break.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(BLOB_URL_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Job callables live in the route modules, so start the job manager and
+    # resume interrupted jobs only once those are imported.
+    EXTRACTION_JOB_MANAGER.start()
+    EXTRACTION_JOB_MANAGER.recover_interrupted_jobs()
+    yield
+    shutdown_chunk_compare_pool()
+
+
+app = FastAPI(title="IngestLab", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -58,7 +88,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(BlobAwareGZipMiddleware, minimum_size=1024)
 
 
 @app.get("/healthz")
@@ -75,6 +105,7 @@ app.include_router(chunker_router)
 app.include_router(reviews_router)
 app.include_router(feedback_router)
 app.include_router(images_router)
+app.include_router(blobs_router)
 
 app.mount("/", StaticFiles(directory=str(STATIC_DIR), html=True), name="ui")
 
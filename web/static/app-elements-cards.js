@@ -460,10 +460,8 @@ function buildElementCard(id, entry, review, opts = {}) {
 }
 
 function buildElementImageSection(data) {
-  const mime = data.image_mime_type || 'image/png';
-  const uri = data.image_data_uri || (data.image_base64 ? `data:${mime};base64,${data.image_base64}` : null);
-  const fallbackUrl = data.image_url;
-  if (!uri && !fallbackUrl) return null;
+  const src = data.image_blob_url || data.image_data_uri || data.image_url;
+  if (!src) return null;
   const wrap = document.createElement('div');
   wrap.className = 'drawer-image';
   const title = document.createElement('div');
@@ -472,7 +470,7 @@ function buildElementImageSection(data) {
   const img = document.createElement('img');
   img.loading = 'lazy';
   img.alt = data.type ? `${data.type} image` : 'Extracted image';
-  img.src = uri || fallbackUrl;
+  img.src = src;
   wrap.appendChild(title);
   wrap.appendChild(img);
   return wrap;
@@ -479,7 +479,12 @@ function wireExtractionForm() {
 
   const cancelBtn = $('cancelExtractionBtn');
   if (cancelBtn) {
-    cancelBtn.addEventListener('click', () => {
+    cancelBtn.addEventListener('click', async () => {
+      if (CURRENT_EXTRACTION_JOB_ID) {
+        cancelBtn.disabled = true;
+        await cancelExtractionJob(CURRENT_EXTRACTION_JOB_ID);
+        return;
+      }
       const status = $('extractionStatus');
       if (status) status.textContent = '';
       closeExtractionModal();
@@ -1,9 +1,9 @@
 /**
- * Extraction job polling and progress tracking
+ * Extraction job progress tracking (server-sent events, with polling fallback)
  * Extracted from app-extractions.js for modularity
  */
 
-const EXTRACTION_JOB_POLL_INTERVAL_MS = 2000;  // Poll every 2 seconds for responsive progress updates
+const EXTRACTION_JOB_POLL_INTERVAL_MS = 2000;  // Poll interval when the event stream is unavailable
 
 function describeJobStatus(detail, providerName = 'provider') {
   const status = detail?.status || 'queued';
@@ -16,14 +16,17 @@ function describeJobStatus(detail, providerName = 'provider') {
     return `${providerName} is running…`;
   }
   if (status === 'queued') {
+    const position = detail?.queue_position ? `position ${detail.queue_position}` : 'waiting for worker';
+    const eta = detail?.eta_seconds != null ? `, ~${Math.max(1, Math.round(detail.eta_seconds))}s to finish` : '';
     if (detail?.created_at) {
       const secs = Math.max(1, Math.round(nowSec - detail.created_at));
-      return `Queued for ${secs}s (waiting for worker)`;
+      return `Queued for ${secs}s (${position}${eta})`;
     }
-    return 'Queued – waiting for worker…';
+    return `Queued – ${position}${eta}`;
   }
   if (status === 'succeeded') return 'Completed';
   if (status === 'failed') return detail?.error || 'Extraction failed';
+  if (status === 'cancelled') return 'Cancelled';
   return 'Preparing extraction…';
 }
 
@@ -204,11 +207,118 @@ function updateExtractionJobProgress(detail) {
   }
 }
 
-async function pollExtractionJob(jobId) {
-  CURRENT_EXTRACTION_JOB_ID = jobId;
+// Handle a finished job; returns true when the job reached a terminal state.
+async function finishExtractionJob(detail) {
   const statusSpan = $('extractionStatus');
   const openBtn = $('openExtractionModal');
   const cancelBtn = $('cancelExtractionBtn');
+  const status = detail?.status;
+  if (status === 'succeeded') {
+    if (statusSpan) statusSpan.textContent = 'Completed';
+    const slug = detail?.result?.slug;
+    const provider = detail?.provider || detail?.result?.provider || CURRENT_PROVIDER || 'unstructured/local';
+    if (provider) CURRENT_PROVIDER = provider;
+    if (slug) CURRENT_SLUG = slug;
+    try {
+      await refreshExtractions({ slug, provider });
+    } catch (err) {
+      console.warn('Failed to refresh extractions after job completion', err);
+    }
+    setExtractionInProgress(false);
+    closeExtractionModal();
+    showToast('Extraction completed', 'ok', 2500);
+    CURRENT_EXTRACTION_JOB_ID = null;
+    return true;
+  }
+  if (status === 'failed') {
+    const errMsg = detail?.error || 'Extraction failed';
+    setExtractionInProgress(false);
+    if (statusSpan) statusSpan.textContent = `Failed: ${errMsg}`;
+    if (cancelBtn) cancelBtn.disabled = false;
+    if (openBtn) {
+      openBtn.disabled = false;
+      openBtn.textContent = 'New Extraction';
+    }
+    showToast(`Extraction failed: ${errMsg}`, 'err', 3500);
+    CURRENT_EXTRACTION_JOB_ID = null;
+    return true;
+  }
+  if (status === 'cancelled') {
+    setExtractionInProgress(false);
+    if (statusSpan) statusSpan.textContent = 'Cancelled';
+    showToast('Extraction cancelled', 'ok', 2500);
+    CURRENT_EXTRACTION_JOB_ID = null;
+    return true;
+  }
+  return false;
+}
+
+// Ask the server to stop the running job; progress events report the outcome.
+async function cancelExtractionJob(jobId) {
+  const statusSpan = $('extractionStatus');
+  try {
+    const r = await fetch(`/api/extraction-jobs/${encodeURIComponent(jobId)}`, { method: 'DELETE' });
+    if (!r.ok) throw new Error(`Cancel failed: ${r.status}`);
+    if (statusSpan) statusSpan.textContent = 'Cancelling…';
+  } catch (err) {
+    showToast(`Failed to cancel extraction: ${err?.message || err}`, 'err', 3500);
+  }
+}
+
+// Follow a job over server-sent events. Resolves true once the job has been
+// handled (finished, or the user moved on to another job) and false if the
+// stream broke, in which case the caller falls back to polling.
+function streamExtractionJob(jobId) {
+  return new Promise((resolve) => {
+    let detail = null;
+    let settled = false;
+    const source = new EventSource(`/api/extraction-jobs/${encodeURIComponent(jobId)}/events`);
+    // Re-render from the cached detail so elapsed-time labels keep ticking between events
+    const ticker = setInterval(() => {
+      if (CURRENT_EXTRACTION_JOB_ID !== jobId) settle(true);
+      else if (detail) updateExtractionJobProgress(detail);
+    }, EXTRACTION_JOB_POLL_INTERVAL_MS);
+    function settle(handled) {
+      if (settled) return;
+      settled = true;
+      clearInterval(ticker);
+      source.close();
+      resolve(handled);
+    }
+    function apply(event, merge) {
+      if (settled) return;
+      if (CURRENT_EXTRACTION_JOB_ID !== jobId) {
+        settle(true);
+        return;
+      }
+      let payload = null;
+      try {
+        payload = JSON.parse(event.data);
+      } catch (_) {
+        return;
+      }
+      detail = merge && detail ? { ...detail, ...payload } : payload;
+      updateExtractionJobProgress(detail);
+      if (['succeeded', 'failed', 'cancelled'].includes(detail?.status)) {
+        settle(true);
+        finishExtractionJob(detail);
+      }
+    }
+    source.addEventListener('snapshot', (event) => apply(event, false));
+    source.addEventListener('progress', (event) => apply(event, true));
+    source.addEventListener('done', (event) => apply(event, false));
+    // EventSource would reconnect on its own; hand over to polling instead
+    source.onerror = () => settle(false);
+  });
+}
+
+async function pollExtractionJob(jobId) {
+  CURRENT_EXTRACTION_JOB_ID = jobId;
+  if (typeof EventSource !== 'undefined') {
+    const handled = await streamExtractionJob(jobId);
+    if (handled) return;
+  }
+  const statusSpan = $('extractionStatus');
   while (CURRENT_EXTRACTION_JOB_ID === jobId) {
     let detail = null;
     try {
@@ -228,37 +338,7 @@ async function pollExtractionJob(jobId) {
       continue;
     }
     updateExtractionJobProgress(detail);
-    const status = detail?.status;
-    if (status === 'succeeded') {
-      if (statusSpan) statusSpan.textContent = 'Completed';
-      const slug = detail?.result?.slug;
-      const provider = detail?.provider || detail?.result?.provider || CURRENT_PROVIDER || 'unstructured/local';
-      if (provider) CURRENT_PROVIDER = provider;
-      if (slug) CURRENT_SLUG = slug;
-      try {
-        await refreshExtractions({ slug, provider });
-      } catch (err) {
-        console.warn('Failed to refresh extractions after job completion', err);
-      }
-      setExtractionInProgress(false);
-      closeExtractionModal();
-      showToast('Extraction completed', 'ok', 2500);
-      CURRENT_EXTRACTION_JOB_ID = null;
-      return;
-    }
-    if (status === 'failed') {
-      const errMsg = detail?.error || 'Extraction failed';
-      setExtractionInProgress(false);
-      if (statusSpan) statusSpan.textContent = `Failed: ${errMsg}`;
-      if (cancelBtn) cancelBtn.disabled = false;
-      if (openBtn) {
-        openBtn.disabled = false;
-        openBtn.textContent = 'New Extraction';
-      }
-      showToast(`Extraction failed: ${errMsg}`, 'err', 3500);
-      CURRENT_EXTRACTION_JOB_ID = null;
-      return;
-    }
+    if (await finishExtractionJob(detail)) return;
     await sleep(EXTRACTION_JOB_POLL_INTERVAL_MS);
   }
 }
@@ -289,7 +369,10 @@ function setExtractionInProgress(isRunning, context = {}) {
     if (progressPane) progressPane.style.display = 'block';
     extractionBtn.disabled = true;
     extractionBtn.textContent = `Extracting (${providerName})…`;
-    if (cancelBtn) cancelBtn.disabled = true;
+    if (cancelBtn) {
+      cancelBtn.disabled = false;
+      cancelBtn.textContent = 'Cancel extraction';
+    }
     if (openBtn) {
       openBtn.disabled = true;
       openBtn.textContent = `Extracting (${providerName})…`;
@@ -325,7 +408,10 @@ function setExtractionInProgress(isRunning, context = {}) {
     if (progressPane) progressPane.style.display = '';
     extractionBtn.disabled = false;
     extractionBtn.textContent = 'Extract';
-    if (cancelBtn) cancelBtn.disabled = false;
+    if (cancelBtn) {
+      cancelBtn.disabled = false;
+      cancelBtn.textContent = 'Cancel';
+    }
     if (openBtn) {
       openBtn.disabled = false;
       openBtn.textContent = 'New Extraction';
@@ -348,6 +434,7 @@ function setExtractionInProgress(isRunning, context = {}) {
 
 // Window exports
 window.describeJobStatus = describeJobStatus;
+window.cancelExtractionJob = cancelExtractionJob;
 window.setActivePipeline = setActivePipeline;
 window.renderStagePipeline = renderStagePipeline;
 window.resetStagePipeline = resetStagePipeline;
@@ -165,7 +165,7 @@ async function loadUploadById(uploadId) {
 
     const data = await res.json();
     window.CURRENT_UPLOAD_ID = uploadId;
-    window.CURRENT_UPLOAD_DATA_URI = null; // Will fetch from server
+    window.CURRENT_UPLOAD_IMAGE_URL = null; // Will fetch from server
 
     renderUploadPipelineView(data);
 
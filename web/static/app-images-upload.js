@@ -6,7 +6,7 @@
 /* global $, showToast, escapeHtml, initCytoscapeDiagram, openImageLightbox,
           runUploadFullPipeline, runUploadClassification, runUploadDirectionDetection,
           runUploadDescriptionGeneration, runUploadSegmentation, runUploadMermaidExtraction,
-          refreshUploadDetails, CURRENT_UPLOAD_ID, CURRENT_UPLOAD_DATA_URI */
+          refreshUploadDetails, CURRENT_UPLOAD_ID, CURRENT_UPLOAD_IMAGE_URL */
 
 // Guard to prevent duplicate event listener registration
 let _uploadWired = false;
@@ -94,7 +94,7 @@ async function uploadImage(file) {
 
     const data = await res.json();
     window.CURRENT_UPLOAD_ID = data.upload_id;
-    window.CURRENT_UPLOAD_DATA_URI = data.original_image_data_uri;
+    window.CURRENT_UPLOAD_IMAGE_URL = data.original_image_url;
     window.CURRENT_UPLOAD_CLASSIFICATION = null;
     window.CURRENT_UPLOAD_DIRECTION = null;
 
@@ -128,7 +128,7 @@ async function refreshUploadDetails(uploadId) {
     if (!res.ok) throw new Error('Failed to load upload details');
 
     const data = await res.json();
-    data.original_image_data_uri = window.CURRENT_UPLOAD_DATA_URI;
+    data.original_image_url = window.CURRENT_UPLOAD_IMAGE_URL;
     renderUploadPipelineView(data);
   } catch (err) {
     console.error('Failed to refresh upload:', err);
@@ -390,7 +390,7 @@ function renderUploadPipelineView(data, options = {}) {
 
       <div class="upload-content">
         <div class="upload-image-preview">
-          <img src="${data.original_image_data_uri || `/api/figures/upload/${uploadId}/image/original`}"
+          <img src="${data.original_image_url || `/api/figures/upload/${uploadId}/image/original`}"
                alt="Original image" class="original-image zoomable-image"
                data-lightbox-title="Original Image" />
         </div>
@@ -510,7 +510,7 @@ async function reprocessUpload(uploadId) {
  */
 function clearUpload() {
   window.CURRENT_UPLOAD_ID = null;
-  window.CURRENT_UPLOAD_DATA_URI = null;
+  window.CURRENT_UPLOAD_IMAGE_URL = null;
 
   // Clear any previous results
   const resultEl = $('imageUploadResult');
@@ -13,7 +13,7 @@ window.IMAGES_FIGURE_LIST = [];
 window.IMAGES_CURRENT_FIGURE = null;
 window.IMAGES_STATS = null;
 window.CURRENT_UPLOAD_ID = null;
-window.CURRENT_UPLOAD_DATA_URI = null;
+window.CURRENT_UPLOAD_IMAGE_URL = null;
 
 // Guard to prevent duplicate event listener registration
 let _imagesTabInitialized = false;